@@ -38,9 +38,9 @@ async def storage_monitor_health():
         webhook_status = {"enabled": storage_monitor.webhook_enabled, "configured": True}
 
         # ストレージ接続の確認
-        from storage.storage_client import StorageClient
+        from storage.storage_client import get_storage_client
 
-        storage_client = StorageClient()
+        storage_client = get_storage_client()
         try:
             storage_client.storage_connection_check()
             storage_status = {"status": "connected", "storage": "minio"}
@@ -79,9 +79,9 @@ async def storage_monitor_ready():
     try:
         # 基本的な接続確認
         from db.database import engine
-        from storage.storage_client import StorageClient
+        from storage.storage_client import get_storage_client
 
-        storage_client = StorageClient()
+        storage_client = get_storage_client()
 
         try:
             storage_ok = storage_client.storage_connection_check()
@@ -2,8 +2,15 @@ import logging
 import os
 import uuid
 
-from models.members import HumanMember, HumanMemberProfile, VirtualMember, VirtualMemberProfile
-from sqlalchemy import create_engine, text
+from models.members import (
+    HumanMember,
+    HumanMemberProfile,
+    MemberRelationship,
+    VirtualMember,
+    VirtualMemberProfile,
+)
+from models.storage_sync import RegistrationCheckpoint, StorageSyncCheckpoint
+from sqlalchemy import create_engine, or_, select, text
 from sqlalchemy.orm import Session, sessionmaker
 
 logger = logging.getLogger(__name__)
@@ -31,6 +38,43 @@ class DatabaseError(Exception):
         super().__init__(self.message)
 
 
+class UpsertCounts:
+    """UPSERT結果の件数（新規登録・更新・変更なし）を集計するクラス
+
+    UPSERT関数の counts 引数に渡すと、処理した行ごとに件数が加算されます。
+    値が変わらない行は更新しない（dead tupleを作らない）ため、unchanged として数えます。
+
+    Attributes:
+        inserted (int): 新規登録した行数
+        updated (int): 値が変わり更新した行数
+        unchanged (int): 値が同じため更新しなかった行数
+    """
+
+    ACTIONS = ("inserted", "updated", "unchanged")
+
+    def __init__(self):
+        self.inserted = 0
+        self.updated = 0
+        self.unchanged = 0
+
+    def add(self, action: str, count: int = 1):
+        """UPSERT結果（"inserted" / "updated" / "unchanged"）の件数を加算する"""
+        if action not in self.ACTIONS:
+            raise ValueError(f"Unknown upsert action: {action}")
+        setattr(self, action, getattr(self, action) + count)
+
+    @property
+    def written(self) -> int:
+        """実際に書き込みが発生した行数"""
+        return self.inserted + self.updated
+
+    def to_dict(self) -> dict:
+        return {action: getattr(self, action) for action in self.ACTIONS}
+
+    def __str__(self):
+        return f"inserted {self.inserted}, updated {self.updated}, unchanged {self.unchanged}"
+
+
 # 人間メンバー操作
 def create_human_member(db: Session, name: str, yml_file_uri: str = None):
     """人間メンバーのデータベースオブジェクトを作成する
@@ -156,7 +200,37 @@ def get_human_member_by_uri(db: Session, yml_file_uri: str):
         raise DatabaseError(error_msg, e)
 
 
-def upsert_human_member(db: Session, name: str, yml_file_uri: str):
+def get_human_members_by_uris(db: Session, yml_file_uris: list):
+    """複数のYAMLファイルURIで人間メンバーをまとめて取得する
+
+    バッチ登録で、保存済みのYAMLハッシュ（yml_file_hash）と比較して
+    変更のないファイルを判定するために使用します。
+
+    Args:
+        db (Session): SQLAlchemyのデータベースセッション
+        yml_file_uris (list): 検索するYAMLファイルURIのリスト
+
+    Returns:
+        dict: YAMLファイルURIをキー、HumanMemberオブジェクトを値とする辞書（未登録のURIは含まない）
+
+    Raises:
+        DatabaseError: データベース検索時にエラーが発生した場合
+    """
+    if not yml_file_uris:
+        return {}
+
+    try:
+        members = (
+            db.query(HumanMember).filter(HumanMember.yml_file_uri.in_(set(yml_file_uris))).all()
+        )
+        return {member.yml_file_uri: member for member in members}
+    except Exception as e:
+        error_msg = f"Failed to get {len(yml_file_uris)} human members by URI: {str(e)}"
+        logger.error(error_msg)
+        raise DatabaseError(error_msg, e)
+
+
+def upsert_human_member(db: Session, name: str, yml_file_uri: str, counts: UpsertCounts = None):
     """人間メンバーをUPSERT（ON CONFLICT DO UPDATE使用）
 
     PostgreSQLのON CONFLICT DO UPDATE機能を使用して、
@@ -166,6 +240,7 @@ def upsert_human_member(db: Session, name: str, yml_file_uri: str):
         db (Session): SQLAlchemyのデータベースセッション
         name (str): 人間メンバーの名前
         yml_file_uri (str): YAMLファイルURI
+        counts (UpsertCounts): 新規登録・更新・変更なしの件数を加算する集計オブジェクト
 
     Returns:
         HumanMember: UPSERT処理後の人間メンバーオブジェクト
@@ -174,23 +249,13 @@ def upsert_human_member(db: Session, name: str, yml_file_uri: str):
         DatabaseError: UPSERT処理時にエラーが発生した場合
     """
     try:
-        from sqlalchemy import text
-
-        # ON CONFLICT DO UPDATEでINSERT/UPDATEを一元化
-        sql = text(
-            """
-            INSERT INTO human_members (member_name, yml_file_uri, member_uuid, created_at, updated_at)
-            VALUES (:name, :yml_file_uri, gen_random_uuid(), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-            ON CONFLICT (yml_file_uri)
-            DO UPDATE SET
-                member_name = EXCLUDED.member_name,
-                updated_at = CURRENT_TIMESTAMP
-            RETURNING member_id, member_uuid, member_name, yml_file_uri, created_at, updated_at
-        """
-        )
-
-        result = db.execute(sql, {"name": name, "yml_file_uri": yml_file_uri})
-        row = result.fetchone()
+        # ON CONFLICT DO UPDATEでINSERT/UPDATEを一元化（値が同じ場合は更新しない）
+        row = _bulk_upsert(
+            db,
+            "human_members",
+            [{"member_name": name, "yml_file_uri": yml_file_uri}],
+            counts=counts,
+        )[0]
 
         # 結果からHumanMemberオブジェクトを構築
         member = HumanMember(
@@ -198,11 +263,12 @@ def upsert_human_member(db: Session, name: str, yml_file_uri: str):
             member_uuid=row.member_uuid,
             member_name=row.member_name,
             yml_file_uri=row.yml_file_uri,
+            yml_file_hash=row.yml_file_hash,
             created_at=row.created_at,
             updated_at=row.updated_at,
         )
 
-        logger.info(f"Human member '{name}' upserted for URI: {yml_file_uri}")
+        logger.info(f"Human member '{name}' {row.upsert_action} for URI: {yml_file_uri}")
         return member
 
     except Exception as e:
@@ -336,7 +402,37 @@ def get_virtual_member_by_uri(db: Session, yml_file_uri: str):
         raise DatabaseError(error_msg, e)
 
 
-def upsert_virtual_member(db: Session, name: str, yml_file_uri: str):
+def get_virtual_members_by_uris(db: Session, yml_file_uris: list):
+    """複数のYAMLファイルURIで仮想メンバーをまとめて取得する
+
+    バッチ登録で、保存済みのYAMLハッシュ（yml_file_hash）と比較して
+    変更のないファイルを判定するために使用します。
+
+    Args:
+        db (Session): SQLAlchemyのデータベースセッション
+        yml_file_uris (list): 検索するYAMLファイルURIのリスト
+
+    Returns:
+        dict: YAMLファイルURIをキー、VirtualMemberオブジェクトを値とする辞書（未登録のURIは含まない）
+
+    Raises:
+        DatabaseError: データベース検索時にエラーが発生した場合
+    """
+    if not yml_file_uris:
+        return {}
+
+    try:
+        members = (
+            db.query(VirtualMember).filter(VirtualMember.yml_file_uri.in_(set(yml_file_uris))).all()
+        )
+        return {member.yml_file_uri: member for member in members}
+    except Exception as e:
+        error_msg = f"Failed to get {len(yml_file_uris)} virtual members by URI: {str(e)}"
+        logger.error(error_msg)
+        raise DatabaseError(error_msg, e)
+
+
+def upsert_virtual_member(db: Session, name: str, yml_file_uri: str, counts: UpsertCounts = None):
     """仮想メンバーをUPSERT（ON CONFLICT DO UPDATE使用）
 
     PostgreSQLのON CONFLICT DO UPDATE機能を使用して、
@@ -346,6 +442,7 @@ def upsert_virtual_member(db: Session, name: str, yml_file_uri: str):
         db (Session): SQLAlchemyのデータベースセッション
         name (str): 仮想メンバーの名前
         yml_file_uri (str): YAMLファイルURI
+        counts (UpsertCounts): 新規登録・更新・変更なしの件数を加算する集計オブジェクト
 
     Returns:
         VirtualMember: UPSERT処理後の仮想メンバーオブジェクト
@@ -354,23 +451,13 @@ def upsert_virtual_member(db: Session, name: str, yml_file_uri: str):
         DatabaseError: UPSERT処理時にエラーが発生した場合
     """
     try:
-        from sqlalchemy import text
-
-        # ON CONFLICT DO UPDATEでINSERT/UPDATEを一元化
-        sql = text(
-            """
-            INSERT INTO virtual_members (member_name, yml_file_uri, member_uuid, created_at, updated_at)
-            VALUES (:name, :yml_file_uri, gen_random_uuid(), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-            ON CONFLICT (yml_file_uri)
-            DO UPDATE SET
-                member_name = EXCLUDED.member_name,
-                updated_at = CURRENT_TIMESTAMP
-            RETURNING member_id, member_uuid, member_name, yml_file_uri, created_at, updated_at
-        """
-        )
-
-        result = db.execute(sql, {"name": name, "yml_file_uri": yml_file_uri})
-        row = result.fetchone()
+        # ON CONFLICT DO UPDATEでINSERT/UPDATEを一元化（値が同じ場合は更新しない）
+        row = _bulk_upsert(
+            db,
+            "virtual_members",
+            [{"member_name": name, "yml_file_uri": yml_file_uri}],
+            counts=counts,
+        )[0]
 
         # 結果からVirtualMemberオブジェクトを構築
         member = VirtualMember(
@@ -378,11 +465,12 @@ def upsert_virtual_member(db: Session, name: str, yml_file_uri: str):
             member_uuid=row.member_uuid,
             member_name=row.member_name,
             yml_file_uri=row.yml_file_uri,
+            yml_file_hash=row.yml_file_hash,
             created_at=row.created_at,
             updated_at=row.updated_at,
         )
 
-        logger.info(f"Virtual member '{name}' upserted for URI: {yml_file_uri}")
+        logger.info(f"Virtual member '{name}' {row.upsert_action} for URI: {yml_file_uri}")
         return member
 
     except Exception as e:
@@ -392,24 +480,17 @@ def upsert_virtual_member(db: Session, name: str, yml_file_uri: str):
 
 
 # プロフィール操作
-def upsert_human_member_profile(db: Session, member_id: int, member_uuid: str, bio: str = None):
-    """人間メンバープロフィールのUPSERT処理（ON CONFLICT DO UPDATE使用）"""
+def upsert_human_member_profile(
+    db: Session, member_id: int, member_uuid: str, bio: str = None, counts: UpsertCounts = None
+):
+    """人間メンバープロフィールのUPSERT処理（ON CONFLICT DO UPDATE使用、値が同じ場合は更新しない）"""
     try:
-        sql = text(
-            """
-            INSERT INTO human_member_profiles (member_id, member_uuid, bio, profile_uuid, created_at, updated_at)
-            VALUES (:member_id, :member_uuid, :bio, gen_random_uuid(), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-            ON CONFLICT (member_uuid)
-            DO UPDATE SET
-                member_id = EXCLUDED.member_id,
-                bio = EXCLUDED.bio,
-                updated_at = CURRENT_TIMESTAMP
-            RETURNING profile_id, member_id, member_uuid, bio, profile_uuid, created_at, updated_at
-        """
-        )
-
-        result = db.execute(sql, {"member_id": member_id, "member_uuid": member_uuid, "bio": bio})
-        row = result.fetchone()
+        row = _bulk_upsert(
+            db,
+            "human_member_profiles",
+            [{"member_id": member_id, "member_uuid": member_uuid, "bio": bio}],
+            counts=counts,
+        )[0]
 
         # 結果からHumanMemberProfileオブジェクトを構築
         profile = HumanMemberProfile(
@@ -422,7 +503,7 @@ def upsert_human_member_profile(db: Session, member_id: int, member_uuid: str, b
             updated_at=row.updated_at,
         )
 
-        logger.info(f"Human member profile upserted for member {member_uuid}")
+        logger.info(f"Human member profile {row.upsert_action} for member {member_uuid}")
         return profile
 
     except Exception as e:
@@ -433,36 +514,333 @@ def upsert_human_member_profile(db: Session, member_id: int, member_uuid: str, b
 
 
 def upsert_virtual_member_profile(
-    db: Session, member_id: int, member_uuid: str, llm_model: str, custom_prompt: str = None
+    db: Session,
+    member_id: int,
+    member_uuid: str,
+    llm_model: str,
+    custom_prompt: str = None,
+    counts: UpsertCounts = None,
+):
+    """仮想メンバープロフィールのUPSERT処理（ON CONFLICT DO UPDATE使用、値が同じ場合は更新しない）"""
+    try:
+        row = _bulk_upsert(
+            db,
+            "virtual_member_profiles",
+            [
+                {
+                    "member_id": member_id,
+                    "member_uuid": member_uuid,
+                    "llm_model": llm_model,
+                    "custom_prompt": custom_prompt,
+                }
+            ],
+            counts=counts,
+        )[0]
+
+        # 結果からVirtualMemberProfileオブジェクトを構築
+        profile = VirtualMemberProfile(
+            profile_id=row.profile_id,
+            profile_uuid=row.profile_uuid,
+            member_id=row.member_id,
+            member_uuid=row.member_uuid,
+            llm_model=row.llm_model,
+            custom_prompt=row.custom_prompt,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+        )
+
+        logger.info(f"Virtual member profile {row.upsert_action} for member {member_uuid}")
+        return profile
+
+    except Exception as e:
+        # NOTE: ロールバックは呼び出し元で実行
+        error_msg = f"Failed to upsert virtual member profile for member {member_uuid}: {str(e)}"
+        logger.error(error_msg)
+        raise DatabaseError(error_msg, e)
+
+
+# メンバー・プロフィール同時操作
+def upsert_human_member_with_profile(
+    db: Session,
+    name: str,
+    yml_file_uri: str,
+    bio: str,
+    yml_file_hash: str = None,
+    yml_file_etag: str = None,
+    yml_file_last_modified=None,
+    counts: UpsertCounts = None,
+):
+    """人間メンバーとプロフィールを1文でUPSERT（データ変更CTE使用）
+
+    メンバーのUPSERTをCTEで実行し、その結果（member_id, member_uuid）を使って
+    プロフィールをUPSERTします。値が変わらない行は更新せず既存の行を返します。
+    upsert_human_member と upsert_human_member_profile を
+    順に呼び出す場合と同じ結果を、1回のラウンドトリップで取得します。
+    コミットは呼び出し元で行います。
+
+    Args:
+        db (Session): SQLAlchemyのデータベースセッション
+        name (str): 人間メンバーの名前
+        yml_file_uri (str): YAMLファイルURI
+        bio (str): プロフィールのbio
+        yml_file_hash (str): YAML内容のハッシュ（次回登録時の変更判定に使用）
+        yml_file_etag (str): ストレージオブジェクトのETag（差分同期の変更判定に使用、
+            Noneの場合は既存の値を保持）
+        yml_file_last_modified (datetime): ストレージオブジェクトの更新日時
+            （Noneの場合は既存の値を保持）
+        counts (UpsertCounts): 新規登録・更新・変更なしの件数を加算する集計オブジェクト
+
+    Returns:
+        tuple: (HumanMember, HumanMemberProfile) のタプル
+
+    Raises:
+        DatabaseError: UPSERT処理時にエラーが発生した場合
+    """
+    try:
+        sql = text(
+            """
+            WITH member_upsert AS (
+                INSERT INTO human_members (member_name, yml_file_uri, yml_file_hash, yml_file_etag, yml_file_last_modified, member_uuid, created_at, updated_at)
+                VALUES (:name, :yml_file_uri, :yml_file_hash, :yml_file_etag, CAST(:yml_file_last_modified AS TIMESTAMPTZ), gen_random_uuid(), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+                ON CONFLICT (yml_file_uri)
+                DO UPDATE SET
+                    member_name = EXCLUDED.member_name,
+                    yml_file_hash = EXCLUDED.yml_file_hash,
+                    yml_file_etag = COALESCE(EXCLUDED.yml_file_etag, human_members.yml_file_etag),
+                    yml_file_last_modified = COALESCE(EXCLUDED.yml_file_last_modified, human_members.yml_file_last_modified),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE (human_members.member_name, human_members.yml_file_hash, human_members.yml_file_etag, human_members.yml_file_last_modified)
+                    IS DISTINCT FROM (
+                        EXCLUDED.member_name,
+                        EXCLUDED.yml_file_hash,
+                        COALESCE(EXCLUDED.yml_file_etag, human_members.yml_file_etag),
+                        COALESCE(EXCLUDED.yml_file_last_modified, human_members.yml_file_last_modified)
+                    )
+                RETURNING member_id, member_uuid, member_name, yml_file_uri, yml_file_hash, yml_file_etag, yml_file_last_modified,
+                    created_at, updated_at,
+                    CASE WHEN xmax = 0 THEN 'inserted' ELSE 'updated' END AS member_action
+            ),
+            member AS (
+                SELECT * FROM member_upsert
+                UNION ALL
+                SELECT member_id, member_uuid, member_name, yml_file_uri, yml_file_hash, yml_file_etag, yml_file_last_modified,
+                    created_at, updated_at, 'unchanged'
+                FROM human_members
+                WHERE yml_file_uri = :yml_file_uri AND NOT EXISTS (SELECT 1 FROM member_upsert)
+            ),
+            profile_upsert AS (
+                INSERT INTO human_member_profiles (member_id, member_uuid, bio, profile_uuid, created_at, updated_at)
+                SELECT member_id, member_uuid, :bio, gen_random_uuid(), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+                FROM member
+                ON CONFLICT (member_uuid)
+                DO UPDATE SET
+                    member_id = EXCLUDED.member_id,
+                    bio = EXCLUDED.bio,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE (human_member_profiles.member_id, human_member_profiles.bio)
+                    IS DISTINCT FROM (EXCLUDED.member_id, EXCLUDED.bio)
+                RETURNING profile_id, profile_uuid, member_uuid, bio,
+                    created_at AS profile_created_at, updated_at AS profile_updated_at,
+                    CASE WHEN xmax = 0 THEN 'inserted' ELSE 'updated' END AS profile_action
+            ),
+            profile AS (
+                SELECT * FROM profile_upsert
+                UNION ALL
+                SELECT p.profile_id, p.profile_uuid, p.member_uuid, p.bio, p.created_at, p.updated_at,
+                    'unchanged'
+                FROM human_member_profiles p
+                JOIN member m ON p.member_uuid = m.member_uuid
+                WHERE NOT EXISTS (SELECT 1 FROM profile_upsert)
+            )
+            SELECT m.member_id, m.member_uuid, m.member_name, m.yml_file_uri, m.yml_file_hash,
+                m.yml_file_etag, m.yml_file_last_modified, m.created_at, m.updated_at, m.member_action,
+                p.profile_id, p.profile_uuid, p.bio, p.profile_created_at, p.profile_updated_at,
+                p.profile_action
+            FROM member m
+            JOIN profile p ON p.member_uuid = m.member_uuid
+        """
+        )
+
+        row = db.execute(
+            sql,
+            {
+                "name": name,
+                "yml_file_uri": yml_file_uri,
+                "yml_file_hash": yml_file_hash,
+                "yml_file_etag": yml_file_etag,
+                "yml_file_last_modified": yml_file_last_modified,
+                "bio": bio,
+            },
+        ).fetchone()
+
+        # 結果からHumanMember・HumanMemberProfileオブジェクトを構築
+        member = HumanMember(
+            member_id=row.member_id,
+            member_uuid=row.member_uuid,
+            member_name=row.member_name,
+            yml_file_uri=row.yml_file_uri,
+            yml_file_hash=row.yml_file_hash,
+            yml_file_etag=row.yml_file_etag,
+            yml_file_last_modified=row.yml_file_last_modified,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+        )
+        profile = HumanMemberProfile(
+            profile_id=row.profile_id,
+            profile_uuid=row.profile_uuid,
+            member_id=row.member_id,
+            member_uuid=row.member_uuid,
+            bio=row.bio,
+            created_at=row.profile_created_at,
+            updated_at=row.profile_updated_at,
+        )
+
+        if counts is not None:
+            counts.add(row.member_action)
+            counts.add(row.profile_action)
+
+        logger.info(
+            f"Human member '{name}' {row.member_action} and profile {row.profile_action} "
+            f"for URI: {yml_file_uri}"
+        )
+        return member, profile
+
+    except Exception as e:
+        # NOTE: ロールバックは呼び出し元で実行
+        error_msg = f"Failed to upsert human member '{name}' with profile for URI '{yml_file_uri}': {str(e)}"
+        logger.error(error_msg)
+        raise DatabaseError(error_msg, e)
+
+
+def upsert_virtual_member_with_profile(
+    db: Session,
+    name: str,
+    yml_file_uri: str,
+    llm_model: str,
+    custom_prompt: str = None,
+    yml_file_hash: str = None,
+    yml_file_etag: str = None,
+    yml_file_last_modified=None,
+    counts: UpsertCounts = None,
 ):
-    """仮想メンバープロフィールのUPSERT処理（ON CONFLICT DO UPDATE使用）"""
+    """仮想メンバーとプロフィールを1文でUPSERT（データ変更CTE使用）
+
+    メンバーのUPSERTをCTEで実行し、その結果（member_id, member_uuid）を使って
+    プロフィールをUPSERTします。値が変わらない行は更新せず既存の行を返します。
+    upsert_virtual_member と upsert_virtual_member_profile を
+    順に呼び出す場合と同じ結果を、1回のラウンドトリップで取得します。
+    コミットは呼び出し元で行います。
+
+    Args:
+        db (Session): SQLAlchemyのデータベースセッション
+        name (str): 仮想メンバーの名前
+        yml_file_uri (str): YAMLファイルURI
+        llm_model (str): 使用するLLMモデル
+        custom_prompt (str): カスタムプロンプト
+        yml_file_hash (str): YAML内容のハッシュ（次回登録時の変更判定に使用）
+        yml_file_etag (str): ストレージオブジェクトのETag（差分同期の変更判定に使用、
+            Noneの場合は既存の値を保持）
+        yml_file_last_modified (datetime): ストレージオブジェクトの更新日時
+            （Noneの場合は既存の値を保持）
+        counts (UpsertCounts): 新規登録・更新・変更なしの件数を加算する集計オブジェクト
+
+    Returns:
+        tuple: (VirtualMember, VirtualMemberProfile) のタプル
+
+    Raises:
+        DatabaseError: UPSERT処理時にエラーが発生した場合
+    """
     try:
         sql = text(
             """
-            INSERT INTO virtual_member_profiles (member_id, member_uuid, llm_model, custom_prompt, profile_uuid, created_at, updated_at)
-            VALUES (:member_id, :member_uuid, :llm_model, :custom_prompt, gen_random_uuid(), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-            ON CONFLICT (member_uuid)
-            DO UPDATE SET
-                member_id = EXCLUDED.member_id,
-                llm_model = EXCLUDED.llm_model,
-                custom_prompt = EXCLUDED.custom_prompt,
-                updated_at = CURRENT_TIMESTAMP
-            RETURNING profile_id, member_id, member_uuid, llm_model, custom_prompt, profile_uuid, created_at, updated_at
+            WITH member_upsert AS (
+                INSERT INTO virtual_members (member_name, yml_file_uri, yml_file_hash, yml_file_etag, yml_file_last_modified, member_uuid, created_at, updated_at)
+                VALUES (:name, :yml_file_uri, :yml_file_hash, :yml_file_etag, CAST(:yml_file_last_modified AS TIMESTAMPTZ), gen_random_uuid(), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+                ON CONFLICT (yml_file_uri)
+                DO UPDATE SET
+                    member_name = EXCLUDED.member_name,
+                    yml_file_hash = EXCLUDED.yml_file_hash,
+                    yml_file_etag = COALESCE(EXCLUDED.yml_file_etag, virtual_members.yml_file_etag),
+                    yml_file_last_modified = COALESCE(EXCLUDED.yml_file_last_modified, virtual_members.yml_file_last_modified),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE (virtual_members.member_name, virtual_members.yml_file_hash, virtual_members.yml_file_etag, virtual_members.yml_file_last_modified)
+                    IS DISTINCT FROM (
+                        EXCLUDED.member_name,
+                        EXCLUDED.yml_file_hash,
+                        COALESCE(EXCLUDED.yml_file_etag, virtual_members.yml_file_etag),
+                        COALESCE(EXCLUDED.yml_file_last_modified, virtual_members.yml_file_last_modified)
+                    )
+                RETURNING member_id, member_uuid, member_name, yml_file_uri, yml_file_hash, yml_file_etag, yml_file_last_modified,
+                    created_at, updated_at,
+                    CASE WHEN xmax = 0 THEN 'inserted' ELSE 'updated' END AS member_action
+            ),
+            member AS (
+                SELECT * FROM member_upsert
+                UNION ALL
+                SELECT member_id, member_uuid, member_name, yml_file_uri, yml_file_hash, yml_file_etag, yml_file_last_modified,
+                    created_at, updated_at, 'unchanged'
+                FROM virtual_members
+                WHERE yml_file_uri = :yml_file_uri AND NOT EXISTS (SELECT 1 FROM member_upsert)
+            ),
+            profile_upsert AS (
+                INSERT INTO virtual_member_profiles (member_id, member_uuid, llm_model, custom_prompt, profile_uuid, created_at, updated_at)
+                SELECT member_id, member_uuid, :llm_model, :custom_prompt, gen_random_uuid(), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+                FROM member
+                ON CONFLICT (member_uuid)
+                DO UPDATE SET
+                    member_id = EXCLUDED.member_id,
+                    llm_model = EXCLUDED.llm_model,
+                    custom_prompt = EXCLUDED.custom_prompt,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE (virtual_member_profiles.member_id, virtual_member_profiles.llm_model, virtual_member_profiles.custom_prompt)
+                    IS DISTINCT FROM (EXCLUDED.member_id, EXCLUDED.llm_model, EXCLUDED.custom_prompt)
+                RETURNING profile_id, profile_uuid, member_uuid, llm_model, custom_prompt,
+                    created_at AS profile_created_at, updated_at AS profile_updated_at,
+                    CASE WHEN xmax = 0 THEN 'inserted' ELSE 'updated' END AS profile_action
+            ),
+            profile AS (
+                SELECT * FROM profile_upsert
+                UNION ALL
+                SELECT p.profile_id, p.profile_uuid, p.member_uuid, p.llm_model, p.custom_prompt,
+                    p.created_at, p.updated_at, 'unchanged'
+                FROM virtual_member_profiles p
+                JOIN member m ON p.member_uuid = m.member_uuid
+                WHERE NOT EXISTS (SELECT 1 FROM profile_upsert)
+            )
+            SELECT m.member_id, m.member_uuid, m.member_name, m.yml_file_uri, m.yml_file_hash,
+                m.yml_file_etag, m.yml_file_last_modified, m.created_at, m.updated_at, m.member_action,
+                p.profile_id, p.profile_uuid, p.llm_model, p.custom_prompt,
+                p.profile_created_at, p.profile_updated_at, p.profile_action
+            FROM member m
+            JOIN profile p ON p.member_uuid = m.member_uuid
         """
         )
 
-        result = db.execute(
+        row = db.execute(
             sql,
             {
-                "member_id": member_id,
-                "member_uuid": member_uuid,
+                "name": name,
+                "yml_file_uri": yml_file_uri,
+                "yml_file_hash": yml_file_hash,
+                "yml_file_etag": yml_file_etag,
+                "yml_file_last_modified": yml_file_last_modified,
                 "llm_model": llm_model,
                 "custom_prompt": custom_prompt,
             },
-        )
-        row = result.fetchone()
+        ).fetchone()
 
-        # 結果からVirtualMemberProfileオブジェクトを構築
+        # 結果からVirtualMember・VirtualMemberProfileオブジェクトを構築
+        member = VirtualMember(
+            member_id=row.member_id,
+            member_uuid=row.member_uuid,
+            member_name=row.member_name,
+            yml_file_uri=row.yml_file_uri,
+            yml_file_hash=row.yml_file_hash,
+            yml_file_etag=row.yml_file_etag,
+            yml_file_last_modified=row.yml_file_last_modified,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+        )
         profile = VirtualMemberProfile(
             profile_id=row.profile_id,
             profile_uuid=row.profile_uuid,
@@ -470,15 +848,679 @@ def upsert_virtual_member_profile(
             member_uuid=row.member_uuid,
             llm_model=row.llm_model,
             custom_prompt=row.custom_prompt,
+            created_at=row.profile_created_at,
+            updated_at=row.profile_updated_at,
+        )
+
+        if counts is not None:
+            counts.add(row.member_action)
+            counts.add(row.profile_action)
+
+        logger.info(
+            f"Virtual member '{name}' {row.member_action} and profile {row.profile_action} "
+            f"for URI: {yml_file_uri}"
+        )
+        return member, profile
+
+    except Exception as e:
+        # NOTE: ロールバックは呼び出し元で実行
+        error_msg = f"Failed to upsert virtual member '{name}' with profile for URI '{yml_file_uri}': {str(e)}"
+        logger.error(error_msg)
+        raise DatabaseError(error_msg, e)
+
+
+# バルク操作
+# 1文あたりの最大行数（PostgreSQLのバインドパラメータ上限 65535 を超えない範囲）
+BULK_UPSERT_CHUNK_SIZE = int(os.getenv("BULK_UPSERT_CHUNK_SIZE", "500"))
+
+# テーブルごとのバルクUPSERT定義（列・VALUES句の1行分・衝突キーとそのパラメータ・衝突時の更新列・
+# 値がNULLの場合は既存の値を保持する更新列・RETURNING列）
+_BULK_UPSERT_SPECS = {
+    "human_members": {
+        "columns": "member_name, yml_file_uri, yml_file_hash, yml_file_etag, yml_file_last_modified, member_uuid, created_at, updated_at",
+        "values": "(:member_name_{i}, :yml_file_uri_{i}, :yml_file_hash_{i}, :yml_file_etag_{i}, CAST(:yml_file_last_modified_{i} AS TIMESTAMPTZ), gen_random_uuid(), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)",
+        "params": (
+            "member_name",
+            "yml_file_uri",
+            "yml_file_hash",
+            "yml_file_etag",
+            "yml_file_last_modified",
+        ),
+        "conflict": "yml_file_uri",
+        "conflict_param": ":yml_file_uri_{i}",
+        "update": ("member_name", "yml_file_hash", "yml_file_etag", "yml_file_last_modified"),
+        "keep_existing": ("yml_file_hash", "yml_file_etag", "yml_file_last_modified"),
+        "returning": "member_id, member_uuid, member_name, yml_file_uri, yml_file_hash, yml_file_etag, yml_file_last_modified, created_at, updated_at",
+    },
+    "virtual_members": {
+        "columns": "member_name, yml_file_uri, yml_file_hash, yml_file_etag, yml_file_last_modified, member_uuid, created_at, updated_at",
+        "values": "(:member_name_{i}, :yml_file_uri_{i}, :yml_file_hash_{i}, :yml_file_etag_{i}, CAST(:yml_file_last_modified_{i} AS TIMESTAMPTZ), gen_random_uuid(), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)",
+        "params": (
+            "member_name",
+            "yml_file_uri",
+            "yml_file_hash",
+            "yml_file_etag",
+            "yml_file_last_modified",
+        ),
+        "conflict": "yml_file_uri",
+        "conflict_param": ":yml_file_uri_{i}",
+        "update": ("member_name", "yml_file_hash", "yml_file_etag", "yml_file_last_modified"),
+        "keep_existing": ("yml_file_hash", "yml_file_etag", "yml_file_last_modified"),
+        "returning": "member_id, member_uuid, member_name, yml_file_uri, yml_file_hash, yml_file_etag, yml_file_last_modified, created_at, updated_at",
+    },
+    "human_member_profiles": {
+        "columns": "member_id, member_uuid, bio, profile_uuid, created_at, updated_at",
+        "values": "(:member_id_{i}, CAST(:member_uuid_{i} AS UUID), :bio_{i}, gen_random_uuid(), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)",
+        "params": ("member_id", "member_uuid", "bio"),
+        "conflict": "member_uuid",
+        "conflict_param": "CAST(:member_uuid_{i} AS UUID)",
+        "update": ("member_id", "bio"),
+        "returning": "profile_id, member_id, member_uuid, bio, profile_uuid, created_at, updated_at",
+    },
+    "virtual_member_profiles": {
+        "columns": "member_id, member_uuid, llm_model, custom_prompt, profile_uuid, created_at, updated_at",
+        "values": "(:member_id_{i}, CAST(:member_uuid_{i} AS UUID), :llm_model_{i}, :custom_prompt_{i}, gen_random_uuid(), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)",
+        "params": ("member_id", "member_uuid", "llm_model", "custom_prompt"),
+        "conflict": "member_uuid",
+        "conflict_param": "CAST(:member_uuid_{i} AS UUID)",
+        "update": ("member_id", "llm_model", "custom_prompt"),
+        "returning": "profile_id, member_id, member_uuid, llm_model, custom_prompt, profile_uuid, created_at, updated_at",
+    },
+}
+
+
+def _bulk_upsert(
+    db: Session, table: str, rows: list, chunk_size: int = None, counts: UpsertCounts = None
+) -> list:
+    """複数行VALUESのINSERT ... ON CONFLICT DO UPDATEでまとめてUPSERTする
+
+    同一の衝突キーを持つ行は後勝ちで1行にまとめ（1文内で同じ行を2回更新できないため）、
+    chunk_size 行ごとに1文を実行します。既存行と値が同じ場合は DO UPDATE の WHERE 句
+    （IS DISTINCT FROM）で更新を行わず、dead tupleやインデックス更新を発生させません。
+    更新しなかった行も既存の値を返すため、結果には全ての入力行が含まれます。
+    spec の keep_existing に含まれる列は、値がNULL（キーの省略を含む）の行では既存の値を
+    保持します（行ごとに判定するため、値を指定した行と省略した行を混在させられます）。
+
+    Args:
+        db (Session): SQLAlchemyのデータベースセッション
+        table (str): テーブル名（_BULK_UPSERT_SPECS に定義されたもの）
+        rows (list): 列名をキーとする辞書のリスト
+        chunk_size (int): 1文あたりの最大行数（未指定の場合は BULK_UPSERT_CHUNK_SIZE）
+        counts (UpsertCounts): 新規登録・更新・変更なしの件数を加算する集計オブジェクト
+
+    Returns:
+        list: RETURNING句の結果行のリスト（upsert_action 列に
+            "inserted" / "updated" / "unchanged" を含む、順序は不定）
+    """
+    spec = _BULK_UPSERT_SPECS[table]
+    chunk_size = chunk_size or BULK_UPSERT_CHUNK_SIZE
+
+    # 衝突キーで重複を除去（後勝ち、順序は最初の出現位置を維持）
+    unique_rows = {}
+    for row in rows:
+        unique_rows[str(row[spec["conflict"]])] = row
+    unique_rows = list(unique_rows.values())
+
+    # 値を指定しない行（ハッシュ・ETag・更新日時がNULL）は既存の値を保持する
+    update_values = {
+        column: (
+            f"COALESCE(EXCLUDED.{column}, {table}.{column})"
+            if column in spec.get("keep_existing", ())
+            else f"EXCLUDED.{column}"
+        )
+        for column in spec["update"]
+    }
+    update_clause = ",\n                ".join(
+        [f"{column} = {value}" for column, value in update_values.items()]
+        + ["updated_at = CURRENT_TIMESTAMP"]
+    )
+    # 値が変わる場合のみ更新（NULLを含めて比較）
+    changed_condition = (
+        f"ROW({', '.join(f'{table}.{column}' for column in update_values)}) IS DISTINCT FROM "
+        f"ROW({', '.join(update_values.values())})"
+    )
+    existing_columns = ", ".join(
+        f"existing.{column.strip()}" for column in spec["returning"].split(",")
+    )
+
+    results = []
+    for start in range(0, len(unique_rows), chunk_size):
+        chunk = unique_rows[start : start + chunk_size]
+        values_clause = ",\n                ".join(
+            spec["values"].format(i=i) for i in range(len(chunk))
+        )
+        conflict_params = ", ".join(spec["conflict_param"].format(i=i) for i in range(len(chunk)))
+        # 更新しなかった既存行は文開始時点のスナップショットから返す
+        sql = text(
+            f"""
+            WITH upserted AS (
+                INSERT INTO {table} ({spec["columns"]})
+                VALUES
+                    {values_clause}
+                ON CONFLICT ({spec["conflict"]})
+                DO UPDATE SET
+                    {update_clause}
+                WHERE {changed_condition}
+                RETURNING {spec["returning"]},
+                    CASE WHEN xmax = 0 THEN 'inserted' ELSE 'updated' END AS upsert_action
+            )
+            SELECT * FROM upserted
+            UNION ALL
+            SELECT {existing_columns}, 'unchanged' AS upsert_action
+            FROM {table} existing
+            WHERE existing.{spec["conflict"]} IN ({conflict_params})
+                AND existing.{spec["conflict"]} NOT IN (SELECT {spec["conflict"]} FROM upserted)
+        """
+        )
+
+        params = {}
+        for i, row in enumerate(chunk):
+            for column in spec["params"]:
+                value = row.get(column)
+                params[f"{column}_{i}"] = str(value) if column == "member_uuid" else value
+
+        chunk_results = db.execute(sql, params).fetchall()
+        if counts is not None:
+            for result in chunk_results:
+                counts.add(result.upsert_action)
+        results.extend(chunk_results)
+
+    return results
+
+
+def _summarize_upsert_actions(rows: list) -> UpsertCounts:
+    """RETURNINGの結果行の upsert_action 列を集計する"""
+    counts = UpsertCounts()
+    for row in rows:
+        counts.add(row.upsert_action)
+    return counts
+
+
+def _rows_to_members(member_class, rows: list, yml_file_uris: list) -> list:
+    """RETURNINGの結果行を入力のURI順のメンバーオブジェクトのリストに変換する"""
+    members_by_uri = {
+        row.yml_file_uri: member_class(
+            member_id=row.member_id,
+            member_uuid=row.member_uuid,
+            member_name=row.member_name,
+            yml_file_uri=row.yml_file_uri,
+            yml_file_hash=row.yml_file_hash,
+            yml_file_etag=row.yml_file_etag,
+            yml_file_last_modified=row.yml_file_last_modified,
             created_at=row.created_at,
             updated_at=row.updated_at,
         )
+        for row in rows
+    }
+    return [members_by_uri[uri] for uri in yml_file_uris]
 
-        logger.info(f"Virtual member profile upserted for member {member_uuid}")
-        return profile
+
+def bulk_upsert_human_members(
+    db: Session, members: list, chunk_size: int = None, counts: UpsertCounts = None
+):
+    """人間メンバーを複数行のUPSERT文でまとめて登録・更新する
+
+    1件ずつ upsert_human_member を呼び出す代わりに、chunk_size 件ごとに
+    1回のINSERT ... ON CONFLICT DO UPDATE ... RETURNING で処理します。
+    コミットは呼び出し元で行います。
+
+    Args:
+        db (Session): SQLAlchemyのデータベースセッション
+        members (list): name, yml_file_uri（任意で yml_file_hash, yml_file_etag,
+            yml_file_last_modified）をキーとする辞書のリスト
+        chunk_size (int): 1文あたりの最大行数（未指定の場合は BULK_UPSERT_CHUNK_SIZE）
+        counts (UpsertCounts): 新規登録・更新・変更なしの件数を加算する集計オブジェクト
+
+    Returns:
+        list: 入力と同じ順序のHumanMemberオブジェクトのリスト
+            （同じURIが複数ある場合は同じメンバーを指す）
+
+    Raises:
+        DatabaseError: UPSERT処理時にエラーが発生した場合
+
+    Example:
+        >>> members = bulk_upsert_human_members(
+        ...     db, [{"name": "田中太郎", "yml_file_uri": "data/human_members/tanaka.yml"}]
+        ... )
+    """
+    if not members:
+        return []
+
+    try:
+        rows = _bulk_upsert(
+            db,
+            "human_members",
+            [
+                {
+                    "member_name": member["name"],
+                    "yml_file_uri": member["yml_file_uri"],
+                    "yml_file_hash": member.get("yml_file_hash"),
+                    "yml_file_etag": member.get("yml_file_etag"),
+                    "yml_file_last_modified": member.get("yml_file_last_modified"),
+                }
+                for member in members
+            ],
+            chunk_size,
+            counts,
+        )
+        result = _rows_to_members(HumanMember, rows, [member["yml_file_uri"] for member in members])
+        logger.info(f"Bulk upserted {len(rows)} human members ({_summarize_upsert_actions(rows)})")
+        return result
 
     except Exception as e:
         # NOTE: ロールバックは呼び出し元で実行
-        error_msg = f"Failed to upsert virtual member profile for member {member_uuid}: {str(e)}"
+        error_msg = f"Failed to bulk upsert {len(members)} human members: {str(e)}"
+        logger.error(error_msg)
+        raise DatabaseError(error_msg, e)
+
+
+def bulk_upsert_virtual_members(
+    db: Session, members: list, chunk_size: int = None, counts: UpsertCounts = None
+):
+    """仮想メンバーを複数行のUPSERT文でまとめて登録・更新する
+
+    1件ずつ upsert_virtual_member を呼び出す代わりに、chunk_size 件ごとに
+    1回のINSERT ... ON CONFLICT DO UPDATE ... RETURNING で処理します。
+    コミットは呼び出し元で行います。
+
+    Args:
+        db (Session): SQLAlchemyのデータベースセッション
+        members (list): name, yml_file_uri（任意で yml_file_hash, yml_file_etag,
+            yml_file_last_modified）をキーとする辞書のリスト
+        chunk_size (int): 1文あたりの最大行数（未指定の場合は BULK_UPSERT_CHUNK_SIZE）
+        counts (UpsertCounts): 新規登録・更新・変更なしの件数を加算する集計オブジェクト
+
+    Returns:
+        list: 入力と同じ順序のVirtualMemberオブジェクトのリスト
+            （同じURIが複数ある場合は同じメンバーを指す）
+
+    Raises:
+        DatabaseError: UPSERT処理時にエラーが発生した場合
+    """
+    if not members:
+        return []
+
+    try:
+        rows = _bulk_upsert(
+            db,
+            "virtual_members",
+            [
+                {
+                    "member_name": member["name"],
+                    "yml_file_uri": member["yml_file_uri"],
+                    "yml_file_hash": member.get("yml_file_hash"),
+                    "yml_file_etag": member.get("yml_file_etag"),
+                    "yml_file_last_modified": member.get("yml_file_last_modified"),
+                }
+                for member in members
+            ],
+            chunk_size,
+            counts,
+        )
+        result = _rows_to_members(
+            VirtualMember, rows, [member["yml_file_uri"] for member in members]
+        )
+        logger.info(
+            f"Bulk upserted {len(rows)} virtual members ({_summarize_upsert_actions(rows)})"
+        )
+        return result
+
+    except Exception as e:
+        # NOTE: ロールバックは呼び出し元で実行
+        error_msg = f"Failed to bulk upsert {len(members)} virtual members: {str(e)}"
+        logger.error(error_msg)
+        raise DatabaseError(error_msg, e)
+
+
+def bulk_upsert_human_member_profiles(
+    db: Session, profiles: list, chunk_size: int = None, counts: UpsertCounts = None
+):
+    """人間メンバープロフィールを複数行のUPSERT文でまとめて登録・更新する
+
+    Args:
+        db (Session): SQLAlchemyのデータベースセッション
+        profiles (list): member_id, member_uuid, bio をキーとする辞書のリスト
+        chunk_size (int): 1文あたりの最大行数（未指定の場合は BULK_UPSERT_CHUNK_SIZE）
+        counts (UpsertCounts): 新規登録・更新・変更なしの件数を加算する集計オブジェクト
+
+    Returns:
+        list: HumanMemberProfileオブジェクトのリスト
+
+    Raises:
+        DatabaseError: UPSERT処理時にエラーが発生した場合
+    """
+    if not profiles:
+        return []
+
+    try:
+        rows = _bulk_upsert(db, "human_member_profiles", profiles, chunk_size, counts)
+        result = [
+            HumanMemberProfile(
+                profile_id=row.profile_id,
+                profile_uuid=row.profile_uuid,
+                member_id=row.member_id,
+                member_uuid=row.member_uuid,
+                bio=row.bio,
+                created_at=row.created_at,
+                updated_at=row.updated_at,
+            )
+            for row in rows
+        ]
+        logger.info(
+            f"Bulk upserted {len(rows)} human member profiles ({_summarize_upsert_actions(rows)})"
+        )
+        return result
+
+    except Exception as e:
+        # NOTE: ロールバックは呼び出し元で実行
+        error_msg = f"Failed to bulk upsert {len(profiles)} human member profiles: {str(e)}"
+        logger.error(error_msg)
+        raise DatabaseError(error_msg, e)
+
+
+def bulk_upsert_virtual_member_profiles(
+    db: Session, profiles: list, chunk_size: int = None, counts: UpsertCounts = None
+):
+    """仮想メンバープロフィールを複数行のUPSERT文でまとめて登録・更新する
+
+    Args:
+        db (Session): SQLAlchemyのデータベースセッション
+        profiles (list): member_id, member_uuid, llm_model, custom_prompt をキーとする辞書のリスト
+        chunk_size (int): 1文あたりの最大行数（未指定の場合は BULK_UPSERT_CHUNK_SIZE）
+        counts (UpsertCounts): 新規登録・更新・変更なしの件数を加算する集計オブジェクト
+
+    Returns:
+        list: VirtualMemberProfileオブジェクトのリスト
+
+    Raises:
+        DatabaseError: UPSERT処理時にエラーが発生した場合
+    """
+    if not profiles:
+        return []
+
+    try:
+        rows = _bulk_upsert(db, "virtual_member_profiles", profiles, chunk_size, counts)
+        result = [
+            VirtualMemberProfile(
+                profile_id=row.profile_id,
+                profile_uuid=row.profile_uuid,
+                member_id=row.member_id,
+                member_uuid=row.member_uuid,
+                llm_model=row.llm_model,
+                custom_prompt=row.custom_prompt,
+                created_at=row.created_at,
+                updated_at=row.updated_at,
+            )
+            for row in rows
+        ]
+        logger.info(
+            f"Bulk upserted {len(rows)} virtual member profiles ({_summarize_upsert_actions(rows)})"
+        )
+        return result
+
+    except Exception as e:
+        # NOTE: ロールバックは呼び出し元で実行
+        error_msg = f"Failed to bulk upsert {len(profiles)} virtual member profiles: {str(e)}"
+        logger.error(error_msg)
+        raise DatabaseError(error_msg, e)
+
+
+# ストレージ同期操作
+# メンバー種別ごとのモデル（メンバー・プロフィール）
+_MEMBER_MODELS = {
+    "human": (HumanMember, HumanMemberProfile),
+    "virtual": (VirtualMember, VirtualMemberProfile),
+}
+
+
+def get_members_by_prefix(db: Session, member_type: str, prefix: str):
+    """YAMLファイルURIのプレフィックスでメンバーをまとめて取得する
+
+    差分同期で、バケットの一覧と登録済みのETag・更新日時を比較するために使用します。
+
+    Args:
+        db (Session): SQLAlchemyのデータベースセッション
+        member_type (str): "human" または "virtual"
+        prefix (str): YAMLファイルURIのプレフィックス（例: "data/human_members/"）
+
+    Returns:
+        dict: YAMLファイルURIをキー、メンバーオブジェクトを値とする辞書
+
+    Raises:
+        DatabaseError: データベース検索時にエラーが発生した場合
+    """
+    member_class, _ = _MEMBER_MODELS[member_type]
+    try:
+        members = (
+            db.query(member_class)
+            .filter(member_class.yml_file_uri.startswith(prefix, autoescape=True))
+            .all()
+        )
+        return {member.yml_file_uri: member for member in members}
+    except Exception as e:
+        error_msg = f"Failed to get {member_type} members with prefix '{prefix}': {str(e)}"
+        logger.error(error_msg)
+        raise DatabaseError(error_msg, e)
+
+
+def delete_members_by_uris(db: Session, member_type: str, yml_file_uris: list) -> int:
+    """YAMLファイルURIでメンバーとプロフィール・関係を削除する
+
+    ストレージから削除されたYAMLに対応するメンバーを削除します。
+    member_relationships には外部キーがないため、削除するメンバーを from / to に持つ
+    関係とプロフィールを先に削除してからメンバーを削除します。コミットは呼び出し元で行います。
+
+    Args:
+        db (Session): SQLAlchemyのデータベースセッション
+        member_type (str): "human" または "virtual"
+        yml_file_uris (list): 削除するYAMLファイルURIのリスト
+
+    Returns:
+        int: 削除したメンバー数
+
+    Raises:
+        DatabaseError: 削除処理時にエラーが発生した場合
+    """
+    if not yml_file_uris:
+        return 0
+
+    member_class, profile_class = _MEMBER_MODELS[member_type]
+    try:
+        member_uuids = select(member_class.member_uuid).where(
+            member_class.yml_file_uri.in_(yml_file_uris)
+        )
+        db.query(MemberRelationship).filter(
+            or_(
+                MemberRelationship.from_member_uuid.in_(member_uuids),
+                MemberRelationship.to_member_uuid.in_(member_uuids),
+            )
+        ).delete(synchronize_session=False)
+        db.query(profile_class).filter(profile_class.member_uuid.in_(member_uuids)).delete(
+            synchronize_session=False
+        )
+        deleted = (
+            db.query(member_class)
+            .filter(member_class.yml_file_uri.in_(yml_file_uris))
+            .delete(synchronize_session=False)
+        )
+        logger.info(f"Deleted {deleted} {member_type} members removed from storage")
+        return deleted
+    except Exception as e:
+        # NOTE: ロールバックは呼び出し元で実行
+        error_msg = f"Failed to delete {len(yml_file_uris)} {member_type} members: {str(e)}"
+        logger.error(error_msg)
+        raise DatabaseError(error_msg, e)
+
+
+def get_storage_sync_checkpoint(db: Session, prefix: str):
+    """プレフィックスの同期チェックポイントを取得する
+
+    Args:
+        db (Session): SQLAlchemyのデータベースセッション
+        prefix (str): ストレージのプレフィックス
+
+    Returns:
+        StorageSyncCheckpoint or None: チェックポイント、または未同期の場合はNone
+
+    Raises:
+        DatabaseError: データベース検索時にエラーが発生した場合
+    """
+    try:
+        return db.get(StorageSyncCheckpoint, prefix)
+    except Exception as e:
+        error_msg = f"Failed to get storage sync checkpoint for '{prefix}': {str(e)}"
+        logger.error(error_msg)
+        raise DatabaseError(error_msg, e)
+
+
+def save_storage_sync_checkpoint(
+    db: Session,
+    prefix: str,
+    listing_digest: str,
+    object_count: int,
+    max_last_modified=None,
+    added_count: int = 0,
+    changed_count: int = 0,
+    deleted_count: int = 0,
+):
+    """プレフィックスの同期チェックポイントを保存する（ON CONFLICT DO UPDATE使用）
+
+    コミットは呼び出し元で行います。
+
+    Args:
+        db (Session): SQLAlchemyのデータベースセッション
+        prefix (str): ストレージのプレフィックス
+        listing_digest (str): 同期したオブジェクト一覧（キー・ETag）のハッシュ
+        object_count (int): 同期したオブジェクト数
+        max_last_modified (datetime): オブジェクトの最新の更新日時
+        added_count (int): 追加したオブジェクト数
+        changed_count (int): 変更されたオブジェクト数
+        deleted_count (int): 削除したオブジェクト数
+
+    Raises:
+        DatabaseError: 保存処理時にエラーが発生した場合
+    """
+    try:
+        sql = text(
+            """
+            INSERT INTO storage_sync_checkpoints (
+                prefix, listing_digest, object_count, max_last_modified,
+                added_count, changed_count, deleted_count, synced_at
+            )
+            VALUES (
+                :prefix, :listing_digest, :object_count, :max_last_modified,
+                :added_count, :changed_count, :deleted_count, CURRENT_TIMESTAMP
+            )
+            ON CONFLICT (prefix)
+            DO UPDATE SET
+                listing_digest = EXCLUDED.listing_digest,
+                object_count = EXCLUDED.object_count,
+                max_last_modified = EXCLUDED.max_last_modified,
+                added_count = EXCLUDED.added_count,
+                changed_count = EXCLUDED.changed_count,
+                deleted_count = EXCLUDED.deleted_count,
+                synced_at = CURRENT_TIMESTAMP
+        """
+        )
+        db.execute(
+            sql,
+            {
+                "prefix": prefix,
+                "listing_digest": listing_digest,
+                "object_count": object_count,
+                "max_last_modified": max_last_modified,
+                "added_count": added_count,
+                "changed_count": changed_count,
+                "deleted_count": deleted_count,
+            },
+        )
+        logger.info(f"Storage sync checkpoint saved for '{prefix}' ({object_count} objects)")
+    except Exception as e:
+        # NOTE: ロールバックは呼び出し元で実行
+        error_msg = f"Failed to save storage sync checkpoint for '{prefix}': {str(e)}"
+        logger.error(error_msg)
+        raise DatabaseError(error_msg, e)
+
+
+def get_registration_checkpoint(db: Session, prefix: str):
+    """プレフィックスのストリーミング登録の進捗（チェックポイント）を取得する
+
+    Args:
+        db (Session): SQLAlchemyのデータベースセッション
+        prefix (str): ストレージのプレフィックス
+
+    Returns:
+        RegistrationCheckpoint or None: チェックポイント、または未実行の場合はNone
+
+    Raises:
+        DatabaseError: データベース検索時にエラーが発生した場合
+    """
+    try:
+        return db.get(RegistrationCheckpoint, prefix)
+    except Exception as e:
+        error_msg = f"Failed to get registration checkpoint for '{prefix}': {str(e)}"
+        logger.error(error_msg)
+        raise DatabaseError(error_msg, e)
+
+
+def save_registration_checkpoint(
+    db: Session,
+    prefix: str,
+    last_object_name: str = None,
+    processed_count: int = 0,
+    started: bool = False,
+    completed: bool = False,
+):
+    """プレフィックスのストリーミング登録の進捗を保存する（ON CONFLICT DO UPDATE使用）
+
+    コミットは呼び出し元で行います。
+
+    Args:
+        db (Session): SQLAlchemyのデータベースセッション
+        prefix (str): ストレージのプレフィックス
+        last_object_name (str): キー順で最後にコミットしたオブジェクト名
+        processed_count (int): これまでに処理したオブジェクト数
+        started (bool): Trueの場合は開始日時を現在時刻にリセットする（新規実行の開始時）
+        completed (bool): Trueの場合は完了日時を記録する（Falseの場合は未完了に戻す）
+
+    Raises:
+        DatabaseError: 保存処理時にエラーが発生した場合
+    """
+    try:
+        sql = text(
+            """
+            INSERT INTO registration_checkpoints (
+                prefix, last_object_name, processed_count, started_at, updated_at, completed_at
+            )
+            VALUES (
+                :prefix, :last_object_name, :processed_count,
+                CURRENT_TIMESTAMP, CURRENT_TIMESTAMP,
+                CASE WHEN :completed THEN CURRENT_TIMESTAMP END
+            )
+            ON CONFLICT (prefix)
+            DO UPDATE SET
+                last_object_name = EXCLUDED.last_object_name,
+                processed_count = EXCLUDED.processed_count,
+                started_at = CASE
+                    WHEN :started THEN EXCLUDED.started_at
+                    ELSE registration_checkpoints.started_at
+                END,
+                updated_at = CURRENT_TIMESTAMP,
+                completed_at = EXCLUDED.completed_at
+        """
+        )
+        db.execute(
+            sql,
+            {
+                "prefix": prefix,
+                "last_object_name": last_object_name,
+                "processed_count": processed_count,
+                "started": started,
+                "completed": completed,
+            },
+        )
+    except Exception as e:
+        # NOTE: ロールバックは呼び出し元で実行
+        error_msg = f"Failed to save registration checkpoint for '{prefix}': {str(e)}"
         logger.error(error_msg)
         raise DatabaseError(error_msg, e)
@@ -0,0 +1,386 @@
+#!/usr/bin/env python
+import argparse
+import csv
+import io
+import os
+from pathlib import Path
+
+import psycopg2
+import yaml
+from db.database import DatabaseError, SessionLocal, UpsertCounts
+from operations.member_registration import compute_yaml_hash, fetch_and_validate_yamls
+from operations.streaming_registration import iter_chunks
+from storage.storage_client import HUMAN_MEMBERS_PREFIX, VIRTUAL_MEMBERS_PREFIX, StorageClient
+from utils.logging_config import setup_logging
+from validation.yaml_validator import YAMLValidator
+
+logger = setup_logging(__name__)
+
+# ステージングテーブルへ1回のCOPYで送る行数
+BULK_IMPORT_COPY_CHUNK_SIZE = int(os.getenv("BULK_IMPORT_COPY_CHUNK_SIZE", "5000"))
+
+# ステージングテーブルの共通列（COPYする順序）
+_STAGING_MEMBER_COLUMNS = (
+    "seq",
+    "member_name",
+    "yml_file_uri",
+    "yml_file_hash",
+    "yml_file_etag",
+    "yml_file_last_modified",
+)
+
+# メンバー種別ごとの一括インポート定義
+_IMPORT_SPECS = {
+    "human": {
+        "prefix": HUMAN_MEMBERS_PREFIX,
+        "validate": YAMLValidator.validate_human_member_yaml,
+        "members_table": "human_members",
+        "profiles_table": "human_member_profiles",
+        "profile_columns": ("bio",),
+        # bioがないメンバーはプロフィールを作成しない（バッチ登録と同じ）
+        "profile_required": "bio",
+    },
+    "virtual": {
+        "prefix": VIRTUAL_MEMBERS_PREFIX,
+        "validate": YAMLValidator.validate_virtual_member_yaml,
+        "members_table": "virtual_members",
+        "profiles_table": "virtual_member_profiles",
+        "profile_columns": ("llm_model", "custom_prompt"),
+        "profile_required": "llm_model",
+    },
+}
+
+
+def iter_storage_records(member_type: str, prefix: str = None, chunk_size: int = None):
+    """ストレージのYAMLを一覧順に取得・バリデーションし、インポート用のレコードを順次返す
+
+    一覧は iter_yaml_objects() で順次取得し、chunk_size 件ごとに並列取得するため、
+    オブジェクト数が多い場合でもメモリ使用量は一定です。
+
+    Args:
+        member_type (str): "human" または "virtual"
+        prefix (str, optional): ストレージのプレフィックス。Noneの場合は種別ごとの既定値
+        chunk_size (int, optional): 並列取得の単位。Noneの場合は BULK_IMPORT_COPY_CHUNK_SIZE
+
+    Yields:
+        tuple: (yml_file_uri, yaml_data, metadata) のタプル
+            （metadata は etag, last_modified を含む辞書）
+
+    Raises:
+        ValidationError: YAMLデータのバリデーションに失敗した場合
+        Exception: ストレージからの取得に失敗した場合
+    """
+    spec = _IMPORT_SPECS[member_type]
+    storage_client = StorageClient()
+    objects = storage_client.iter_yaml_objects(prefix or spec["prefix"])
+
+    for chunk in iter_chunks(objects, chunk_size or BULK_IMPORT_COPY_CHUNK_SIZE):
+        yaml_data_list = fetch_and_validate_yamls(
+            storage_client, [obj["object_name"] for obj in chunk], spec["validate"]
+        )
+        for obj, (yml_file_uri, yaml_data) in zip(chunk, yaml_data_list, strict=True):
+            yield yml_file_uri, yaml_data, {
+                "etag": obj["etag"],
+                "last_modified": obj["last_modified"],
+            }
+
+
+def iter_local_records(member_type: str, directory: str, prefix: str = None):
+    """ローカルディレクトリのYAMLを読み込み、インポート用のレコードを順次返す
+
+    directory をバケットのルートとみなし、「directory / プレフィックス」以下のYAMLを読み込みます。
+    YAMLファイルURIは directory からの相対パスとなるため、バケットと同じ構成のディレクトリから
+    読み込めば、以降の差分同期やバッチ登録と同じメンバーとして扱われます。
+
+    Args:
+        member_type (str): "human" または "virtual"
+        directory (str): バケットと同じ構成のYAMLファイルを格納したディレクトリ
+        prefix (str, optional): 読み込むプレフィックス。Noneの場合は種別ごとの既定値
+
+    Yields:
+        tuple: (yml_file_uri, yaml_data, metadata) のタプル（metadata は空の辞書のため、
+            登録済みメンバーに記録されたETag・更新日時は上書きされません）
+
+    Raises:
+        ValidationError: YAMLデータのバリデーションに失敗した場合
+    """
+    spec = _IMPORT_SPECS[member_type]
+    root = Path(directory)
+
+    for path in sorted((root / (prefix or spec["prefix"])).rglob("*")):
+        if path.suffix not in (".yml", ".yaml"):
+            continue
+        with path.open(encoding="utf-8") as f:
+            yaml_data = yaml.safe_load(f)
+        spec["validate"](yaml_data)
+        yield path.relative_to(root).as_posix(), yaml_data, {}
+
+
+def _copy_rows(cursor, table: str, columns: tuple, rows: list):
+    """行のリストをCSVとしてCOPY FROM STDINでテーブルに送る（内部関数）"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        # 空文字列はNULLとして送る（CSV形式では引用符なしの空フィールドがNULL）
+        writer.writerow(["" if value is None or value == "" else value for value in row])
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def _merge_members(cursor, spec: dict, staging_table: str) -> UpsertCounts:
+    """ステージングテーブルからメンバーテーブルへ1文でUPSERTする（内部関数）"""
+    table = spec["members_table"]
+    # ETag・更新日時がないレコード（ローカルディレクトリから読み込んだもの）は既存の値を保持する
+    update_values = {
+        "member_name": "EXCLUDED.member_name",
+        "yml_file_hash": "EXCLUDED.yml_file_hash",
+        "yml_file_etag": f"COALESCE(EXCLUDED.yml_file_etag, {table}.yml_file_etag)",
+        "yml_file_last_modified": (
+            f"COALESCE(EXCLUDED.yml_file_last_modified, {table}.yml_file_last_modified)"
+        ),
+    }
+    cursor.execute(
+        f"""
+        WITH source AS (
+            SELECT DISTINCT ON (yml_file_uri) *
+            FROM {staging_table}
+            ORDER BY yml_file_uri, seq DESC
+        ),
+        upserted AS (
+            INSERT INTO {table} (
+                member_name, yml_file_uri, yml_file_hash, yml_file_etag, yml_file_last_modified,
+                member_uuid, created_at, updated_at
+            )
+            SELECT
+                member_name, yml_file_uri, yml_file_hash, yml_file_etag, yml_file_last_modified,
+                gen_random_uuid(), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+            FROM source
+            ON CONFLICT (yml_file_uri)
+            DO UPDATE SET
+                {", ".join(f"{column} = {value}" for column, value in update_values.items())},
+                updated_at = CURRENT_TIMESTAMP
+            WHERE ({", ".join(f"{table}.{column}" for column in update_values)})
+                IS DISTINCT FROM ({", ".join(update_values.values())})
+            RETURNING xmax = 0 AS inserted
+        )
+        SELECT
+            (SELECT count(*) FROM source),
+            count(*) FILTER (WHERE inserted),
+            count(*) FILTER (WHERE NOT inserted)
+        FROM upserted
+        """
+    )
+    return _to_counts(*cursor.fetchone())
+
+
+def _merge_profiles(cursor, spec: dict, staging_table: str) -> UpsertCounts:
+    """ステージングテーブルとメンバーテーブルを結合し、プロフィールを1文でUPSERTする（内部関数）"""
+    table = spec["profiles_table"]
+    profile_columns = spec["profile_columns"]
+    update_columns = ("member_id",) + profile_columns
+    cursor.execute(
+        f"""
+        WITH source AS (
+            SELECT DISTINCT ON (yml_file_uri) *
+            FROM {staging_table}
+            ORDER BY yml_file_uri, seq DESC
+        ),
+        profile_source AS (
+            SELECT m.member_id, m.member_uuid, {", ".join(f"s.{column}" for column in profile_columns)}
+            FROM source s
+            JOIN {spec["members_table"]} m ON m.yml_file_uri = s.yml_file_uri
+            WHERE s.{spec["profile_required"]} IS NOT NULL
+        ),
+        upserted AS (
+            INSERT INTO {table} (
+                member_id, member_uuid, {", ".join(profile_columns)},
+                profile_uuid, created_at, updated_at
+            )
+            SELECT
+                member_id, member_uuid, {", ".join(profile_columns)},
+                gen_random_uuid(), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+            FROM profile_source
+            ON CONFLICT (member_uuid)
+            DO UPDATE SET
+                {", ".join(f"{column} = EXCLUDED.{column}" for column in update_columns)},
+                updated_at = CURRENT_TIMESTAMP
+            WHERE ({", ".join(f"{table}.{column}" for column in update_columns)})
+                IS DISTINCT FROM ({", ".join(f"EXCLUDED.{column}" for column in update_columns)})
+            RETURNING xmax = 0 AS inserted
+        )
+        SELECT
+            (SELECT count(*) FROM profile_source),
+            count(*) FILTER (WHERE inserted),
+            count(*) FILTER (WHERE NOT inserted)
+        FROM upserted
+        """
+    )
+    return _to_counts(*cursor.fetchone())
+
+
+def _to_counts(total: int, inserted: int, updated: int) -> UpsertCounts:
+    """対象行数と新規登録・更新の件数から UpsertCounts を作成する（内部関数）"""
+    counts = UpsertCounts()
+    counts.add("inserted", inserted)
+    counts.add("updated", updated)
+    counts.add("unchanged", total - inserted - updated)
+    return counts
+
+
+def bulk_import_members(member_type: str, records, chunk_size: int = None) -> dict:
+    """メンバーをCOPYでステージングテーブルに読み込み、集合演算で一括登録する
+
+    初期データの投入など大量のメンバーを登録する場合に、行ごとのUPSERTの代わりに使用します。
+    レコードを chunk_size 件ずつCSVとしてCOPYで一時テーブルに送り、全件の読み込み後に
+    メンバー・プロフィールをそれぞれ1文の INSERT ... SELECT ... ON CONFLICT で反映します。
+
+    処理フロー:
+    1. トランザクション内に一時テーブル（ON COMMIT DROP）を作成
+    2. レコードを順次読み込み、chunk_size 件ごとにCOPY
+    3. メンバーテーブルへ一括UPSERT（値が同じ行は更新しない）
+    4. メンバーテーブルと結合してプロフィールテーブルへ一括UPSERT
+    5. 全ての処理が成功した場合のみコミット
+
+    Args:
+        member_type (str): "human" または "virtual"
+        records: (yml_file_uri, yaml_data, metadata) のタプルのイテラブル
+            （iter_storage_records() / iter_local_records() の戻り値）
+        chunk_size (int, optional): 1回のCOPYで送る行数。Noneの場合は BULK_IMPORT_COPY_CHUNK_SIZE
+
+    Returns:
+        dict: staged（読み込んだレコード数）, members, profiles（それぞれ UpsertCounts）を含む辞書
+
+    Raises:
+        ValidationError: レコードの読み込み中にバリデーションに失敗した場合
+        DatabaseError: COPYまたは一括UPSERTに失敗した場合
+        Exception: ストレージからの取得に失敗した場合
+
+    Note:
+        - 同じYAMLファイルURIのレコードが複数ある場合は後勝ちです
+        - エラー時は全ての変更がロールバックされます（アトミック操作）
+        - YAML内容のハッシュを記録するため、以降のバッチ登録では変更のないファイルはスキップされます
+    """
+    spec = _IMPORT_SPECS[member_type]
+    chunk_size = chunk_size or BULK_IMPORT_COPY_CHUNK_SIZE
+    staging_table = f"{spec['members_table']}_staging"
+    columns = _STAGING_MEMBER_COLUMNS + spec["profile_columns"]
+    db = None
+
+    try:
+        db = SessionLocal()
+        cursor = db.connection().connection.cursor()
+        cursor.execute(
+            f"""
+            CREATE TEMP TABLE {staging_table} (
+                seq BIGINT NOT NULL,
+                member_name TEXT,
+                yml_file_uri TEXT NOT NULL,
+                yml_file_hash TEXT,
+                yml_file_etag TEXT,
+                yml_file_last_modified TIMESTAMP WITH TIME ZONE,
+                {", ".join(f"{column} TEXT" for column in spec["profile_columns"])}
+            ) ON COMMIT DROP
+            """
+        )
+
+        staged = 0
+        for chunk in iter_chunks(records, chunk_size):
+            rows = [
+                (
+                    staged + i,
+                    yaml_data.get("name"),
+                    yml_file_uri,
+                    compute_yaml_hash(yaml_data),
+                    metadata.get("etag"),
+                    metadata.get("last_modified"),
+                    *(yaml_data.get(column) for column in spec["profile_columns"]),
+                )
+                for i, (yml_file_uri, yaml_data, metadata) in enumerate(chunk)
+            ]
+            _copy_rows(cursor, staging_table, columns, rows)
+            staged += len(rows)
+            logger.info(f"Copied {staged} {member_type} member records into {staging_table}")
+
+        members = _merge_members(cursor, spec, staging_table)
+        profiles = _merge_profiles(cursor, spec, staging_table)
+        db.commit()
+        logger.info(
+            f"Bulk imported {staged} {member_type} member records "
+            f"(members: {members}, profiles: {profiles})"
+        )
+        return {"staged": staged, "members": members, "profiles": profiles}
+
+    except psycopg2.Error as e:
+        if db:
+            db.rollback()
+        error_msg = f"Failed to bulk import {member_type} members: {str(e)}"
+        logger.error(error_msg)
+        print(f"❌ {error_msg}")
+        raise DatabaseError(error_msg, e)
+    except Exception as e:
+        if db:
+            db.rollback()
+        error_msg = f"Bulk import failed: {str(e)}"
+        logger.error(error_msg)
+        print(f"❌ {error_msg}")
+        raise
+    finally:
+        if db:
+            db.close()
+
+
+def main():
+    """メンバーの一括インポートスクリプトのメイン関数
+
+    空のデータベースへの初期投入など、大量のメンバーを登録する場合に使用します。
+    ストレージ（またはローカルディレクトリ）のYAMLをCOPYでステージングテーブルに読み込み、
+    集合演算で一括登録します。
+
+    Usage:
+        python -m src.initialize.bulk_import                         # 全メンバーをストレージから
+        python -m src.initialize.bulk_import --human                 # 人間メンバーのみ
+        python -m src.initialize.bulk_import --local-dir ./bucket    # バケットと同じ構成のディレクトリから
+    """
+    parser = argparse.ArgumentParser(description="Bulk import members with PostgreSQL COPY")
+    parser.add_argument("--human", action="store_true", help="Import human members only")
+    parser.add_argument("--virtual", action="store_true", help="Import virtual members only")
+    parser.add_argument(
+        "--local-dir",
+        default=None,
+        help="Read YAML files from a local directory laid out like the bucket",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        help="Rows per COPY (default: BULK_IMPORT_COPY_CHUNK_SIZE)",
+    )
+    args = parser.parse_args()
+
+    if args.human:
+        member_types = ["human"]
+    elif args.virtual:
+        member_types = ["virtual"]
+    else:
+        member_types = ["human", "virtual"]
+
+    for member_type in member_types:
+        print(f"\n=== Bulk Import: {member_type} members ===")
+        if args.local_dir:
+            records = iter_local_records(member_type, args.local_dir)
+        else:
+            records = iter_storage_records(member_type, chunk_size=args.chunk_size)
+        try:
+            result = bulk_import_members(member_type, records, chunk_size=args.chunk_size)
+        except Exception as e:
+            print(f"❌ {member_type.capitalize()} member bulk import failed: {e}")
+            print("All changes have been rolled back.")
+            continue
+
+        print(f"✅ Imported {result['staged']} {member_type} member records.")
+        print(f"   Members: {result['members']}")
+        print(f"   Profiles: {result['profiles']}")
+
+
+if __name__ == "__main__":
+    main()
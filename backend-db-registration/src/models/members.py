@@ -15,6 +15,9 @@ class HumanMember(Base):
     member_uuid = Column(UUID(as_uuid=True), unique=True, nullable=False, default=uuid.uuid4)
     member_name = Column(String(50), unique=True, nullable=False)
     yml_file_uri = Column(String(500), unique=True, nullable=False)
+    yml_file_hash = Column(String(64))  # YAML内容のSHA-256（変更がなければ再登録をスキップ）
+    yml_file_etag = Column(String(100))  # 登録時のオブジェクトETag（差分同期で使用）
+    yml_file_last_modified = Column(DateTime(timezone=True))  # 登録時のオブジェクト更新日時
     created_at = Column(DateTime, default=lambda: datetime.datetime.now(datetime.UTC))
     updated_at = Column(
         DateTime,
@@ -33,6 +36,9 @@ class VirtualMember(Base):
     member_uuid = Column(UUID(as_uuid=True), unique=True, nullable=False, default=uuid.uuid4)
     member_name = Column(String(50), unique=True, nullable=False)
     yml_file_uri = Column(String(500), unique=True, nullable=False)
+    yml_file_hash = Column(String(64))  # YAML内容のSHA-256（変更がなければ再登録をスキップ）
+    yml_file_etag = Column(String(100))  # 登録時のオブジェクトETag（差分同期で使用）
+    yml_file_last_modified = Column(DateTime(timezone=True))  # 登録時のオブジェクト更新日時
     created_at = Column(DateTime, default=lambda: datetime.datetime.now(datetime.UTC))
     updated_at = Column(
         DateTime,
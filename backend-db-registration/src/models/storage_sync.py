@@ -0,0 +1,42 @@
+import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from .base import Base
+
+
+class StorageSyncCheckpoint(Base):
+    __tablename__ = "storage_sync_checkpoints"
+
+    prefix = Column(String(500), primary_key=True)
+    listing_digest = Column(String(64), nullable=False)  # (key, ETag) 一覧のSHA-256
+    object_count = Column(Integer, nullable=False)
+    max_last_modified = Column(DateTime(timezone=True))
+    added_count = Column(Integer, nullable=False, default=0)
+    changed_count = Column(Integer, nullable=False, default=0)
+    deleted_count = Column(Integer, nullable=False, default=0)
+    synced_at = Column(DateTime(timezone=True), default=lambda: datetime.datetime.now(datetime.UTC))
+
+    def __repr__(self):
+        return f"<StorageSyncCheckpoint(prefix={self.prefix}, objects={self.object_count})>"
+
+
+class RegistrationCheckpoint(Base):
+    __tablename__ = "registration_checkpoints"
+
+    prefix = Column(String(500), primary_key=True)
+    last_object_name = Column(String(500))  # キー順で最後にコミットしたオブジェクト
+    processed_count = Column(Integer, nullable=False, default=0)
+    started_at = Column(
+        DateTime(timezone=True), default=lambda: datetime.datetime.now(datetime.UTC)
+    )
+    updated_at = Column(
+        DateTime(timezone=True), default=lambda: datetime.datetime.now(datetime.UTC)
+    )
+    completed_at = Column(DateTime(timezone=True))
+
+    def __repr__(self):
+        return (
+            f"<RegistrationCheckpoint(prefix={self.prefix}, "
+            f"processed={self.processed_count}, last={self.last_object_name})>"
+        )
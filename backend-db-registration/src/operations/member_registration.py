@@ -1,8 +1,18 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 from db.database import (
     DatabaseError,
     SessionLocal,
-    upsert_human_member,
-    upsert_virtual_member,
+    UpsertCounts,
+    bulk_upsert_human_member_profiles,
+    bulk_upsert_human_members,
+    bulk_upsert_virtual_member_profiles,
+    bulk_upsert_virtual_members,
+    get_human_members_by_uris,
+    get_virtual_members_by_uris,
 )
 from storage.storage_client import StorageClient
 from utils.logging_config import setup_logging
@@ -10,6 +20,118 @@ from validation.yaml_validator import ValidationError, YAMLValidator
 
 logger = setup_logging(__name__)
 
+# バッチ登録時にYAMLを並列取得するスレッド数
+YAML_FETCH_MAX_WORKERS = int(os.getenv("YAML_FETCH_MAX_WORKERS", "8"))
+
+# YAML内容が前回登録時から変わっていない場合にDB書き込みをスキップするか
+YAML_HASH_SKIP_ENABLED = os.getenv("YAML_HASH_SKIP_ENABLED", "true").lower() == "true"
+
+
+def compute_yaml_hash(yaml_data: dict) -> str:
+    """YAMLデータの内容ハッシュ（SHA-256）を計算する
+
+    パース済みのデータをキー順にJSON化してハッシュを取るため、
+    コメントや空白・キー順序のみの変更ではハッシュは変わりません。
+
+    Args:
+        yaml_data (dict): パース済みのYAMLデータ
+
+    Returns:
+        str: 16進数表記のSHA-256ハッシュ（64文字）
+    """
+    canonical = json.dumps(yaml_data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def fetch_and_validate_yamls(
+    storage_client, yaml_paths: list, validate, max_workers: int = None, errors: dict = None
+):
+    """複数のYAMLファイルをスレッドプールで並列に取得・バリデーションする
+
+    ストレージへのGETとパース・バリデーションを最大 max_workers 件同時に実行し、
+    結果を yaml_paths と同じ順序で返します。いずれかのファイルで失敗した場合は
+    未着手の取得をキャンセルし、パス順で最初に失敗したファイルの例外を送出します。
+    errors を指定した場合は例外を送出せず、失敗したファイルを errors に記録して結果から除外します。
+
+    Args:
+        storage_client (StorageClient): ストレージクライアント
+        yaml_paths (list): ストレージ内のYAMLファイルパスのリスト
+        validate (callable): YAMLデータを受け取るバリデーション関数
+        max_workers (int, optional): 同時取得数。Noneの場合は YAML_FETCH_MAX_WORKERS
+        errors (dict, optional): 失敗したファイルのパスをキーにエラーメッセージを記録する辞書
+
+    Returns:
+        list: (yaml_path, yaml_data) のタプルのリスト（入力順、errors 指定時は成功分のみ）
+
+    Raises:
+        ValidationError: いずれかのYAMLデータのバリデーションに失敗した場合（errors 未指定時）
+        Exception: いずれかのYAMLファイルの取得に失敗した場合（errors 未指定時）
+    """
+
+    def fetch(yaml_path):
+        yaml_data = storage_client.read_yaml_from_minio(yaml_path)
+        validate(yaml_data)
+        return yaml_path, yaml_data
+
+    if not yaml_paths:
+        return []
+
+    max_workers = max(1, min(max_workers or YAML_FETCH_MAX_WORKERS, len(yaml_paths)))
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="yaml-fetch")
+    futures = [executor.submit(fetch, yaml_path) for yaml_path in yaml_paths]
+
+    yaml_data_list = []
+    try:
+        for yaml_path, future in zip(yaml_paths, futures, strict=True):
+            try:
+                yaml_data_list.append(future.result())
+            except Exception as e:
+                error_msg = f"Validation error for {yaml_path}: {str(e)}"
+                logger.error(error_msg)
+                print(f"❌ {error_msg}")
+                if errors is None:
+                    raise
+                errors[yaml_path] = str(e)
+    finally:
+        # 失敗時は未着手の取得をキャンセル（実行中の取得は完了を待つ）
+        # （errors 指定時は全て完了しているため影響しない）
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    return yaml_data_list
+
+
+def _select_changed_yamls(
+    yaml_data_list: list, existing_members: dict, object_metadata: dict = None
+) -> list:
+    """前回登録時から内容が変わったYAMLのみを抽出する（内部関数）
+
+    object_metadata が指定された場合は、内容が同じでもETagが変わったファイルを含めます
+    （差分同期で、記録済みのETagを最新に保つため）。
+
+    Args:
+        yaml_data_list (list): (yaml_path, yaml_data) のタプルのリスト
+        existing_members (dict): YAMLファイルURIをキーとする登録済みメンバーの辞書
+        object_metadata (dict): YAMLファイルURIをキーとする etag, last_modified の辞書
+
+    Returns:
+        list: (yaml_path, yaml_data, yml_file_hash, metadata) のタプルのリスト（入力順、
+            YAML_HASH_SKIP_ENABLED が無効な場合は全件）
+    """
+    changed = []
+    for yaml_path, yaml_data in yaml_data_list:
+        yml_file_hash = compute_yaml_hash(yaml_data)
+        existing = existing_members.get(yaml_path)
+        metadata = (object_metadata or {}).get(yaml_path, {})
+        if (
+            YAML_HASH_SKIP_ENABLED
+            and existing
+            and existing.yml_file_hash == yml_file_hash
+            and (not metadata or existing.yml_file_etag == metadata.get("etag"))
+        ):
+            continue
+        changed.append((yaml_path, yaml_data, yml_file_hash, metadata))
+    return changed
+
 
 def register_human_member_from_yaml(yaml_path: str):
     """YAMLファイルから人間メンバーを登録する（バリデーション・ロールバック機能付き）
@@ -22,7 +144,7 @@ def register_human_member_from_yaml(yaml_path: str):
     1. ストレージからYAMLファイルを読み込み
     2. YAMLデータのバリデーション実行
     3. 既存メンバーの重複チェック
-    4. 新規メンバーの作成とデータベース保存
+    4. メンバーとプロフィールを1文でUPSERTし、コミット
 
     Args:
         yaml_path (str): ストレージ内のYAMLファイルパス（例: "data/human_members/田中太郎.yml"）
@@ -37,14 +159,15 @@ def register_human_member_from_yaml(yaml_path: str):
 
     Note:
         - 既存のメンバーが存在する場合は、新規作成せずに既存オブジェクトを返します
+        - YAML内容とETagが前回登録時と同じ場合はDBに書き込まず既存オブジェクトを返します
         - エラー時は自動的にデータベーストランザクションがロールバックされます
         - ストレージファイルが見つからない場合は専用のエラーメッセージが表示されます
     """
     db = None
     try:
-        # ストレージからYAMLを読み込む（既にパース済みの辞書オブジェクト）
+        # ストレージからYAMLを読み込む（既にパース済みの辞書オブジェクトと、同じレスポンスのETag・更新日時）
         storage_client = StorageClient()
-        yaml_data = storage_client.read_yaml_from_minio(yaml_path)
+        yaml_data, metadata = storage_client.read_yaml_object(yaml_path)
 
         # YAMLからデータを取得
         name = yaml_data.get("name")
@@ -55,31 +178,43 @@ def register_human_member_from_yaml(yaml_path: str):
         # 人間メンバーの必須フィールドを検証
         YAMLValidator.validate_human_member_yaml(yaml_data)
 
-        # UPSERT操作でメンバーを登録または更新
-        member = upsert_human_member(db, name, yaml_path)
-
-        # プロフィール情報を登録または更新
+        # プロフィール情報の必須フィールドをDB書き込み前に検証
         bio = yaml_data.get("bio", "")
-        if not bio:  # bioが存在しない場合はロールバック
-            db.rollback()
+        if not bio:
             error_msg = f"Bio field is required for human member registration from {yaml_path}"
             logger.error(error_msg)
             print(f"❌ {error_msg}")
             raise ValidationError(error_msg, ["bio"])
 
-        from db.database import upsert_human_member_profile
-
-        profile = upsert_human_member_profile(db, member.member_id, member.member_uuid, bio)
+        # 前回登録時から内容もETagも変わっていなければDBに書き込まない
+        # （内容が同じでもETagが変わった場合は、記録済みのETag・更新日時のみ更新される）
+        yml_file_hash = compute_yaml_hash(yaml_data)
+        existing = get_human_members_by_uris(db, [yaml_path]).get(yaml_path)
+        if (
+            YAML_HASH_SKIP_ENABLED
+            and existing
+            and existing.yml_file_hash == yml_file_hash
+            and existing.yml_file_etag == metadata["etag"]
+        ):
+            logger.info(f"Human member {name} is unchanged, skipped registration from {yaml_path}")
+            return existing
+
+        from db.database import upsert_human_member_with_profile
+
+        # メンバーとプロフィールを1文でUPSERT（データ変更CTE）
+        member, profile = upsert_human_member_with_profile(
+            db,
+            name,
+            yaml_path,
+            bio,
+            yml_file_hash,
+            yml_file_etag=metadata["etag"],
+            yml_file_last_modified=metadata["last_modified"],
+        )
 
         # 全ての処理が成功した場合のみコミット
         db.commit()
 
-        # セッション閉じる前に必要な属性を読み込む（DetachedInstanceError対策）
-        member_name = member.member_name
-        member_uuid = member.member_uuid
-        yml_file_uri = member.yml_file_uri
-        member_id = member.member_id
-
         logger.info(f"Human member {name} upserted successfully from {yaml_path}")
         return member
 
@@ -132,7 +267,7 @@ def register_virtual_member_from_yaml(yaml_path: str):
     1. ストレージからYAMLファイルを読み込み
     2. YAMLデータのバリデーション実行（name, llm_model必須）
     3. 既存メンバーの重複チェック
-    4. 新規メンバーの作成とデータベース保存
+    4. メンバーとプロフィールを1文でUPSERTし、コミット
 
     Args:
         yaml_path (str): ストレージ内のYAMLファイルパス（例: "data/virtual_members/AI助手.yml"）
@@ -147,15 +282,16 @@ def register_virtual_member_from_yaml(yaml_path: str):
 
     Note:
         - 既存のメンバーが存在する場合は、新規作成せずに既存オブジェクトを返します
+        - YAML内容とETagが前回登録時と同じ場合はDBに書き込まず既存オブジェクトを返します
         - エラー時は自動的にデータベーストランザクションがロールバックされます
         - ストレージファイルが見つからない場合は専用のエラーメッセージが表示されます
         - 仮想メンバーは人間メンバーより多くの必須フィールド（llm_model）が必要です
     """
     db = None
     try:
-        # ストレージからYAMLを読み込む（既にパース済みの辞書オブジェクト）
+        # ストレージからYAMLを読み込む（既にパース済みの辞書オブジェクトと、同じレスポンスのETag・更新日時）
         storage_client = StorageClient()
-        yaml_data = storage_client.read_yaml_from_minio(yaml_path)
+        yaml_data, metadata = storage_client.read_yaml_object(yaml_path)
 
         # YAMLからデータを取得
         name = yaml_data.get("name")
@@ -166,16 +302,12 @@ def register_virtual_member_from_yaml(yaml_path: str):
         # 仮想メンバーの必須フィールドを検証
         YAMLValidator.validate_virtual_member_yaml(yaml_data)
 
-        # UPSERT操作でメンバーを登録または更新
-        member = upsert_virtual_member(db, name, yaml_path)
-
-        # プロフィール情報を登録または更新
+        # プロフィール情報の必須フィールドをDB書き込み前に検証
         llm_model = yaml_data.get("llm_model", "")
         custom_prompt = yaml_data.get("custom_prompt", "")
 
         # llm_modelは必須、custom_promptも必須
         if not llm_model:
-            db.rollback()
             error_msg = (
                 f"LLM model field is required for virtual member registration from {yaml_path}"
             )
@@ -184,7 +316,6 @@ def register_virtual_member_from_yaml(yaml_path: str):
             raise ValidationError(error_msg, ["llm_model"])
 
         if not custom_prompt:
-            db.rollback()
             error_msg = (
                 f"Custom prompt field is required for virtual member registration from {yaml_path}"
             )
@@ -192,21 +323,38 @@ def register_virtual_member_from_yaml(yaml_path: str):
             print(f"❌ {error_msg}")
             raise ValidationError(error_msg, ["custom_prompt"])
 
-        from db.database import upsert_virtual_member_profile
-
-        profile = upsert_virtual_member_profile(
-            db, member.member_id, member.member_uuid, llm_model, custom_prompt
+        # 前回登録時から内容もETagも変わっていなければDBに書き込まない
+        # （内容が同じでもETagが変わった場合は、記録済みのETag・更新日時のみ更新される）
+        yml_file_hash = compute_yaml_hash(yaml_data)
+        existing = get_virtual_members_by_uris(db, [yaml_path]).get(yaml_path)
+        if (
+            YAML_HASH_SKIP_ENABLED
+            and existing
+            and existing.yml_file_hash == yml_file_hash
+            and existing.yml_file_etag == metadata["etag"]
+        ):
+            logger.info(
+                f"Virtual member {name} is unchanged, skipped registration from {yaml_path}"
+            )
+            return existing
+
+        from db.database import upsert_virtual_member_with_profile
+
+        # メンバーとプロフィールを1文でUPSERT（データ変更CTE）
+        member, profile = upsert_virtual_member_with_profile(
+            db,
+            name,
+            yaml_path,
+            llm_model,
+            custom_prompt,
+            yml_file_hash,
+            yml_file_etag=metadata["etag"],
+            yml_file_last_modified=metadata["last_modified"],
         )
 
         # 全ての処理が成功した場合のみコミット
         db.commit()
 
-        # セッション閉じる前に必要な属性を読み込む（DetachedInstanceError対策）
-        member_name = member.member_name
-        member_uuid = member.member_uuid
-        yml_file_uri = member.yml_file_uri
-        member_id = member.member_id
-
         logger.info(f"Virtual member {name} upserted successfully from {yaml_path}")
         return member
 
@@ -252,7 +400,7 @@ def register_virtual_member_from_yaml(yaml_path: str):
             db.close()
 
 
-def register_human_members_batch(yaml_paths: list):
+def register_human_members_batch(yaml_paths: list, object_metadata: dict = None):
     """複数のYAMLファイルから人間メンバーをバッチ登録する（全成功または全ロールバック）
 
     指定された複数のYAMLファイルから人間メンバーを一括登録します。
@@ -260,13 +408,15 @@ def register_human_members_batch(yaml_paths: list):
     一つでもエラーが発生した場合は全ての変更をロールバックします。
 
     処理フロー:
-    1. 全てのYAMLファイルを事前にバリデーション
+    1. 全てのYAMLファイルを並列に取得し、事前にバリデーション（YAML_FETCH_MAX_WORKERS 件同時）
     2. バリデーション成功後、全てのメンバーを準備（まだコミットしない）
     3. 全ての処理が成功した場合のみ一括コミット
     4. エラー時は全変更をロールバック
 
     Args:
         yaml_paths (list): ストレージ内のYAMLファイルパスのリスト
+        object_metadata (dict, optional): YAMLファイルパスをキーとする etag, last_modified の辞書
+            （差分同期で指定し、メンバーに記録する）
 
     Returns:
         list: 登録された人間メンバーオブジェクトのリスト（既存メンバーも含む）
@@ -278,44 +428,80 @@ def register_human_members_batch(yaml_paths: list):
 
     Note:
         - 既存のメンバーが存在する場合は、新規作成せずに既存オブジェクトをリストに含めます
+        - YAML内容が前回登録時と同じファイルは書き込みをスキップします（YAML_HASH_SKIP_ENABLED）
         - エラー時は全ての変更がロールバックされます（アトミック操作）
         - バッチ処理のため、個別のファイル処理よりも効率的です
+          （メンバー・プロフィールそれぞれ BULK_UPSERT_CHUNK_SIZE 件ごとに1文で登録）
     """
     db = None
-    created_members = []
 
     try:
         # DBセッションを開始
         db = SessionLocal()
         storage_client = StorageClient()
 
-        # 全てのファイルを事前にバリデーション
-        yaml_data_list = []
-        for yaml_path in yaml_paths:
-            try:
-                yaml_data = storage_client.read_yaml_from_minio(yaml_path)
-                # バリデーション
-                YAMLValidator.validate_human_member_yaml(yaml_data)
-                yaml_data_list.append((yaml_path, yaml_data))
-            except Exception as e:
-                error_msg = f"Validation error for {yaml_path}: {str(e)}"
-                logger.error(error_msg)
-                print(f"❌ {error_msg}")
-                raise
+        # 全てのファイルを並列に取得し、事前にバリデーション
+        yaml_data_list = fetch_and_validate_yamls(
+            storage_client, yaml_paths, YAMLValidator.validate_human_member_yaml
+        )
+
+        # 前回登録時から内容が変わっていないファイルは書き込み対象から除外
+        existing_members = get_human_members_by_uris(db, yaml_paths)
+        changed_yamls = _select_changed_yamls(yaml_data_list, existing_members, object_metadata)
+        skipped_count = len(yaml_data_list) - len(changed_yamls)
+        if not changed_yamls:
+            logger.info(f"All {skipped_count} human members are unchanged, nothing to upsert.")
+            return [existing_members[yaml_path] for yaml_path, _ in yaml_data_list]
 
         # 全てのバリデーションが成功した場合のみ、データベース操作を実行
-        for yaml_path, yaml_data in yaml_data_list:
-            name = yaml_data.get("name")
+        # 複数行のUPSERT文でまとめて登録または更新（まだコミットしない、値が同じ行は更新しない）
+        counts = UpsertCounts()
+        upserted_members = bulk_upsert_human_members(
+            db,
+            [
+                {
+                    "name": yaml_data.get("name"),
+                    "yml_file_uri": yaml_path,
+                    "yml_file_hash": yml_file_hash,
+                    "yml_file_etag": metadata.get("etag"),
+                    "yml_file_last_modified": metadata.get("last_modified"),
+                }
+                for yaml_path, yaml_data, yml_file_hash, metadata in changed_yamls
+            ],
+            counts=counts,
+        )
 
-            # UPSERT操作でメンバーを登録または更新（まだコミットしない）
-            member = upsert_human_member(db, name, yaml_path)
-            created_members.append(member)
-            logger.info(f"Human member {name} prepared for upsert.")
+        # bioが存在するメンバーのプロフィールをまとめて登録または更新
+        bulk_upsert_human_member_profiles(
+            db,
+            [
+                {
+                    "member_id": member.member_id,
+                    "member_uuid": member.member_uuid,
+                    "bio": yaml_data.get("bio"),
+                }
+                for member, (_, yaml_data, _, _) in zip(
+                    upserted_members, changed_yamls, strict=True
+                )
+                if yaml_data.get("bio")
+            ],
+            counts=counts,
+        )
+        logger.info(
+            f"{len(upserted_members)} human members prepared for upsert "
+            f"({skipped_count} unchanged skipped, rows: {counts})."
+        )
 
         # 全ての処理が成功した場合のみコミット
         db.commit()
-        logger.info(f"Successfully committed {len(created_members)} human members.")
-        return created_members
+        logger.info(f"Successfully committed {len(upserted_members)} human members.")
+
+        # 入力順に、更新したメンバーまたは変更のなかった既存メンバーを返す
+        upserted_by_uri = {member.yml_file_uri: member for member in upserted_members}
+        return [
+            upserted_by_uri.get(yaml_path) or existing_members[yaml_path]
+            for yaml_path, _ in yaml_data_list
+        ]
 
     except Exception as e:
         # エラーが発生した場合はロールバック
@@ -331,7 +517,7 @@ def register_human_members_batch(yaml_paths: list):
             db.close()
 
 
-def register_virtual_members_batch(yaml_paths: list):
+def register_virtual_members_batch(yaml_paths: list, object_metadata: dict = None):
     """複数のYAMLファイルから仮想メンバーをバッチ登録する（全成功または全ロールバック）
 
     指定された複数のYAMLファイルから仮想メンバーを一括登録します。
@@ -339,13 +525,15 @@ def register_virtual_members_batch(yaml_paths: list):
     一つでもエラーが発生した場合は全ての変更をロールバックします。
 
     処理フロー:
-    1. 全てのYAMLファイルを事前にバリデーション（name, llm_model必須）
+    1. 全てのYAMLファイルを並列に取得し、事前にバリデーション（name, llm_model必須）
     2. バリデーション成功後、全てのメンバーを準備（まだコミットしない）
     3. 全ての処理が成功した場合のみ一括コミット
     4. エラー時は全変更をロールバック
 
     Args:
         yaml_paths (list): ストレージ内のYAMLファイルパスのリスト
+        object_metadata (dict, optional): YAMLファイルパスをキーとする etag, last_modified の辞書
+            （差分同期で指定し、メンバーに記録する）
 
     Returns:
         list: 登録された仮想メンバーオブジェクトのリスト（既存メンバーも含む）
@@ -357,45 +545,80 @@ def register_virtual_members_batch(yaml_paths: list):
 
     Note:
         - 既存のメンバーが存在する場合は、新規作成せずに既存オブジェクトをリストに含めます
+        - YAML内容が前回登録時と同じファイルは書き込みをスキップします（YAML_HASH_SKIP_ENABLED）
         - エラー時は全ての変更がロールバックされます（アトミック操作）
         - バッチ処理のため、個別のファイル処理よりも効率的です
         - 仮想メンバーは人間メンバーより多くの必須フィールド（llm_model）が必要です
     """
     db = None
-    created_members = []
 
     try:
         # DBセッションを開始
         db = SessionLocal()
         storage_client = StorageClient()
 
-        # 全てのファイルを事前にバリデーション
-        yaml_data_list = []
-        for yaml_path in yaml_paths:
-            try:
-                yaml_data = storage_client.read_yaml_from_minio(yaml_path)
-                # バリデーション
-                YAMLValidator.validate_virtual_member_yaml(yaml_data)
-                yaml_data_list.append((yaml_path, yaml_data))
-            except Exception as e:
-                error_msg = f"Validation error for {yaml_path}: {str(e)}"
-                logger.error(error_msg)
-                print(f"❌ {error_msg}")
-                raise
+        # 全てのファイルを並列に取得し、事前にバリデーション
+        yaml_data_list = fetch_and_validate_yamls(
+            storage_client, yaml_paths, YAMLValidator.validate_virtual_member_yaml
+        )
+
+        # 前回登録時から内容が変わっていないファイルは書き込み対象から除外
+        existing_members = get_virtual_members_by_uris(db, yaml_paths)
+        changed_yamls = _select_changed_yamls(yaml_data_list, existing_members, object_metadata)
+        skipped_count = len(yaml_data_list) - len(changed_yamls)
+        if not changed_yamls:
+            logger.info(f"All {skipped_count} virtual members are unchanged, nothing to upsert.")
+            return [existing_members[yaml_path] for yaml_path, _ in yaml_data_list]
 
         # 全てのバリデーションが成功した場合のみ、データベース操作を実行
-        for yaml_path, yaml_data in yaml_data_list:
-            name = yaml_data.get("name")
+        # 複数行のUPSERT文でまとめて登録または更新（まだコミットしない、値が同じ行は更新しない）
+        counts = UpsertCounts()
+        upserted_members = bulk_upsert_virtual_members(
+            db,
+            [
+                {
+                    "name": yaml_data.get("name"),
+                    "yml_file_uri": yaml_path,
+                    "yml_file_hash": yml_file_hash,
+                    "yml_file_etag": metadata.get("etag"),
+                    "yml_file_last_modified": metadata.get("last_modified"),
+                }
+                for yaml_path, yaml_data, yml_file_hash, metadata in changed_yamls
+            ],
+            counts=counts,
+        )
 
-            # UPSERT操作でメンバーを登録または更新（まだコミットしない）
-            member = upsert_virtual_member(db, name, yaml_path)
-            created_members.append(member)
-            logger.info(f"Virtual member {name} prepared for upsert.")
+        # プロフィールをまとめて登録または更新（llm_modelはバリデーション済み）
+        bulk_upsert_virtual_member_profiles(
+            db,
+            [
+                {
+                    "member_id": member.member_id,
+                    "member_uuid": member.member_uuid,
+                    "llm_model": yaml_data.get("llm_model"),
+                    "custom_prompt": yaml_data.get("custom_prompt"),
+                }
+                for member, (_, yaml_data, _, _) in zip(
+                    upserted_members, changed_yamls, strict=True
+                )
+            ],
+            counts=counts,
+        )
+        logger.info(
+            f"{len(upserted_members)} virtual members prepared for upsert "
+            f"({skipped_count} unchanged skipped, rows: {counts})."
+        )
 
         # 全ての処理が成功した場合のみコミット
         db.commit()
-        logger.info(f"Successfully committed {len(created_members)} virtual members.")
-        return created_members
+        logger.info(f"Successfully committed {len(upserted_members)} virtual members.")
+
+        # 入力順に、更新したメンバーまたは変更のなかった既存メンバーを返す
+        upserted_by_uri = {member.yml_file_uri: member for member in upserted_members}
+        return [
+            upserted_by_uri.get(yaml_path) or existing_members[yaml_path]
+            for yaml_path, _ in yaml_data_list
+        ]
 
     except Exception as e:
         # エラーが発生した場合はロールバック
@@ -409,3 +632,193 @@ def register_virtual_members_batch(yaml_paths: list):
     finally:
         if db:
             db.close()
+
+
+def _human_profile_row(member, yaml_data: dict):
+    """人間メンバーのプロフィール行を作成する（bioがない場合はNone、内部関数）"""
+    if not yaml_data.get("bio"):
+        return None
+    return {
+        "member_id": member.member_id,
+        "member_uuid": member.member_uuid,
+        "bio": yaml_data.get("bio"),
+    }
+
+
+def _virtual_member_profile_row(member, yaml_data: dict):
+    """仮想メンバーのプロフィール行を作成する（内部関数）"""
+    return {
+        "member_id": member.member_id,
+        "member_uuid": member.member_uuid,
+        "llm_model": yaml_data.get("llm_model"),
+        "custom_prompt": yaml_data.get("custom_prompt"),
+    }
+
+
+# メンバー種別ごとの部分成功モードの登録処理
+_PARTIAL_REGISTRATION_SPECS = {
+    "human": {
+        "validate": YAMLValidator.validate_human_member_yaml,
+        "get_existing": get_human_members_by_uris,
+        "upsert_members": bulk_upsert_human_members,
+        "profile_row": _human_profile_row,
+        "upsert_profiles": bulk_upsert_human_member_profiles,
+    },
+    "virtual": {
+        "validate": YAMLValidator.validate_virtual_member_yaml,
+        "get_existing": get_virtual_members_by_uris,
+        "upsert_members": bulk_upsert_virtual_members,
+        "profile_row": _virtual_member_profile_row,
+        "upsert_profiles": bulk_upsert_virtual_member_profiles,
+    },
+}
+
+
+def _register_members_partial(member_type: str, yaml_paths: list, object_metadata: dict = None):
+    """YAMLファイルごとにSAVEPOINTを使い、成功したファイルのみを登録する（内部関数）
+
+    register_human_members_partial() / register_virtual_members_partial() の共通処理です。
+
+    Args:
+        member_type (str): "human" または "virtual"
+        yaml_paths (list): ストレージ内のYAMLファイルパスのリスト
+        object_metadata (dict, optional): YAMLファイルパスをキーとする etag, last_modified の辞書
+
+    Returns:
+        dict: succeeded（登録済みメンバーのリスト、入力順）と
+            failed（(yaml_path, エラーメッセージ) のタプルのリスト、入力順）を含む辞書
+
+    Raises:
+        DatabaseError: 既存メンバーの取得またはコミットに失敗した場合
+    """
+    spec = _PARTIAL_REGISTRATION_SPECS[member_type]
+    db = None
+
+    try:
+        db = SessionLocal()
+        storage_client = StorageClient()
+
+        # 全てのファイルを並列に取得・バリデーションし、失敗したファイルは記録して除外
+        errors = {}
+        yaml_data_list = fetch_and_validate_yamls(
+            storage_client, yaml_paths, spec["validate"], errors=errors
+        )
+
+        existing_members = spec["get_existing"](db, [yaml_path for yaml_path, _ in yaml_data_list])
+        changed_yamls = _select_changed_yamls(yaml_data_list, existing_members, object_metadata)
+
+        # ファイルごとにSAVEPOINTを作成し、失敗したファイルの変更のみを取り消す
+        counts = UpsertCounts()
+        upserted_by_uri = {}
+        for yaml_path, yaml_data, yml_file_hash, metadata in changed_yamls:
+            try:
+                with db.begin_nested():
+                    (member,) = spec["upsert_members"](
+                        db,
+                        [
+                            {
+                                "name": yaml_data.get("name"),
+                                "yml_file_uri": yaml_path,
+                                "yml_file_hash": yml_file_hash,
+                                "yml_file_etag": metadata.get("etag"),
+                                "yml_file_last_modified": metadata.get("last_modified"),
+                            }
+                        ],
+                        counts=counts,
+                    )
+                    profile_row = spec["profile_row"](member, yaml_data)
+                    if profile_row:
+                        spec["upsert_profiles"](db, [profile_row], counts=counts)
+                upserted_by_uri[yaml_path] = member
+            except Exception as e:
+                error_msg = (
+                    f"Registration failed for {yaml_path}, rolled back to savepoint: {str(e)}"
+                )
+                logger.error(error_msg)
+                print(f"❌ {error_msg}")
+                errors[yaml_path] = str(e)
+
+        # 成功したファイルのみをまとめてコミット
+        db.commit()
+        succeeded = [
+            upserted_by_uri.get(yaml_path) or existing_members[yaml_path]
+            for yaml_path, _ in yaml_data_list
+            if yaml_path not in errors
+        ]
+        logger.info(
+            f"Partial batch committed {len(succeeded)} {member_type} members "
+            f"({len(errors)} failed, rows: {counts})."
+        )
+        return {
+            "succeeded": succeeded,
+            "failed": [
+                (yaml_path, errors[yaml_path]) for yaml_path in yaml_paths if yaml_path in errors
+            ],
+        }
+
+    except Exception as e:
+        if db:
+            db.rollback()
+        error_msg = f"Partial batch registration failed: {str(e)}"
+        logger.error(error_msg)
+        print(f"❌ {error_msg}")
+        print("All changes have been rolled back.")
+        raise
+    finally:
+        if db:
+            db.close()
+
+
+def register_human_members_partial(yaml_paths: list, object_metadata: dict = None):
+    """複数のYAMLファイルから人間メンバーをバッチ登録する（部分成功モード）
+
+    register_human_members_batch() と同じく1トランザクションで登録しますが、
+    ファイルごとにSAVEPOINTを作成し、バリデーションや登録に失敗したファイルのみを
+    取り消して残りをコミットします。一つの不正なYAMLのためにバッチ全体を
+    再実行する必要がありません。
+
+    処理フロー:
+    1. 全てのYAMLファイルを並列に取得・バリデーションし、失敗したファイルを記録
+    2. 前回登録時から内容が変わったファイルのみ、ファイルごとにSAVEPOINT内でUPSERT
+    3. 失敗したファイルはSAVEPOINTまでロールバックして記録
+    4. 成功したファイルをまとめてコミット
+
+    Args:
+        yaml_paths (list): ストレージ内のYAMLファイルパスのリスト
+        object_metadata (dict, optional): YAMLファイルパスをキーとする etag, last_modified の辞書
+
+    Returns:
+        dict: 以下のキーを持つ辞書
+            - succeeded (list): 登録された人間メンバーオブジェクトのリスト（既存メンバーも含む）
+            - failed (list): 失敗したファイルの (yaml_path, エラーメッセージ) のタプルのリスト
+
+    Raises:
+        DatabaseError: 既存メンバーの取得またはコミットに失敗した場合
+
+    Note:
+        - ファイルごとに1〜2文を実行するため、全件成功が見込まれる場合は
+          register_human_members_batch() の方が高速です
+    """
+    return _register_members_partial("human", yaml_paths, object_metadata)
+
+
+def register_virtual_members_partial(yaml_paths: list, object_metadata: dict = None):
+    """複数のYAMLファイルから仮想メンバーをバッチ登録する（部分成功モード）
+
+    register_virtual_members_batch() と同じく1トランザクションで登録しますが、
+    ファイルごとにSAVEPOINTを作成し、バリデーションや登録に失敗したファイルのみを
+    取り消して残りをコミットします。
+
+    Args:
+        yaml_paths (list): ストレージ内のYAMLファイルパスのリスト
+        object_metadata (dict, optional): YAMLファイルパスをキーとする etag, last_modified の辞書
+
+    Returns:
+        dict: 以下のキーを持つ辞書
+            - succeeded (list): 登録された仮想メンバーオブジェクトのリスト（既存メンバーも含む）
+            - failed (list): 失敗したファイルの (yaml_path, エラーメッセージ) のタプルのリスト
+
+    Raises:
+        DatabaseError: 既存メンバーの取得またはコミットに失敗した場合
+    """
+    return _register_members_partial("virtual", yaml_paths, object_metadata)
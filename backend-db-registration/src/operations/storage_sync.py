@@ -0,0 +1,204 @@
+import hashlib
+
+from db.database import (
+    SessionLocal,
+    delete_members_by_uris,
+    get_members_by_prefix,
+    get_storage_sync_checkpoint,
+    save_storage_sync_checkpoint,
+)
+from operations.member_registration import (
+    register_human_members_batch,
+    register_virtual_members_batch,
+)
+from storage.storage_client import StorageClient
+from utils.logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+# メンバー種別ごとのバッチ登録関数
+_BATCH_REGISTRARS = {
+    "human": register_human_members_batch,
+    "virtual": register_virtual_members_batch,
+}
+
+
+def compute_listing_digest(objects: list) -> str:
+    """オブジェクト一覧（キー・ETag）のハッシュを計算する
+
+    キー順に並べた (object_name, etag) からハッシュを計算します。
+    前回同期時のハッシュと一致する場合、バケットに追加・変更・削除がないと判定できます。
+
+    Args:
+        objects (list): StorageClient.list_yaml_objects() の戻り値
+
+    Returns:
+        str: 16進数表記のSHA-256ハッシュ（64文字）
+    """
+    digest = hashlib.sha256()
+    for obj in sorted(objects, key=lambda o: o["object_name"]):
+        digest.update(f"{obj['object_name']}\0{obj['etag']}\n".encode())
+    return digest.hexdigest()
+
+
+def diff_storage_objects(objects: list, existing_members: dict) -> dict:
+    """バケットの一覧と登録済みメンバーを比較し、追加・変更・削除を抽出する
+
+    登録時に記録したETagと一覧のETagが異なる（または未記録の）オブジェクトを変更とみなします。
+
+    Args:
+        objects (list): StorageClient.list_yaml_objects() の戻り値
+        existing_members (dict): YAMLファイルURIをキーとする登録済みメンバーの辞書
+
+    Returns:
+        dict: 以下のキーを持つ辞書
+            - added (list): DB未登録のオブジェクト
+            - changed (list): ETagが変わったオブジェクト
+            - deleted (list): バケットに存在しない登録済みのYAMLファイルURI
+            - unchanged (int): 変更のないオブジェクト数
+    """
+    added, changed = [], []
+    unchanged = 0
+    for obj in objects:
+        member = existing_members.get(obj["object_name"])
+        if member is None:
+            added.append(obj)
+        elif member.yml_file_etag != obj["etag"]:
+            changed.append(obj)
+        else:
+            unchanged += 1
+
+    listed = {obj["object_name"] for obj in objects}
+    deleted = sorted(uri for uri in existing_members if uri not in listed)
+    return {"added": added, "changed": changed, "deleted": deleted, "unchanged": unchanged}
+
+
+def sync_members_incremental(
+    member_type: str,
+    prefix: str,
+    dry_run: bool = False,
+    delete_missing: bool = True,
+    use_checkpoint: bool = True,
+):
+    """バケットとDBの差分のみを同期する（差分同期）
+
+    バケットの一覧（キー・ETag・更新日時）を登録済みの値と比較し、追加・変更された
+    オブジェクトのみを取得して登録し、バケットから削除されたメンバーを削除します。
+    同期後はプレフィックスごとのチェックポイントを保存し、次回の一覧が前回と同じ場合は
+    DBとの比較も行わずに終了します。
+
+    処理フロー:
+    1. バケットの一覧をメタデータ付きで取得（オブジェクト本体は取得しない）
+    2. 一覧のハッシュがチェックポイントと一致すれば終了
+    3. 登録済みメンバーと比較し、追加・変更・削除を抽出
+    4. 追加・変更分のみバッチ登録（全成功または全ロールバック）
+    5. 削除分を削除し、チェックポイントを保存
+
+    Args:
+        member_type (str): "human" または "virtual"
+        prefix (str): 同期するストレージのプレフィックス（例: "data/human_members/"）
+        dry_run (bool): Trueの場合は差分の抽出のみ行い、DBに書き込まない
+        delete_missing (bool): バケットから削除されたメンバーを削除するか
+        use_checkpoint (bool): チェックポイントと一覧が一致する場合に比較を省略するか
+
+    Returns:
+        dict: prefix, objects, added, changed, deleted, unchanged, up_to_date, dry_run を含む
+            同期結果（added, changed, deleted はYAMLファイルURIのリスト）
+
+    Raises:
+        ValidationError: 追加・変更されたYAMLのバリデーションに失敗した場合
+        DatabaseError: データベース操作に失敗した場合
+        Exception: ストレージの一覧取得に失敗した場合
+
+    Note:
+        - 一覧が空の場合は、ストレージの設定ミスによる全削除を防ぐため削除を行いません
+        - 登録処理が失敗した場合はチェックポイントを更新しないため、次回に再試行されます
+        - 削除を行わなかった場合（delete_missing=False または一覧が空の場合）もチェックポイントを
+          更新しないため、次回の削除ありの同期で未反映の削除が比較・反映されます
+    """
+    storage_client = StorageClient()
+    objects = storage_client.list_yaml_objects(prefix)
+    listing_digest = compute_listing_digest(objects)
+
+    summary = {
+        "prefix": prefix,
+        "objects": len(objects),
+        "added": [],
+        "changed": [],
+        "deleted": [],
+        "unchanged": 0,
+        "up_to_date": False,
+        "dry_run": dry_run,
+    }
+
+    db = SessionLocal()
+    try:
+        # 前回同期時から一覧が変わっていなければ終了
+        checkpoint = get_storage_sync_checkpoint(db, prefix) if use_checkpoint else None
+        if checkpoint is not None and checkpoint.listing_digest == listing_digest:
+            logger.info(f"Storage prefix '{prefix}' is unchanged since {checkpoint.synced_at}")
+            summary["unchanged"] = len(objects)
+            summary["up_to_date"] = True
+            return summary
+
+        diff = diff_storage_objects(objects, get_members_by_prefix(db, member_type, prefix))
+        summary["added"] = [obj["object_name"] for obj in diff["added"]]
+        summary["changed"] = [obj["object_name"] for obj in diff["changed"]]
+        summary["unchanged"] = diff["unchanged"]
+        if delete_missing and not objects and diff["deleted"]:
+            logger.warning(
+                f"No objects listed under '{prefix}', skipped deleting {len(diff['deleted'])} members"
+            )
+        elif delete_missing:
+            summary["deleted"] = diff["deleted"]
+
+        logger.info(
+            f"Storage sync diff for '{prefix}': added {len(summary['added'])}, "
+            f"changed {len(summary['changed'])}, deleted {len(summary['deleted'])}, "
+            f"unchanged {summary['unchanged']}"
+        )
+        if dry_run:
+            return summary
+    finally:
+        db.close()
+
+    # 追加・変更されたオブジェクトのみ登録（ETag・更新日時を記録）
+    targets = diff["added"] + diff["changed"]
+    if targets:
+        _BATCH_REGISTRARS[member_type](
+            [obj["object_name"] for obj in targets],
+            object_metadata={
+                obj["object_name"]: {"etag": obj["etag"], "last_modified": obj["last_modified"]}
+                for obj in targets
+            },
+        )
+
+    # 削除の反映とチェックポイントの保存（見送った削除がある場合はチェックポイントを保存しない）
+    skipped_deletes = len(diff["deleted"]) - len(summary["deleted"])
+    db = SessionLocal()
+    try:
+        deleted_count = delete_members_by_uris(db, member_type, summary["deleted"])
+        if skipped_deletes:
+            logger.info(
+                f"Skipped saving the sync checkpoint for '{prefix}' "
+                f"({skipped_deletes} deletions not applied)"
+            )
+        else:
+            save_storage_sync_checkpoint(
+                db,
+                prefix,
+                listing_digest,
+                len(objects),
+                max((obj["last_modified"] for obj in objects), default=None),
+                added_count=len(summary["added"]),
+                changed_count=len(summary["changed"]),
+                deleted_count=deleted_count,
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    return summary
@@ -0,0 +1,153 @@
+import os
+import time
+from itertools import islice
+
+from db.database import SessionLocal, get_registration_checkpoint, save_registration_checkpoint
+from operations.member_registration import (
+    register_human_members_batch,
+    register_virtual_members_batch,
+)
+from storage.storage_client import StorageClient
+from utils.logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+# ストリーミング登録で1トランザクションにまとめるファイル数
+REGISTRATION_CHUNK_SIZE = int(os.getenv("REGISTRATION_CHUNK_SIZE", "500"))
+
+# メンバー種別ごとのバッチ登録関数
+_BATCH_REGISTRARS = {
+    "human": register_human_members_batch,
+    "virtual": register_virtual_members_batch,
+}
+
+
+def iter_chunks(iterable, chunk_size: int):
+    """イテラブルを chunk_size 件ずつのリストに分けて順次返す
+
+    Args:
+        iterable: 分割する要素のイテラブル（ジェネレータ可）
+        chunk_size (int): 1チャンクあたりの要素数
+
+    Yields:
+        list: 最大 chunk_size 件の要素のリスト
+    """
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def _save_checkpoint(prefix: str, **kwargs):
+    """登録の進捗を独立したトランザクションで保存する（内部関数）
+
+    Args:
+        prefix (str): ストレージのプレフィックス
+        **kwargs: save_registration_checkpoint() に渡す引数
+
+    Raises:
+        DatabaseError: 保存処理時にエラーが発生した場合
+    """
+    db = SessionLocal()
+    try:
+        save_registration_checkpoint(db, prefix, **kwargs)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def iter_register_members(
+    member_type: str, prefix: str, chunk_size: int = None, resume: bool = False
+):
+    """ストレージのYAMLをチャンク単位で取得・登録し、進捗を順次返す（ストリーミング登録）
+
+    一覧取得 → 取得・バリデーション → UPSERT をジェネレータでつなぎ、chunk_size 件ごとに
+    バッチ登録（全成功または全ロールバック）してコミットします。一覧も登録結果も
+    チャンク単位でのみ保持するため、メンバー数が多い場合でもメモリ使用量は一定です。
+
+    処理フロー:
+    1. 進捗チェックポイントを取得（resume時）または初期化
+    2. ストレージの一覧をキー順に順次取得し、chunk_size 件ずつに分割
+    3. チャンクごとにバッチ登録してコミットし、最後のキーをチェックポイントに保存
+    4. 全チャンクの完了後、チェックポイントに完了日時を記録
+
+    Args:
+        member_type (str): "human" または "virtual"
+        prefix (str): 登録するストレージのプレフィックス（例: "data/human_members/"）
+        chunk_size (int, optional): 1トランザクションあたりのファイル数。
+            Noneの場合は REGISTRATION_CHUNK_SIZE
+        resume (bool): Trueの場合は前回中断した実行の続き（最後にコミットしたキーの次）から再開する
+
+    Yields:
+        dict: チャンクのコミットごとの進捗（chunk, chunk_files, processed, last_object_name,
+            elapsed_seconds, files_per_second）。processed は再開前の処理数を含み、
+            files_per_second は今回の実行分から計算する
+
+    Raises:
+        ValidationError: チャンク内のYAMLのバリデーションに失敗した場合
+        DatabaseError: データベース操作に失敗した場合
+        Exception: ストレージの一覧取得に失敗した場合
+
+    Note:
+        - 失敗したチャンクのみロールバックされ、それ以前のチャンクはコミット済みです
+        - チャンクのコミット後にチェックポイントを保存するため、その間で中断した場合は
+          再開時に同じチャンクを再処理します（UPSERTのため結果は変わりません）
+        - 前回の実行が完了している場合、resume を指定しても最初から処理します
+    """
+    chunk_size = max(1, chunk_size or REGISTRATION_CHUNK_SIZE)
+    register_batch = _BATCH_REGISTRARS[member_type]
+
+    start_after = None
+    processed = 0
+    if resume:
+        db = SessionLocal()
+        try:
+            checkpoint = get_registration_checkpoint(db, prefix)
+        finally:
+            db.close()
+        if checkpoint is not None and checkpoint.completed_at is None:
+            start_after = checkpoint.last_object_name
+            processed = checkpoint.processed_count
+            logger.info(
+                f"Resuming registration of '{prefix}' after '{start_after}' "
+                f"({processed} files already processed)"
+            )
+    if start_after is None:
+        processed = 0
+        _save_checkpoint(prefix, started=True)
+
+    storage_client = StorageClient()
+    objects = storage_client.iter_yaml_objects(prefix, start_after=start_after)
+    started_at = time.monotonic()
+    resumed_count = processed
+    last_object_name = start_after
+
+    for index, chunk in enumerate(iter_chunks(objects, chunk_size), start=1):
+        register_batch(
+            [obj["object_name"] for obj in chunk],
+            object_metadata={
+                obj["object_name"]: {"etag": obj["etag"], "last_modified": obj["last_modified"]}
+                for obj in chunk
+            },
+        )
+        processed += len(chunk)
+        last_object_name = chunk[-1]["object_name"]
+        _save_checkpoint(prefix, last_object_name=last_object_name, processed_count=processed)
+
+        elapsed = time.monotonic() - started_at
+        logger.info(f"Committed chunk {index} of '{prefix}' ({processed} files processed)")
+        yield {
+            "chunk": index,
+            "chunk_files": len(chunk),
+            "processed": processed,
+            "last_object_name": last_object_name,
+            "elapsed_seconds": elapsed,
+            "files_per_second": (processed - resumed_count) / elapsed if elapsed > 0 else 0.0,
+        }
+
+    _save_checkpoint(
+        prefix, last_object_name=last_object_name, processed_count=processed, completed=True
+    )
+    logger.info(f"Streaming registration of '{prefix}' completed ({processed} files)")
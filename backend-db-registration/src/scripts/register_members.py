@@ -3,9 +3,13 @@ import argparse
 
 from operations.member_registration import (
     register_human_members_batch,
+    register_human_members_partial,
     register_virtual_members_batch,
+    register_virtual_members_partial,
 )
-from storage.storage_client import StorageClient
+from operations.storage_sync import sync_members_incremental
+from operations.streaming_registration import iter_register_members
+from storage.storage_client import HUMAN_MEMBERS_PREFIX, VIRTUAL_MEMBERS_PREFIX, StorageClient
 
 from src.utils.logging_config import setup_logging
 
@@ -35,14 +39,129 @@ def get_all_yaml_files_from_storage():
     storage_client = StorageClient()
 
     # 人間メンバーのYAMLファイルを動的に取得
-    human_files = storage_client.list_yaml_files("data/samples/human_members/")
+    human_files = storage_client.list_yaml_files(HUMAN_MEMBERS_PREFIX)
 
     # 仮想メンバーのYAMLファイルを動的に取得
-    virtual_files = storage_client.list_yaml_files("data/samples/virtual_members/")
+    virtual_files = storage_client.list_yaml_files(VIRTUAL_MEMBERS_PREFIX)
 
     return human_files, virtual_files
 
 
+def register_members_batch(member_type: str, yaml_files: list, partial: bool = False):
+    """指定された種別のメンバーをバッチ登録する
+
+    Args:
+        member_type (str): "human" または "virtual"
+        yaml_files (list): ストレージ内のYAMLファイルパスのリスト
+        partial (bool): Trueの場合は部分成功モード（失敗したファイルのみ取り消し、残りをコミット）
+
+    Returns:
+        list: 登録されたメンバーオブジェクトのリスト
+
+    Raises:
+        Exception: バッチ登録に失敗した場合（部分成功モードではコミットに失敗した場合のみ）
+    """
+    if not partial:
+        if member_type == "human":
+            return register_human_members_batch(yaml_files)
+        return register_virtual_members_batch(yaml_files)
+
+    if member_type == "human":
+        result = register_human_members_partial(yaml_files)
+    else:
+        result = register_virtual_members_partial(yaml_files)
+    if result["failed"]:
+        print(f"⚠️  {len(result['failed'])} files failed and were skipped:")
+        for yaml_path, error in result["failed"]:
+            print(f"  - {yaml_path}: {error}")
+    return result["succeeded"]
+
+
+def run_incremental_sync(member_types: list, dry_run: bool = False, delete_missing: bool = True):
+    """差分同期モードでメンバーを登録する
+
+    バケットの一覧（キー・ETag・更新日時）と登録済みの値を比較し、追加・変更された
+    YAMLのみを登録、削除されたYAMLのメンバーを削除します。
+
+    Args:
+        member_types (list): 同期するメンバー種別（"human" / "virtual"）のリスト
+        dry_run (bool): Trueの場合は差分の表示のみ行い、DBに書き込まない
+        delete_missing (bool): バケットから削除されたメンバーを削除するか
+
+    Returns:
+        bool: 全ての種別の同期に成功した場合はTrue
+    """
+    prefixes = {"human": HUMAN_MEMBERS_PREFIX, "virtual": VIRTUAL_MEMBERS_PREFIX}
+    all_success = True
+
+    for member_type in member_types:
+        print(f"\n=== Incremental Sync: {member_type} members ({prefixes[member_type]}) ===")
+        try:
+            summary = sync_members_incremental(
+                member_type, prefixes[member_type], dry_run=dry_run, delete_missing=delete_missing
+            )
+        except Exception as e:
+            print(f"❌ {member_type.capitalize()} member incremental sync failed: {e}")
+            all_success = False
+            continue
+
+        if summary["up_to_date"]:
+            print(f"✅ No changes since last sync ({summary['objects']} objects).")
+            continue
+
+        for label, key in (("Added", "added"), ("Changed", "changed"), ("Deleted", "deleted")):
+            for uri in summary[key]:
+                print(f"  {label}: {uri}")
+        prefix = "🔍 Dry run" if dry_run else "✅ Synced"
+        print(
+            f"{prefix}: {len(summary['added'])} added, {len(summary['changed'])} changed, "
+            f"{len(summary['deleted'])} deleted, {summary['unchanged']} unchanged "
+            f"(of {summary['objects']} objects)"
+        )
+
+    return all_success
+
+
+def run_streaming_registration(member_types: list, chunk_size: int = None, resume: bool = False):
+    """ストリーミングモードでメンバーを登録する
+
+    ストレージの一覧を順次取得しながらチャンク単位で登録・コミットし、
+    チャンクごとに進捗を表示します。
+
+    Args:
+        member_types (list): 登録するメンバー種別（"human" / "virtual"）のリスト
+        chunk_size (int, optional): 1トランザクションあたりのファイル数
+        resume (bool): Trueの場合は前回中断した実行の続きから再開する
+
+    Returns:
+        bool: 全ての種別の登録に成功した場合はTrue
+    """
+    prefixes = {"human": HUMAN_MEMBERS_PREFIX, "virtual": VIRTUAL_MEMBERS_PREFIX}
+    all_success = True
+
+    for member_type in member_types:
+        print(f"\n=== Streaming Registration: {member_type} members ({prefixes[member_type]}) ===")
+        processed = 0
+        try:
+            for progress in iter_register_members(
+                member_type, prefixes[member_type], chunk_size=chunk_size, resume=resume
+            ):
+                processed = progress["processed"]
+                print(
+                    f"  📦 Chunk {progress['chunk']}: {progress['chunk_files']} files committed "
+                    f"({processed} total, {progress['files_per_second']:.1f} files/s)"
+                )
+        except Exception as e:
+            print(f"❌ {member_type.capitalize()} member streaming registration failed: {e}")
+            print(f"   {processed} files were committed. Re-run with --resume to continue.")
+            all_success = False
+            continue
+
+        print(f"✅ Successfully processed {processed} {member_type} members.")
+
+    return all_success
+
+
 def main():
     """メンバー登録スクリプトのメイン関数（バッチモード）
 
@@ -54,6 +173,11 @@ def main():
     - --human: 人間メンバーのみをバッチ処理
     - --virtual: 仮想メンバーのみをバッチ処理
     - 引数なし: 人間メンバーと仮想メンバーの両方をバッチ処理
+    - --incremental: バケットとDBの差分（追加・変更・削除）のみを同期
+    - --dry-run: 差分同期の内容を表示のみ（DBに書き込まない、--incremental を含む）
+    - --partial: 部分成功モード（ファイルごとのSAVEPOINTで失敗したファイルのみ取り消し、残りをコミット）
+    - --stream: 一覧を順次取得しながらチャンク単位で登録・コミット（大量のメンバー向け）
+      （--chunk-size でチャンクのファイル数、--resume で中断した実行の再開を指定）
 
     特徴:
     - 複数ファイルを一括処理（バッチモード）
@@ -65,17 +189,74 @@ def main():
         python register_members.py                    # 全メンバーバッチ処理
         python register_members.py --human           # 人間メンバーのみバッチ処理
         python register_members.py --virtual         # 仮想メンバーのみバッチ処理
+        python register_members.py --incremental     # 差分のみ同期
+        python register_members.py --dry-run         # 差分同期の内容を確認
+        python register_members.py --partial         # 失敗したファイル以外を登録
+        python register_members.py --stream --chunk-size 1000  # チャンク単位で登録
+        python register_members.py --stream --resume # 中断したストリーミング登録を再開
 
     Note:
         - バッチ処理のため、一つでもエラーがあると該当バッチ全体がロールバックされます
+          （ストリーミングモードではエラーのあったチャンクのみ、部分成功モードではエラーのあったファイルのみ）
         - 人間メンバーと仮想メンバーは独立して処理されるため、一方が失敗しても他方は処理されます
         - 既存メンバーが存在する場合は新規作成せず、既存オブジェクトを返します
     """
     parser = argparse.ArgumentParser(description="Register members from YAML files")
     parser.add_argument("--human", action="store_true", help="Register human members only")
     parser.add_argument("--virtual", action="store_true", help="Register virtual members only")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Sync only objects added, changed or deleted since the last sync",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Show the incremental sync plan without writing to the database",
+    )
+    parser.add_argument(
+        "--no-delete",
+        action="store_true",
+        help="Do not delete members whose YAML was removed from storage (incremental mode)",
+    )
+    parser.add_argument(
+        "--partial",
+        action="store_true",
+        help="Commit valid files and report failed ones instead of rolling back the whole batch",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Register members chunk by chunk with bounded memory (commit per chunk)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        help="Number of files per chunk in streaming mode (default: REGISTRATION_CHUNK_SIZE)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume an interrupted streaming registration from its last committed chunk",
+    )
     args = parser.parse_args()
 
+    if args.human:
+        member_types = ["human"]
+    elif args.virtual:
+        member_types = ["virtual"]
+    else:
+        member_types = ["human", "virtual"]
+
+    if args.incremental or args.dry_run:
+        run_incremental_sync(member_types, dry_run=args.dry_run, delete_missing=not args.no_delete)
+        return
+
+    if args.stream or args.resume:
+        run_streaming_registration(member_types, chunk_size=args.chunk_size, resume=args.resume)
+        return
+
     try:
         # ストレージからYAMLファイルを動的に取得
         human_files, virtual_files = get_all_yaml_files_from_storage()
@@ -99,7 +280,7 @@ def main():
                 print(f"  - {file}")
 
             try:
-                created_members = register_human_members_batch(human_files)
+                created_members = register_members_batch("human", human_files, args.partial)
                 print(f"✅ Successfully processed {len(created_members)} human members.")
             except Exception as e:
                 print(f"❌ Batch registration failed: {e}")
@@ -120,7 +301,7 @@ def main():
                 print(f"  - {file}")
 
             try:
-                created_members = register_virtual_members_batch(virtual_files)
+                created_members = register_members_batch("virtual", virtual_files, args.partial)
                 print(f"✅ Successfully processed {len(created_members)} virtual members.")
             except Exception as e:
                 print(f"❌ Batch registration failed: {e}")
@@ -142,7 +323,7 @@ def main():
                     print(f"  - {file}")
 
                 try:
-                    created_members = register_human_members_batch(human_files)
+                    created_members = register_members_batch("human", human_files, args.partial)
                     print(f"✅ Successfully processed {len(created_members)} human members.")
                     human_success = True
                     human_count = len(created_members)
@@ -160,7 +341,7 @@ def main():
                     print(f"  - {file}")
 
                 try:
-                    created_members = register_virtual_members_batch(virtual_files)
+                    created_members = register_members_batch("virtual", virtual_files, args.partial)
                     print(f"✅ Successfully processed {len(created_members)} virtual members.")
                     virtual_success = True
                     virtual_count = len(created_members)
@@ -7,7 +7,7 @@ from operations.member_registration import (
     register_human_member_from_yaml,
     register_virtual_member_from_yaml,
 )
-from storage.storage_client import StorageClient
+from storage.storage_client import get_storage_client
 from utils.logging_config import setup_logging
 
 logger = setup_logging(__name__)
@@ -33,7 +33,7 @@ class WebhookFileWatcherService:
 
     def __init__(self):
         """Webhookファイル監視サービスを初期化する"""
-        self.storage_client = StorageClient()
+        self.storage_client = get_storage_client()
         self.processed_events: dict[str, str] = {}  # event_id -> etag
 
         # ETagチェック機能の有効/無効を環境変数から取得
@@ -1,8 +1,110 @@
 import os
+import socket
+import threading
 from io import BytesIO
 
+import urllib3
 import yaml
 from minio import Minio
+from minio.time import from_http_header
+
+# ストレージ接続プールの設定（プロセス内で共有するMinIOクライアントに適用）
+STORAGE_POOL_MAXSIZE = int(os.getenv("STORAGE_POOL_MAXSIZE", "16"))
+STORAGE_CONNECT_TIMEOUT = float(os.getenv("STORAGE_CONNECT_TIMEOUT", "5"))
+STORAGE_READ_TIMEOUT = float(os.getenv("STORAGE_READ_TIMEOUT", "30"))
+STORAGE_MAX_RETRIES = int(os.getenv("STORAGE_MAX_RETRIES", "3"))
+
+# メンバーYAMLを格納するストレージのプレフィックス
+HUMAN_MEMBERS_PREFIX = "data/samples/human_members/"
+VIRTUAL_MEMBERS_PREFIX = "data/samples/virtual_members/"
+
+_shared_minio_clients = {}
+_shared_storage_client = None
+_shared_lock = threading.Lock()
+
+
+def _create_http_client():
+    """MinIOクライアント用のurllib3コネクションプールを作成する（内部関数）
+
+    接続を使い回すためのプールサイズ、TCPキープアライブ、タイムアウト、
+    一時的なサーバーエラーに対するリトライを設定します。
+
+    Returns:
+        urllib3.PoolManager: 設定済みのコネクションプール
+    """
+    return urllib3.PoolManager(
+        num_pools=4,
+        maxsize=STORAGE_POOL_MAXSIZE,
+        timeout=urllib3.Timeout(connect=STORAGE_CONNECT_TIMEOUT, read=STORAGE_READ_TIMEOUT),
+        retries=urllib3.Retry(
+            total=STORAGE_MAX_RETRIES,
+            backoff_factor=0.2,
+            status_forcelist=[500, 502, 503, 504],
+        ),
+        socket_options=urllib3.connection.HTTPConnection.default_socket_options
+        + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)],
+    )
+
+
+def get_shared_minio_client():
+    """プロセス内で共有するMinIOクライアントを取得する
+
+    接続先・認証情報ごとに1つのMinIOクライアント（とコネクションプール）を作成し、
+    以降の呼び出しでは同じインスタンスを返します。MinIOクライアントはスレッドセーフなため、
+    複数スレッドから同時に使用できます。
+
+    Returns:
+        Minio: 共有MinIOクライアント
+    """
+    endpoint = f"{os.environ.get('STORAGE_HOST')}:{os.environ.get('STORAGE_PORT')}"
+    access_key = os.environ.get("MINIO_ROOT_USER")
+    secret_key = os.environ.get("MINIO_ROOT_PASSWORD")
+    key = (endpoint, access_key, secret_key)
+
+    with _shared_lock:
+        client = _shared_minio_clients.get(key)
+        if client is None:
+            client = Minio(
+                endpoint,
+                access_key=access_key,
+                secret_key=secret_key,
+                secure=False,  # In development, HTTP is fine. In production, it should be True
+                http_client=_create_http_client(),
+            )
+            _shared_minio_clients[key] = client
+        return client
+
+
+def get_storage_client():
+    """プロセス内で共有するStorageClientを取得する
+
+    ヘルスチェックやWebhook処理など、リクエストごとに呼び出される箇所で使用します。
+
+    Returns:
+        StorageClient: 共有StorageClient
+    """
+    global _shared_storage_client
+    if _shared_storage_client is None:
+        client = StorageClient()
+        with _shared_lock:
+            if _shared_storage_client is None:
+                _shared_storage_client = client
+    return _shared_storage_client
+
+
+def reset_shared_storage_clients():
+    """共有しているMinIOクライアントとStorageClientを破棄する
+
+    接続先の環境変数を変更した場合やテストで使用します。
+    """
+    global _shared_storage_client
+    with _shared_lock:
+        for client in _shared_minio_clients.values():
+            http_client = getattr(client, "_http", None)
+            if http_client is not None:
+                http_client.clear()
+        _shared_minio_clients.clear()
+        _shared_storage_client = None
 
 
 class StorageClient:
@@ -25,16 +127,13 @@ class StorageClient:
     Note:
         - 環境変数から認証情報を取得（STORAGE_HOST, STORAGE_PORT, MINIO_ROOT_USER, MINIO_ROOT_PASSWORD）
         - 開発環境ではHTTP接続、本番環境ではHTTPS接続を推奨
+        - MinIOクライアントとコネクションプールはプロセス内で共有されるため、
+          インスタンスを都度作成しても接続は再利用されます
     """
 
     def __init__(self):
-        # Get authentication information from environment variables
-        self.client = Minio(
-            f"{os.environ.get('STORAGE_HOST')}:{os.environ.get('STORAGE_PORT')}",
-            access_key=os.environ.get("MINIO_ROOT_USER"),
-            secret_key=os.environ.get("MINIO_ROOT_PASSWORD"),
-            secure=False,  # In development, HTTP is fine. In production, it should be True
-        )
+        # Reuse the process-wide Minio client (and its connection pool)
+        self.client = get_shared_minio_client()
         self.bucket_name = os.environ.get("MINIO_BUCKET_NAME")
 
     def storage_connection_check(self):
@@ -124,6 +223,54 @@ class StorageClient:
         except Exception as e:
             raise Exception(f"❌ Error listing YAML files with prefix '{prefix}': {e}")
 
+    def list_yaml_objects(self, prefix=""):
+        """指定されたプレフィックスに一致するYAMLファイルをメタデータ付きで取得する
+
+        list_yaml_files() と同じ一覧を、差分同期で使用するETag・更新日時・サイズ付きで返します。
+        オブジェクト本体は取得しないため、一覧取得のみで変更の有無を判定できます。
+
+        Args:
+            prefix (str): ファイルをフィルタリングするプレフィックス（例: "data/human_members/"）
+
+        Returns:
+            list: object_name, etag, last_modified, size をキーとする辞書のリスト
+
+        Raises:
+            Exception: ファイル一覧取得時にエラーが発生した場合
+        """
+        return list(self.iter_yaml_objects(prefix))
+
+    def iter_yaml_objects(self, prefix="", start_after=None):
+        """指定されたプレフィックスに一致するYAMLファイルをメタデータ付きで順次返す
+
+        一覧をリストに溜めずに、ストレージの一覧APIのページ単位で取得しながら返すため、
+        オブジェクト数が多い場合でもメモリ使用量は一定です。オブジェクトはキーの辞書順で返されます。
+
+        Args:
+            prefix (str): ファイルをフィルタリングするプレフィックス（例: "data/human_members/"）
+            start_after (str, optional): このキーより後のオブジェクトのみを返す（再開用）
+
+        Yields:
+            dict: object_name, etag, last_modified, size をキーとする辞書
+
+        Raises:
+            Exception: ファイル一覧取得時にエラーが発生した場合
+        """
+        try:
+            objects = self.client.list_objects(
+                self.bucket_name, prefix=prefix, recursive=True, start_after=start_after
+            )
+            for obj in objects:
+                if obj.object_name.endswith(".yml") or obj.object_name.endswith(".yaml"):
+                    yield {
+                        "object_name": obj.object_name,
+                        "etag": (obj.etag or "").strip('"'),
+                        "last_modified": obj.last_modified,
+                        "size": obj.size,
+                    }
+        except Exception as e:
+            raise Exception(f"❌ Error listing YAML objects with prefix '{prefix}': {e}")
+
     def read_yaml_from_minio(self, object_name: str) -> dict:
         """ストレージからYAMLファイルを読み込み、パースされた辞書オブジェクトを返す
 
@@ -150,6 +297,23 @@ class StorageClient:
             - YAML形式が不正な場合はパースエラーが発生します
             - 読み込み後は自動的にリソースが解放されます
         """
+        return self.read_yaml_object(object_name)[0]
+
+    def read_yaml_object(self, object_name: str) -> tuple:
+        """ストレージからYAMLファイルを読み込み、パースしたデータとメタデータを返す
+
+        ETag・更新日時は本体と同じGETレスポンスのヘッダーから取得するため、取得中に
+        上書きされた場合でも、記録するETagは読み込んだ内容のものと一致します。
+
+        Args:
+            object_name (str): 読み込むオブジェクトの名前（パスを含む）
+
+        Returns:
+            tuple: (パースされたYAMLデータ, etag と last_modified をキーとする辞書)
+
+        Raises:
+            Exception: ファイル読み込みやパース時にエラーが発生した場合
+        """
         response = None
         try:
             # Get the object
@@ -157,6 +321,11 @@ class StorageClient:
 
             # Read the binary data into memory
             yaml_data = BytesIO(response.read())
+            last_modified = response.headers.get("Last-Modified")
+            metadata = {
+                "etag": (response.headers.get("ETag") or "").strip('"'),
+                "last_modified": from_http_header(last_modified) if last_modified else None,
+            }
 
             # Parse as YAML
             data = yaml.safe_load(yaml_data)
@@ -165,7 +334,7 @@ class StorageClient:
             response.close()
             response.release_conn()
 
-            return data
+            return data, metadata
         except Exception as e:
             raise Exception(f"❌ Error reading {object_name} from {self.bucket_name}: {e}")
 
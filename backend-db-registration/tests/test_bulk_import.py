@@ -0,0 +1,125 @@
+import pytest
+import yaml
+from db.database import DatabaseError, SessionLocal, engine
+from initialize.bulk_import import bulk_import_members, iter_local_records
+from models.base import Base
+from models.members import (
+    HumanMember,
+    HumanMemberProfile,
+    VirtualMember,
+    VirtualMemberProfile,
+)
+from operations.member_registration import compute_yaml_hash
+from sqlalchemy import text
+
+HUMAN_PREFIX = "data/test/bulk/human_members/"
+VIRTUAL_PREFIX = "data/test/bulk/virtual_members/"
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    """テスト用のデータベースセッションを作成するフィクスチャ"""
+    Base.metadata.create_all(engine)
+
+    with engine.connect() as conn:
+        conn.execute(
+            text(
+                "TRUNCATE TABLE human_member_profiles, human_members, "
+                "virtual_member_profiles, virtual_members RESTART IDENTITY CASCADE"
+            )
+        )
+        conn.commit()
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def write_yaml(root, uri, data):
+    """バケットと同じ構成でYAMLファイルを作成する"""
+    path = root / uri
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.dump(data, f, allow_unicode=True)
+
+
+def test_bulk_import_human_members(db_session, tmp_path):
+    """COPYで読み込んだ人間メンバーが一括登録され、再実行時は変更分のみ更新されるテスト"""
+    for i in range(7):
+        # bioに改行・カンマ・引用符を含めてCSVのエスケープを確認
+        write_yaml(
+            tmp_path, f"{HUMAN_PREFIX}member_{i}.yml", {"name": f"一括{i}", "bio": f'a,"b"\nc{i}'}
+        )
+    write_yaml(tmp_path, f"{HUMAN_PREFIX}no_bio.yaml", {"name": "一括bioなし"})
+
+    def records():
+        return iter_local_records("human", str(tmp_path), prefix=HUMAN_PREFIX)
+
+    # 1. 初回: 全件新規登録（bioのないメンバーはプロフィールなし）
+    result = bulk_import_members("human", records(), chunk_size=3)
+    assert result["staged"] == 8
+    assert result["members"].to_dict() == {"inserted": 8, "updated": 0, "unchanged": 0}
+    assert result["profiles"].to_dict() == {"inserted": 7, "updated": 0, "unchanged": 0}
+    assert db_session.query(HumanMember).count() == 8
+    assert db_session.query(HumanMemberProfile).count() == 7
+
+    member = (
+        db_session.query(HumanMember)
+        .filter(HumanMember.yml_file_uri == f"{HUMAN_PREFIX}member_0.yml")
+        .one()
+    )
+    assert member.yml_file_hash == compute_yaml_hash({"name": "一括0", "bio": 'a,"b"\nc0'})
+    assert db_session.query(HumanMemberProfile).filter_by(member_id=member.member_id).one().bio == (
+        'a,"b"\nc0'
+    )
+
+    # ストレージからの登録で記録されたETag・更新日時
+    db_session.execute(
+        text(
+            "UPDATE human_members SET yml_file_etag = 'etag-3', "
+            "yml_file_last_modified = '2025-01-01T00:00:00+00:00'"
+        )
+    )
+    db_session.commit()
+
+    # 2. 1件変更して再実行: 変更したメンバー・プロフィールのみ更新
+    write_yaml(tmp_path, f"{HUMAN_PREFIX}member_3.yml", {"name": "一括3", "bio": "更新"})
+    result = bulk_import_members("human", records(), chunk_size=3)
+    assert result["members"].to_dict() == {"inserted": 0, "updated": 1, "unchanged": 7}
+    assert result["profiles"].to_dict() == {"inserted": 0, "updated": 1, "unchanged": 6}
+
+    # ローカルディレクトリからの再実行ではETag・更新日時を上書きしない
+    db_session.expire_all()
+    assert {member.yml_file_etag for member in db_session.query(HumanMember).all()} == {"etag-3"}
+    assert (
+        db_session.query(HumanMember).filter(HumanMember.yml_file_last_modified.is_(None)).count()
+        == 0
+    )
+
+
+def test_bulk_import_virtual_members_rolls_back_on_error(db_session, tmp_path):
+    """仮想メンバーの一括登録と、DBエラー時に全件ロールバックされるテスト"""
+    for i in range(3):
+        write_yaml(
+            tmp_path,
+            f"{VIRTUAL_PREFIX}ai_{i}.yml",
+            {"name": f"一括AI{i}", "llm_model": "gpt-4", "custom_prompt": f"プロンプト{i}"},
+        )
+
+    result = bulk_import_members(
+        "virtual", iter_local_records("virtual", str(tmp_path), prefix=VIRTUAL_PREFIX)
+    )
+    assert result["members"].inserted == 3
+    assert result["profiles"].inserted == 3
+    assert db_session.query(VirtualMemberProfile).count() == 3
+
+    # member_name の一意制約違反: 追加分も含めて全てロールバックされる
+    write_yaml(tmp_path, f"{VIRTUAL_PREFIX}ai_3.yml", {"name": "一括AI4", "llm_model": "gpt-4"})
+    write_yaml(tmp_path, f"{VIRTUAL_PREFIX}ai_dup.yml", {"name": "一括AI0", "llm_model": "gpt-4"})
+    with pytest.raises(DatabaseError):
+        bulk_import_members(
+            "virtual", iter_local_records("virtual", str(tmp_path), prefix=VIRTUAL_PREFIX)
+        )
+    assert db_session.query(VirtualMember).count() == 3
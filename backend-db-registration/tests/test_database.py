@@ -2,10 +2,19 @@ import os
 
 import pytest
 from db.database import (
+    UpsertCounts,
+    bulk_upsert_human_member_profiles,
+    bulk_upsert_human_members,
+    bulk_upsert_virtual_member_profiles,
+    bulk_upsert_virtual_members,
     get_human_member_by_name,
     get_virtual_member_by_name,
     save_human_member,
     save_virtual_member,
+    upsert_human_member,
+    upsert_human_member_profile,
+    upsert_human_member_with_profile,
+    upsert_virtual_member_with_profile,
 )
 from models.base import Base
 from sqlalchemy import create_engine, text
@@ -143,6 +152,274 @@ def test_get_nonexistent_virtual_member(db_session):
     print("✅ 存在しない仮想メンバー取得テスト成功")
 
 
+def test_bulk_upsert_human_members_with_profiles(db_session):
+    """人間メンバーとプロフィールのバルクUPSERTテスト（チャンク分割あり）"""
+    print("\n=== 人間メンバーバルクUPSERTテスト開始 ===")
+
+    # テストデータ（chunk_size=2 で3文に分割される5件）
+    members = [
+        {"name": f"バルク太郎{i}", "yml_file_uri": f"data/test/database/bulk_human_{i}.yml"}
+        for i in range(5)
+    ]
+
+    upserted = bulk_upsert_human_members(db_session, members, chunk_size=2)
+    profiles = bulk_upsert_human_member_profiles(
+        db_session,
+        [
+            {"member_id": m.member_id, "member_uuid": m.member_uuid, "bio": f"{m.member_name}のbio"}
+            for m in upserted
+        ],
+        chunk_size=2,
+    )
+    db_session.commit()
+
+    # 検証: 入力順に返却され、全件登録されている
+    assert [m.yml_file_uri for m in upserted] == [m["yml_file_uri"] for m in members]
+    assert len(profiles) == 5
+    for member in members:
+        saved_member = get_human_member_by_name(db_session, member["name"])
+        assert saved_member is not None
+        assert saved_member.yml_file_uri == member["yml_file_uri"]
+
+    bios = db_session.execute(text("SELECT bio FROM human_member_profiles ORDER BY bio")).fetchall()
+    assert [row.bio for row in bios] == [f"バルク太郎{i}のbio" for i in range(5)]
+
+    print("✅ 人間メンバーバルクUPSERTテスト成功")
+
+
+def test_bulk_upsert_updates_existing_and_deduplicates(db_session):
+    """バルクUPSERTで既存メンバーの更新と同一URIの重複除去（後勝ち）が行われるテスト"""
+    print("\n=== バルクUPSERT更新・重複除去テスト開始 ===")
+
+    test_uri = "data/test/database/bulk_update.yml"
+    existing = save_human_member(db_session, "更新前太郎", test_uri)
+
+    upserted = bulk_upsert_human_members(
+        db_session,
+        [
+            {"name": "中間太郎", "yml_file_uri": test_uri},
+            {"name": "新規花子", "yml_file_uri": "data/test/database/bulk_new.yml"},
+            {"name": "更新後太郎", "yml_file_uri": test_uri},
+        ],
+    )
+    db_session.commit()
+
+    # 検証: 同一URIは同じメンバー（UUID維持）で最後の名前に更新されている
+    assert upserted[0].member_uuid == existing.member_uuid
+    assert upserted[2].member_uuid == existing.member_uuid
+    assert upserted[0].member_name == "更新後太郎"
+    assert get_human_member_by_name(db_session, "中間太郎") is None
+    assert get_human_member_by_name(db_session, "更新後太郎") is not None
+    count = db_session.execute(text("SELECT COUNT(*) FROM human_members")).scalar()
+    assert count == 2
+
+    print("✅ バルクUPSERT更新・重複除去テスト成功")
+
+
+def test_bulk_upsert_virtual_members_with_profiles(db_session):
+    """仮想メンバーとプロフィールのバルクUPSERTテスト"""
+    print("\n=== 仮想メンバーバルクUPSERTテスト開始 ===")
+
+    members = [
+        {"name": f"バルクAI{i}", "yml_file_uri": f"data/test/database/bulk_virtual_{i}.yml"}
+        for i in range(3)
+    ]
+
+    upserted = bulk_upsert_virtual_members(db_session, members)
+    bulk_upsert_virtual_member_profiles(
+        db_session,
+        [
+            {
+                "member_id": m.member_id,
+                "member_uuid": m.member_uuid,
+                "llm_model": "gpt-4",
+                "custom_prompt": None,
+            }
+            for m in upserted
+        ],
+    )
+    db_session.commit()
+
+    # 検証
+    assert len(upserted) == 3
+    for member in members:
+        assert get_virtual_member_by_name(db_session, member["name"]) is not None
+    models = db_session.execute(text("SELECT llm_model FROM virtual_member_profiles")).fetchall()
+    assert [row.llm_model for row in models] == ["gpt-4"] * 3
+
+    # 空リストの場合はSQLを実行しない
+    assert bulk_upsert_virtual_members(db_session, []) == []
+
+    print("✅ 仮想メンバーバルクUPSERTテスト成功")
+
+
+def test_upsert_member_with_profile_single_statement(db_session):
+    """メンバーとプロフィールを1文でUPSERTするテスト（新規登録と更新）"""
+    print("\n=== メンバー・プロフィール同時UPSERTテスト開始 ===")
+
+    test_uri = "data/test/database/cte_human.yml"
+
+    # 新規登録
+    member, profile = upsert_human_member_with_profile(db_session, "CTE太郎", test_uri, "初回bio")
+    db_session.commit()
+    assert profile.member_uuid == member.member_uuid
+    assert profile.member_id == member.member_id
+    assert profile.bio == "初回bio"
+
+    # 更新: メンバーUUID・プロフィールUUIDが維持され、内容のみ更新される
+    updated_member, updated_profile = upsert_human_member_with_profile(
+        db_session, "CTE次郎", test_uri, "更新bio"
+    )
+    db_session.commit()
+    assert updated_member.member_uuid == member.member_uuid
+    assert updated_member.member_name == "CTE次郎"
+    assert updated_profile.profile_uuid == profile.profile_uuid
+    assert updated_profile.bio == "更新bio"
+    count = db_session.execute(text("SELECT COUNT(*) FROM human_member_profiles")).scalar()
+    assert count == 1
+
+    # 仮想メンバー
+    virtual_member, virtual_profile = upsert_virtual_member_with_profile(
+        db_session, "CTE AI", "data/test/database/cte_virtual.yml", "gpt-4", "プロンプト"
+    )
+    db_session.commit()
+    assert virtual_profile.member_uuid == virtual_member.member_uuid
+    assert virtual_profile.llm_model == "gpt-4"
+    assert virtual_profile.custom_prompt == "プロンプト"
+    assert get_virtual_member_by_name(db_session, "CTE AI") is not None
+
+    print("✅ メンバー・プロフィール同時UPSERTテスト成功")
+
+
+def test_upsert_skips_identical_rows(db_session):
+    """値が同じ行は更新せず、新規登録・更新・変更なしの件数が集計されるテスト"""
+    print("\n=== 変更なし行の更新スキップテスト開始 ===")
+
+    members = [
+        {"name": f"差分太郎{i}", "yml_file_uri": f"data/test/database/noop_{i}.yml"}
+        for i in range(3)
+    ]
+
+    # 1. 新規登録
+    counts = UpsertCounts()
+    first = bulk_upsert_human_members(db_session, members, counts=counts)
+    db_session.commit()
+    assert counts.to_dict() == {"inserted": 3, "updated": 0, "unchanged": 0}
+
+    # 2. 1件だけ名前を変更して再実行: 変更した行のみ更新される
+    members[1] = {**members[1], "name": "差分次郎"}
+    counts = UpsertCounts()
+    second = bulk_upsert_human_members(db_session, members, counts=counts)
+    db_session.commit()
+    assert counts.to_dict() == {"inserted": 0, "updated": 1, "unchanged": 2}
+    assert [m.member_uuid for m in second] == [m.member_uuid for m in first]
+    assert second[0].updated_at == first[0].updated_at
+    assert second[1].updated_at > first[1].updated_at
+    assert second[1].member_name == "差分次郎"
+
+    # 3. 単体のUPSERTも同様（プロフィール含む）
+    counts = UpsertCounts()
+    member = upsert_human_member(db_session, "差分太郎0", members[0]["yml_file_uri"], counts=counts)
+    profile = upsert_human_member_profile(
+        db_session, member.member_id, member.member_uuid, "bio", counts=counts
+    )
+    db_session.commit()
+    same_profile = upsert_human_member_profile(
+        db_session, member.member_id, member.member_uuid, "bio", counts=counts
+    )
+    db_session.commit()
+    assert counts.to_dict() == {"inserted": 1, "updated": 0, "unchanged": 2}
+    assert same_profile.profile_uuid == profile.profile_uuid
+    assert same_profile.updated_at == profile.updated_at
+
+    # 4. メンバー・プロフィール同時UPSERT: 両方とも変更なし
+    counts = UpsertCounts()
+    upsert_human_member_with_profile(
+        db_session, "差分太郎0", members[0]["yml_file_uri"], "bio", counts=counts
+    )
+    db_session.commit()
+    assert counts.to_dict() == {"inserted": 0, "updated": 0, "unchanged": 2}
+
+    print("✅ 変更なし行の更新スキップテスト成功")
+
+
+def test_upsert_human_member_keeps_tracking_columns(db_session):
+    """単体UPSERTが指定していないハッシュ・ETag・更新日時を上書きしないテスト"""
+    print("\n=== 単体UPSERTの追跡列保持テスト開始 ===")
+
+    uri = "data/test/database/tracked.yml"
+    bulk_upsert_human_members(
+        db_session,
+        [
+            {
+                "name": "追跡太郎",
+                "yml_file_uri": uri,
+                "yml_file_hash": "a" * 64,
+                "yml_file_etag": "etag-1",
+                "yml_file_last_modified": "2025-01-01T00:00:00+00:00",
+            }
+        ],
+    )
+    db_session.commit()
+
+    # 1. 同じ名前: 変更なし扱いで、追跡列も保持される
+    counts = UpsertCounts()
+    member = upsert_human_member(db_session, "追跡太郎", uri, counts=counts)
+    db_session.commit()
+    assert counts.to_dict() == {"inserted": 0, "updated": 0, "unchanged": 1}
+    assert member.yml_file_hash == "a" * 64
+
+    # 2. 名前のみ変更: 名前は更新され、追跡列は保持される
+    counts = UpsertCounts()
+    member = upsert_human_member(db_session, "追跡次郎", uri, counts=counts)
+    db_session.commit()
+    assert counts.to_dict() == {"inserted": 0, "updated": 1, "unchanged": 0}
+    row = db_session.execute(
+        text(
+            "SELECT member_name, yml_file_hash, yml_file_etag, yml_file_last_modified "
+            "FROM human_members WHERE yml_file_uri = :uri"
+        ),
+        {"uri": uri},
+    ).one()
+    assert row.member_name == "追跡次郎"
+    assert row.yml_file_hash == "a" * 64
+    assert row.yml_file_etag == "etag-1"
+    assert row.yml_file_last_modified is not None
+
+    # 3. ETagを指定する行と省略する行が混在するバッチ: 行ごとに判定される
+    other_uri = "data/test/database/tracked_other.yml"
+    bulk_upsert_human_members(db_session, [{"name": "追跡三郎", "yml_file_uri": other_uri}])
+    db_session.commit()
+    counts = UpsertCounts()
+    bulk_upsert_human_members(
+        db_session,
+        [
+            {"name": "追跡次郎", "yml_file_uri": uri},
+            {
+                "name": "追跡三郎",
+                "yml_file_uri": other_uri,
+                "yml_file_hash": "b" * 64,
+                "yml_file_etag": "etag-2",
+            },
+        ],
+        counts=counts,
+    )
+    db_session.commit()
+    assert counts.to_dict() == {"inserted": 0, "updated": 1, "unchanged": 1}
+    rows = db_session.execute(
+        text(
+            "SELECT yml_file_uri, yml_file_hash, yml_file_etag FROM human_members "
+            "ORDER BY yml_file_uri"
+        )
+    ).all()
+    assert [tuple(r) for r in rows] == [
+        (uri, "a" * 64, "etag-1"),
+        (other_uri, "b" * 64, "etag-2"),
+    ]
+
+    print("✅ 単体UPSERTの追跡列保持テスト成功")
+
+
 # pytestが直接実行された場合のメイン処理
 if __name__ == "__main__":
     print("🚀 pytestテストを開始します...")
@@ -1,15 +1,23 @@
+import datetime
 import os
+import time
 
 import pytest
 import yaml
 from db.database import get_human_member_by_name, get_virtual_member_by_name
 from models.base import Base
+from models.members import HumanMember, HumanMemberProfile
 from operations.member_registration import (
+    compute_yaml_hash,
+    fetch_and_validate_yamls,
     register_human_member_from_yaml,
+    register_human_members_batch,
+    register_human_members_partial,
     register_virtual_member_from_yaml,
 )
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
+from validation.yaml_validator import ValidationError, YAMLValidator
 
 # 環境変数からデータベース接続情報を取得
 MEMBER_DB_HOST = os.getenv("MEMBER_DB_HOST", "db-member")
@@ -22,6 +30,11 @@ MEMBER_DB_NAME = os.getenv("MEMBER_DB_NAME", "test_member_db")
 TEST_DATABASE_URL = f"postgresql://{MEMBER_DB_USER}:{MEMBER_DB_PASSWORD}@{MEMBER_DB_HOST}:{MEMBER_DB_PORT}/{MEMBER_DB_NAME}"
 
 
+def mock_object_metadata(etag="etag-1"):
+    """ストレージクライアントの read_yaml_object() と同じ形式のメタデータを返す"""
+    return {"etag": etag, "last_modified": datetime.datetime(2025, 1, 1, tzinfo=datetime.UTC)}
+
+
 @pytest.fixture(scope="function")
 def db_session():
     """テスト用のデータベースセッションを作成するフィクスチャ"""
@@ -87,6 +100,9 @@ def mock_storage_client(monkeypatch):
     """ストレージクライアントのモックを作成するフィクスチャ"""
 
     class MockStorageClient:
+        def read_yaml_object(self, yaml_path):
+            return self.read_yaml_from_minio(yaml_path), mock_object_metadata()
+
         def read_yaml_from_minio(self, yaml_path):
             with open(yaml_path, encoding="utf-8") as f:
                 return yaml.safe_load(f)
@@ -197,6 +213,9 @@ def mock_storage_with_real_files(monkeypatch, tmp_path):
     }
 
     class MockStorageClientForRealFiles:
+        def read_yaml_object(self, yaml_path):
+            return self.read_yaml_from_minio(yaml_path), mock_object_metadata()
+
         def read_yaml_from_minio(self, yaml_path):
             if yaml_path in test_files:
                 content = test_files[yaml_path]
@@ -349,6 +368,9 @@ def test_yml_file_uri_based_upsert_human_member(db_session, monkeypatch):
     test_files[test_uri] = {"name": "テストユーザー", "bio": "初回登録のプロフィールです"}
 
     class MockStorageClient:
+        def read_yaml_object(self, yaml_path):
+            return self.read_yaml_from_minio(yaml_path), mock_object_metadata()
+
         def read_yaml_from_minio(self, yaml_path):
             if yaml_path in test_files:
                 content = test_files[yaml_path]
@@ -423,6 +445,9 @@ def test_yml_file_uri_based_upsert_virtual_member(db_session, monkeypatch):
     }
 
     class MockStorageClient:
+        def read_yaml_object(self, yaml_path):
+            return self.read_yaml_from_minio(yaml_path), mock_object_metadata()
+
         def read_yaml_from_minio(self, yaml_path):
             if yaml_path in test_files:
                 content = test_files[yaml_path]
@@ -508,6 +533,9 @@ def test_profile_information_storage(db_session, monkeypatch):
     }
 
     class MockStorageClient:
+        def read_yaml_object(self, yaml_path):
+            return self.read_yaml_from_minio(yaml_path), mock_object_metadata()
+
         def read_yaml_from_minio(self, yaml_path):
             if yaml_path in test_files:
                 content = test_files[yaml_path]
@@ -564,3 +592,162 @@ def test_profile_information_storage(db_session, monkeypatch):
         assert virtual_profile.member_uuid == virtual_member.member_uuid
     finally:
         session.close()
+
+
+def test_batch_yaml_prefetch_preserves_order_and_all_or_nothing():
+    """バッチ登録のYAML並列取得で入力順が保持され、1件でも失敗すれば例外となるテスト"""
+    yaml_paths = [f"data/human_members/並列{i}.yml" for i in range(6)]
+
+    class MockStorageClient:
+        def read_yaml_from_minio(self, yaml_path):
+            index = yaml_paths.index(yaml_path) if yaml_path in yaml_paths else 0
+            # 後のファイルほど早く返るようにして、完了順と入力順を異ならせる
+            time.sleep(0.01 * (len(yaml_paths) - index))
+            if yaml_path.endswith("不正.yml"):
+                return {"bio": "nameがありません"}
+            return {"name": f"並列{index}", "bio": "bio"}
+
+    # 入力順に返却される
+    results = fetch_and_validate_yamls(
+        MockStorageClient(), yaml_paths, YAMLValidator.validate_human_member_yaml, max_workers=4
+    )
+    assert [path for path, _ in results] == yaml_paths
+    assert [data["name"] for _, data in results] == [f"並列{i}" for i in range(6)]
+
+    # 1件でもバリデーションに失敗した場合は全体が失敗する
+    with pytest.raises(ValidationError):
+        fetch_and_validate_yamls(
+            MockStorageClient(),
+            yaml_paths + ["data/human_members/不正.yml"],
+            YAMLValidator.validate_human_member_yaml,
+            max_workers=4,
+        )
+
+    # 空リストの場合はスレッドプールを作成しない
+    assert (
+        fetch_and_validate_yamls(MockStorageClient(), [], YAMLValidator.validate_human_member_yaml)
+        == []
+    )
+
+
+def test_unchanged_yaml_skips_registration(db_session, monkeypatch):
+    """YAML内容が前回登録時と同じ場合はDBに書き込まず、変更時のみ更新されるテスト"""
+    test_uri = "data/test/human_members/hash_user.yml"
+    test_files = {test_uri: {"name": "ハッシュユーザー", "bio": "初回のプロフィールです"}}
+    etags = {test_uri: "etag-1"}
+
+    class MockStorageClient:
+        def read_yaml_object(self, yaml_path):
+            return self.read_yaml_from_minio(yaml_path), mock_object_metadata(etags[yaml_path])
+
+        def read_yaml_from_minio(self, yaml_path):
+            return dict(test_files[yaml_path])
+
+    monkeypatch.setattr("operations.member_registration.StorageClient", MockStorageClient)
+
+    # キー順序が異なるだけのデータは同じハッシュになる
+    assert compute_yaml_hash({"name": "a", "bio": "b"}) == compute_yaml_hash(
+        {"bio": "b", "name": "a"}
+    )
+
+    # 1. 新規登録でハッシュ・ETag・更新日時が保存される
+    member1 = register_human_member_from_yaml(test_uri)
+    assert member1.yml_file_hash == compute_yaml_hash(test_files[test_uri])
+    assert member1.yml_file_etag == "etag-1"
+    assert member1.yml_file_last_modified is not None
+
+    # 2. 同じ内容で再登録（単体・バッチとも）: updated_atが変わらない
+    member2 = register_human_member_from_yaml(test_uri)
+    (member3,) = register_human_members_batch([test_uri])
+    assert member2.member_uuid == member1.member_uuid
+    assert member2.updated_at == member1.updated_at
+    assert member3.updated_at == member1.updated_at
+
+    # 3. 内容が同じでETagのみ変わった場合: 記録済みのETagのみ更新される
+    etags[test_uri] = "etag-2"
+    member4 = register_human_member_from_yaml(test_uri)
+    assert member4.yml_file_etag == "etag-2"
+    assert member4.yml_file_hash == member1.yml_file_hash
+    profile = db_session.query(HumanMemberProfile).filter_by(member_uuid=member1.member_uuid).one()
+    assert profile.updated_at == profile.created_at
+
+    # 4. 内容を変更して再登録: 更新される
+    test_files[test_uri] = {"name": "ハッシュユーザー", "bio": "更新したプロフィールです"}
+    (member5,) = register_human_members_batch([test_uri])
+    assert member5.member_uuid == member1.member_uuid
+    assert member5.yml_file_hash == compute_yaml_hash(test_files[test_uri])
+    assert member5.updated_at > member1.updated_at
+
+
+def test_partial_batch_commits_valid_files(db_session, monkeypatch):
+    """部分成功モードで失敗したファイルのみ取り消され、残りがコミットされるテスト"""
+    base = "data/test/human_members/partial"
+    test_files = {
+        f"{base}_1.yml": {"name": "部分成功1", "bio": "bio"},
+        f"{base}_invalid.yml": {"bio": "nameがありません"},
+        f"{base}_2.yml": {"name": "部分成功2", "bio": "bio"},
+        # member_name の一意制約違反（DBエラー）
+        f"{base}_duplicate.yml": {"name": "部分成功1", "bio": "bio"},
+        f"{base}_3.yml": {"name": "部分成功3"},
+    }
+
+    class MockStorageClient:
+        def read_yaml_from_minio(self, yaml_path):
+            return dict(test_files[yaml_path])
+
+    monkeypatch.setattr("operations.member_registration.StorageClient", MockStorageClient)
+
+    # 全成功または全ロールバックのバッチ登録では1件も登録されない
+    with pytest.raises(ValidationError):
+        register_human_members_batch(list(test_files))
+    assert db_session.query(HumanMember).count() == 0
+
+    result = register_human_members_partial(list(test_files))
+
+    assert [member.yml_file_uri for member in result["succeeded"]] == [
+        f"{base}_1.yml",
+        f"{base}_2.yml",
+        f"{base}_3.yml",
+    ]
+    assert [yaml_path for yaml_path, _ in result["failed"]] == [
+        f"{base}_invalid.yml",
+        f"{base}_duplicate.yml",
+    ]
+    assert db_session.query(HumanMember).count() == 3
+    # bioのないメンバーはプロフィールを作成しない
+    assert db_session.query(HumanMemberProfile).count() == 2
+
+    # 修正後の再実行では失敗したファイルのみ書き込まれる
+    test_files[f"{base}_invalid.yml"] = {"name": "部分成功4", "bio": "bio"}
+    test_files[f"{base}_duplicate.yml"] = {"name": "部分成功5", "bio": "bio"}
+    result = register_human_members_partial(list(test_files))
+    assert result["failed"] == []
+    assert len(result["succeeded"]) == 5
+    assert db_session.query(HumanMember).count() == 5
+
+
+def test_batch_without_metadata_keeps_stored_etag(db_session, monkeypatch):
+    """メタデータなしのバッチ・部分成功登録で、記録済みのETag・更新日時が保持されるテスト"""
+    test_uri = "data/test/human_members/etag_user.yml"
+    test_files = {test_uri: {"name": "ETagユーザー", "bio": "初回のプロフィールです"}}
+
+    class MockStorageClient:
+        def read_yaml_from_minio(self, yaml_path):
+            return dict(test_files[yaml_path])
+
+    monkeypatch.setattr("operations.member_registration.StorageClient", MockStorageClient)
+
+    # 1. 差分同期と同じくメタデータ付きで登録
+    metadata = mock_object_metadata()
+    register_human_members_batch([test_uri], object_metadata={test_uri: metadata})
+
+    # 2. 内容を変更し、メタデータなしで再登録（バッチ・部分成功とも）
+    for i, register in enumerate((register_human_members_batch, register_human_members_partial)):
+        test_files[test_uri] = {"name": "ETagユーザー", "bio": f"更新したプロフィール{i}"}
+        register([test_uri])
+
+        db_session.expire_all()
+        member = db_session.query(HumanMember).filter_by(yml_file_uri=test_uri).one()
+        assert member.yml_file_hash == compute_yaml_hash(test_files[test_uri])
+        assert member.yml_file_etag == "etag-1"
+        assert member.yml_file_last_modified == metadata["last_modified"]
@@ -1,6 +1,7 @@
+import datetime
 
 import pytest
-from storage.storage_client import StorageClient
+from storage.storage_client import StorageClient, reset_shared_storage_clients
 
 
 class MockMinioClient:
@@ -24,6 +25,7 @@ class MockMinioClient:
 class MockResponse:
     def __init__(self, data):
         self.data = data
+        self.headers = {"ETag": '"etag-1"', "Last-Modified": "Wed, 01 Jan 2025 09:30:00 GMT"}
 
     def read(self):
         return self.data.encode("utf-8")
@@ -62,7 +64,10 @@ def mock_storage_client(monkeypatch):
     monkeypatch.setenv("MINIO_ROOT_PASSWORD", "testpassword")
     monkeypatch.setenv("MINIO_BUCKET_NAME", "test-bucket")
 
-    return StorageClient()
+    # 共有クライアントを破棄し、モックのMinioClientで作り直す
+    reset_shared_storage_clients()
+    yield StorageClient()
+    reset_shared_storage_clients()
 
 
 def test_storage_connection_check(mock_storage_client):
@@ -96,6 +101,18 @@ def test_read_virtual_member_yaml(mock_storage_client):
     assert yaml_data["bio"] == "テスト用の仮想メンバーです"
 
 
+def test_read_yaml_object_returns_response_metadata(mock_storage_client):
+    """YAMLデータと同じレスポンスのETag・更新日時が返されるテスト"""
+    yaml_data, metadata = mock_storage_client.read_yaml_object("human_test.yaml")
+
+    # 検証
+    assert yaml_data["name"] == "テスト太郎"
+    assert metadata == {
+        "etag": "etag-1",
+        "last_modified": datetime.datetime(2025, 1, 1, 9, 30, tzinfo=datetime.UTC),
+    }
+
+
 def test_read_nonexistent_yaml(mock_storage_client):
     """存在しないYAMLファイルの読み込みテスト"""
     # 存在しないファイルを読み込もうとする
@@ -104,3 +121,13 @@ def test_read_nonexistent_yaml(mock_storage_client):
 
     # エラーメッセージを検証
     assert "Object nonexistent.yaml not found" in str(exc_info.value)
+
+
+def test_storage_client_shares_minio_client(mock_storage_client):
+    """StorageClientを複数作成してもMinIOクライアントが共有されることのテスト"""
+    from storage.storage_client import get_storage_client
+
+    # 検証: 接続プールを持つMinIOクライアントは1つだけ作成される
+    assert StorageClient().client is mock_storage_client.client
+    assert get_storage_client() is get_storage_client()
+    assert get_storage_client().client is mock_storage_client.client
@@ -0,0 +1,184 @@
+import datetime
+
+import pytest
+from db.database import SessionLocal, engine
+from models.base import Base
+from models.members import HumanMember, HumanMemberProfile, MemberRelationship
+from models.storage_sync import StorageSyncCheckpoint
+from operations.storage_sync import (
+    compute_listing_digest,
+    diff_storage_objects,
+    sync_members_incremental,
+)
+from sqlalchemy import text
+
+PREFIX = "data/test/sync/human_members/"
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    """テスト用のデータベースセッションを作成するフィクスチャ"""
+    Base.metadata.create_all(engine)
+
+    with engine.connect() as conn:
+        conn.execute(
+            text(
+                "TRUNCATE TABLE human_member_profiles, human_members, member_relationships, "
+                "storage_sync_checkpoints RESTART IDENTITY CASCADE"
+            )
+        )
+        conn.commit()
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def mock_bucket(monkeypatch):
+    """バケットの内容（キー → (ETag, YAMLデータ)）を差し替えられるストレージクライアントのモック"""
+    bucket = {}
+    calls = {"read": []}
+
+    class MockStorageClient:
+        def list_yaml_objects(self, prefix=""):
+            return [
+                {
+                    "object_name": key,
+                    "etag": etag,
+                    "last_modified": datetime.datetime(2025, 1, 1, tzinfo=datetime.UTC),
+                    "size": 0,
+                }
+                for key, (etag, _) in sorted(bucket.items())
+                if key.startswith(prefix)
+            ]
+
+        def read_yaml_from_minio(self, yaml_path):
+            calls["read"].append(yaml_path)
+            return dict(bucket[yaml_path][1])
+
+    monkeypatch.setattr("operations.storage_sync.StorageClient", MockStorageClient)
+    monkeypatch.setattr("operations.member_registration.StorageClient", MockStorageClient)
+    return bucket, calls
+
+
+def test_diff_storage_objects():
+    """一覧と登録済みメンバーの差分抽出のテスト"""
+    objects = [
+        {"object_name": "a.yml", "etag": "1"},
+        {"object_name": "b.yml", "etag": "2"},
+        {"object_name": "c.yml", "etag": "3"},
+    ]
+    existing = {
+        "b.yml": HumanMember(yml_file_uri="b.yml", yml_file_etag="2"),
+        "c.yml": HumanMember(yml_file_uri="c.yml", yml_file_etag="old"),
+        "d.yml": HumanMember(yml_file_uri="d.yml", yml_file_etag="4"),
+    }
+
+    diff = diff_storage_objects(objects, existing)
+
+    assert [obj["object_name"] for obj in diff["added"]] == ["a.yml"]
+    assert [obj["object_name"] for obj in diff["changed"]] == ["c.yml"]
+    assert diff["deleted"] == ["d.yml"]
+    assert diff["unchanged"] == 1
+    # 一覧の順序に依存しない
+    assert compute_listing_digest(objects) == compute_listing_digest(list(reversed(objects)))
+
+
+@pytest.mark.filterwarnings("error::sqlalchemy.exc.SAWarning")
+def test_incremental_sync_processes_only_changes(db_session, mock_bucket):
+    """差分同期で追加・変更・削除のみが処理され、チェックポイントが保存されるテスト"""
+    bucket, calls = mock_bucket
+    for i in range(3):
+        bucket[f"{PREFIX}member_{i}.yml"] = (f"etag-{i}", {"name": f"同期太郎{i}", "bio": "bio"})
+
+    # 1. 初回同期: 全件追加
+    summary = sync_members_incremental("human", PREFIX)
+    assert len(summary["added"]) == 3
+    assert db_session.query(HumanMember).count() == 3
+    assert db_session.get(StorageSyncCheckpoint, PREFIX).object_count == 3
+
+    # 2. 変更なし: チェックポイントと一致し、YAMLを取得しない
+    calls["read"].clear()
+    summary = sync_members_incremental("human", PREFIX)
+    assert summary["up_to_date"] is True
+    assert calls["read"] == []
+
+    # 削除予定のメンバーを from / to に持つ関係と、無関係な関係を登録
+    uuids = {
+        member.yml_file_uri: member.member_uuid for member in db_session.query(HumanMember).all()
+    }
+    member_0, member_1, member_2 = (uuids[f"{PREFIX}member_{i}.yml"] for i in range(3))
+    db_session.add_all(
+        [
+            MemberRelationship(
+                from_member_uuid=member_2, to_member_uuid=member_0, relationship_type="peer"
+            ),
+            MemberRelationship(
+                from_member_uuid=member_1, to_member_uuid=member_2, relationship_type="mentor"
+            ),
+            MemberRelationship(
+                from_member_uuid=member_0, to_member_uuid=member_1, relationship_type="peer"
+            ),
+        ]
+    )
+    db_session.commit()
+
+    # 3. 1件変更・1件追加・1件削除: 変更分のみ取得して反映
+    bucket[f"{PREFIX}member_0.yml"] = ("etag-0b", {"name": "同期太郎0", "bio": "更新bio"})
+    bucket[f"{PREFIX}member_3.yml"] = ("etag-3", {"name": "同期太郎3", "bio": "bio"})
+    del bucket[f"{PREFIX}member_2.yml"]
+
+    # dry-runではDBに書き込まない
+    summary = sync_members_incremental("human", PREFIX, dry_run=True)
+    assert summary["deleted"] == [f"{PREFIX}member_2.yml"]
+    assert db_session.query(HumanMember).count() == 3
+
+    calls["read"].clear()
+    summary = sync_members_incremental("human", PREFIX)
+    assert summary["added"] == [f"{PREFIX}member_3.yml"]
+    assert summary["changed"] == [f"{PREFIX}member_0.yml"]
+    assert summary["deleted"] == [f"{PREFIX}member_2.yml"]
+    assert summary["unchanged"] == 1
+    assert sorted(calls["read"]) == [f"{PREFIX}member_0.yml", f"{PREFIX}member_3.yml"]
+
+    db_session.expire_all()
+    uris = sorted(member.yml_file_uri for member in db_session.query(HumanMember).all())
+    assert uris == [f"{PREFIX}member_{i}.yml" for i in (0, 1, 3)]
+    assert db_session.query(HumanMemberProfile).count() == 3
+    updated_member = (
+        db_session.query(HumanMember)
+        .filter(HumanMember.yml_file_uri == f"{PREFIX}member_0.yml")
+        .one()
+    )
+    assert updated_member.yml_file_etag == "etag-0b"
+    # 削除したメンバーの関係のみ削除される
+    relationships = db_session.query(MemberRelationship).all()
+    assert [(r.from_member_uuid, r.to_member_uuid) for r in relationships] == [(member_0, member_1)]
+    assert db_session.get(StorageSyncCheckpoint, PREFIX).deleted_count == 1
+
+
+def test_incremental_sync_without_delete_keeps_checkpoint_pending(db_session, mock_bucket):
+    """削除なしの同期ではチェックポイントを保存せず、次回の削除ありの同期で削除が反映されるテスト"""
+    bucket, _ = mock_bucket
+    for i in range(2):
+        bucket[f"{PREFIX}member_{i}.yml"] = (f"etag-{i}", {"name": f"同期花子{i}", "bio": "bio"})
+    sync_members_incremental("human", PREFIX)
+    synced_at = db_session.get(StorageSyncCheckpoint, PREFIX).synced_at
+
+    # 1. 削除なしの同期: メンバーは残り、チェックポイントは更新されない
+    del bucket[f"{PREFIX}member_1.yml"]
+    summary = sync_members_incremental("human", PREFIX, delete_missing=False)
+    assert summary["deleted"] == []
+    db_session.expire_all()
+    assert db_session.query(HumanMember).count() == 2
+    assert db_session.get(StorageSyncCheckpoint, PREFIX).synced_at == synced_at
+
+    # 2. 一覧が変わらないまま削除ありで同期: up_to_date にならず削除が反映される
+    summary = sync_members_incremental("human", PREFIX)
+    assert summary["up_to_date"] is False
+    assert summary["deleted"] == [f"{PREFIX}member_1.yml"]
+    assert db_session.query(HumanMember).count() == 1
+    assert db_session.get(StorageSyncCheckpoint, PREFIX).object_count == 1
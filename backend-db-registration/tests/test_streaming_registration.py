@@ -0,0 +1,106 @@
+import datetime
+
+import pytest
+from db.database import SessionLocal, engine
+from models.base import Base
+from models.members import HumanMember
+from models.storage_sync import RegistrationCheckpoint
+from operations.streaming_registration import iter_chunks, iter_register_members
+from sqlalchemy import text
+from validation.yaml_validator import ValidationError
+
+PREFIX = "data/test/stream/human_members/"
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    """テスト用のデータベースセッションを作成するフィクスチャ"""
+    Base.metadata.create_all(engine)
+
+    with engine.connect() as conn:
+        conn.execute(
+            text(
+                "TRUNCATE TABLE human_member_profiles, human_members, registration_checkpoints "
+                "RESTART IDENTITY CASCADE"
+            )
+        )
+        conn.commit()
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def mock_bucket(monkeypatch):
+    """バケットの内容（キー → YAMLデータ）を差し替えられるストレージクライアントのモック"""
+    bucket = {}
+    calls = {"start_after": []}
+
+    class MockStorageClient:
+        def iter_yaml_objects(self, prefix="", start_after=None):
+            calls["start_after"].append(start_after)
+            for key in sorted(bucket):
+                if key.startswith(prefix) and (start_after is None or key > start_after):
+                    yield {
+                        "object_name": key,
+                        "etag": f"etag-{key}",
+                        "last_modified": datetime.datetime(2025, 1, 1, tzinfo=datetime.UTC),
+                        "size": 0,
+                    }
+
+        def read_yaml_from_minio(self, yaml_path):
+            return dict(bucket[yaml_path])
+
+    monkeypatch.setattr("operations.streaming_registration.StorageClient", MockStorageClient)
+    monkeypatch.setattr("operations.member_registration.StorageClient", MockStorageClient)
+    return bucket, calls
+
+
+def test_iter_chunks():
+    """ジェネレータをチャンクに分割するテスト"""
+    chunks = list(iter_chunks((i for i in range(5)), 2))
+    assert chunks == [[0, 1], [2, 3], [4]]
+    assert list(iter_chunks([], 2)) == []
+
+
+def test_streaming_registration_commits_per_chunk_and_resumes(db_session, mock_bucket):
+    """チャンクごとにコミットされ、失敗したチャンクから再開できるテスト"""
+    bucket, calls = mock_bucket
+    for i in range(5):
+        bucket[f"{PREFIX}member_{i}.yml"] = {"name": f"ストリーム太郎{i}", "bio": "bio"}
+    # 3番目のチャンクに不正なYAMLを含める
+    bucket[f"{PREFIX}member_4.yml"] = {"bio": "nameがない"}
+
+    # 1. 2チャンク分はコミットされ、3チャンク目で失敗
+    progress = []
+    with pytest.raises(ValidationError):
+        for item in iter_register_members("human", PREFIX, chunk_size=2):
+            progress.append(item)
+
+    assert [item["processed"] for item in progress] == [2, 4]
+    assert db_session.query(HumanMember).count() == 4
+    checkpoint = db_session.get(RegistrationCheckpoint, PREFIX)
+    assert checkpoint.last_object_name == f"{PREFIX}member_3.yml"
+    assert checkpoint.processed_count == 4
+    assert checkpoint.completed_at is None
+
+    # 2. YAMLを修正して再開: コミット済みのキーより後のみ処理
+    bucket[f"{PREFIX}member_4.yml"] = {"name": "ストリーム太郎4", "bio": "bio"}
+    progress = list(iter_register_members("human", PREFIX, chunk_size=2, resume=True))
+
+    assert calls["start_after"][-1] == f"{PREFIX}member_3.yml"
+    assert [item["processed"] for item in progress] == [5]
+    db_session.expire_all()
+    assert db_session.query(HumanMember).count() == 5
+    checkpoint = db_session.get(RegistrationCheckpoint, PREFIX)
+    assert checkpoint.processed_count == 5
+    assert checkpoint.completed_at is not None
+
+    # 3. 完了後の resume は最初から処理する
+    progress = list(iter_register_members("human", PREFIX, chunk_size=2, resume=True))
+    assert calls["start_after"][-1] is None
+    assert [item["processed"] for item in progress] == [2, 4, 5]
+    assert db_session.query(HumanMember).count() == 5
@@ -71,6 +71,9 @@ def mock_storage_client(monkeypatch):
             return yaml.safe_load(f)
 
     class MockStorageClient:
+        def read_yaml_object(self, yaml_path):
+            return mock_read_yaml(yaml_path), {"etag": "etag", "last_modified": None}
+
         def read_yaml_from_minio(self, yaml_path):
             return mock_read_yaml(yaml_path)
 
@@ -90,8 +93,8 @@ def test_human_member_profile_failure_rollback(db_session, human_test_yaml, mock
     initial_human_count = db_session.query(HumanMember).count()
     initial_profile_count = db_session.query(HumanMemberProfile).count()
 
-    # プロフィール登録で失敗するようにupsert_human_member_profileをモック
-    with patch("db.database.upsert_human_member_profile") as mock_upsert:
+    # メンバー・プロフィール同時登録で失敗するようにupsert_human_member_with_profileをモック
+    with patch("db.database.upsert_human_member_with_profile") as mock_upsert:
         mock_upsert.side_effect = DatabaseError(
             "プロフィール登録時のデータベースエラー", Exception("DB接続失敗")
         )
@@ -134,8 +137,8 @@ def test_virtual_member_profile_failure_rollback(
     initial_virtual_count = db_session.query(VirtualMember).count()
     initial_profile_count = db_session.query(VirtualMemberProfile).count()
 
-    # プロフィール登録で失敗するようにupsert_virtual_member_profileをモック
-    with patch("db.database.upsert_virtual_member_profile") as mock_upsert:
+    # メンバー・プロフィール同時登録で失敗するようにupsert_virtual_member_with_profileをモック
+    with patch("db.database.upsert_virtual_member_with_profile") as mock_upsert:
         mock_upsert.side_effect = DatabaseError(
             "仮想メンバープロフィール登録エラー", Exception("制約違反")
         )
@@ -217,7 +220,7 @@ def test_transaction_isolation_verification(db_session, human_test_yaml, mock_st
         initial_count = external_session.query(HumanMember).count()
 
         # プロフィール登録失敗をモック
-        with patch("db.database.upsert_human_member_profile") as mock_upsert:
+        with patch("db.database.upsert_human_member_with_profile") as mock_upsert:
             mock_upsert.side_effect = DatabaseError("テスト用失敗", Exception())
 
             # 失敗する登録処理を実行
@@ -29,10 +29,54 @@ def main():
     times_test_mode = os.getenv("TIMES_TEST_MODE", "false").lower() == "true"
     times_test_interval = int(os.getenv("TIMES_TEST_INTERVAL", "60"))
 
+    # チャットログ記録設定（DynamoDBへのWrite-Behind書き込み）
+    chat_log_enabled = os.getenv("CHAT_LOG_ENABLED", "false").lower() == "true"
+    chat_log_index_enabled = os.getenv("CHAT_LOG_INDEX_ENABLED", "false").lower() == "true"
+    chat_rag_enabled = os.getenv("CHAT_RAG_ENABLED", "false").lower() == "true"
+    chat_summary_enabled = os.getenv("CHAT_SUMMARY_ENABLED", "false").lower() == "true"
+
+    # モデルルーティング設定（virtual_member_profiles.llm_model に従ってモデルを選択）
+    model_routing_enabled = os.getenv("LLM_MODEL_ROUTING_ENABLED", "false").lower() == "true"
+
+    # シャーディング設定（ギルド数が多い場合にゲートウェイを分割）
+    sharding_enabled = os.getenv("DISCORD_SHARDING", "false").lower() == "true"
+    shard_count = os.getenv("DISCORD_SHARD_COUNT")
+    shard_count = int(shard_count) if shard_count else None
+    shard_ids = [
+        int(shard_id)
+        for shard_id in os.getenv("DISCORD_SHARD_IDS", "").split(",")
+        if shard_id.strip()
+    ] or None
+
+    # 省メモリ設定（Intents・キャッシュを最小限にする）
+    lean_mode = os.getenv("DISCORD_LEAN_MODE", "false").lower() == "true"
+
+    # イベントループ監視（診断用）
+    loop_monitor_enabled = os.getenv("LOOP_MONITOR_ENABLED", "false").lower() == "true"
+
     logger.info("=" * 60)
     logger.info(f"🚀 Discord Bot '{bot_name}' を起動します")
     if times_test_mode:
         logger.info(f"🧪 Times Mode テストモード有効 (インターバル: {times_test_interval}秒)")
+    if chat_log_enabled:
+        logger.info("🗄️ チャットログ記録有効 (DynamoDB)")
+        if chat_log_index_enabled:
+            logger.info("🔎 チャットログ全文検索インデックス有効")
+        if chat_log_index_enabled and chat_rag_enabled:
+            logger.info("🔍 過去会話の検索拡張有効")
+    if chat_summary_enabled:
+        logger.info("🧾 会話要約有効 (AutoThreadモード)")
+    if model_routing_enabled:
+        logger.info("🧭 モデルルーティング有効")
+    if sharding_enabled:
+        logger.info(
+            f"🧩 シャーディング有効 (シャード数: {shard_count or '自動'}, "
+            f"担当シャード: {shard_ids or '全て'})"
+        )
+    if lean_mode:
+        logger.info("🪶 省メモリモード有効 (最小Intents・キャッシュ無効)")
+    if loop_monitor_enabled:
+        logger.info("🩺 イベントループ監視有効")
     logger.info("=" * 60)
 
     try:
@@ -57,6 +101,16 @@ def main():
             times_channels,
             times_test_mode=times_test_mode,
             times_test_interval=times_test_interval,
+            chat_log_enabled=chat_log_enabled,
+            chat_log_index_enabled=chat_log_index_enabled,
+            chat_rag_enabled=chat_rag_enabled,
+            chat_summary_enabled=chat_summary_enabled,
+            model_routing_enabled=model_routing_enabled,
+            sharding_enabled=sharding_enabled,
+            shard_count=shard_count,
+            shard_ids=shard_ids,
+            lean_mode=lean_mode,
+            loop_monitor_enabled=loop_monitor_enabled,
         )
         bot.run()
 
@@ -1,8 +1,7 @@
 """
 プロンプトローダー
 
-Bot用のシステムプロンプトをファイルから読み込む機能を提供します。
-将来的にデータベースからの読み込みにも対応予定。
+Bot用のシステムプロンプトをファイルまたはデータベースから読み込む機能を提供します。
 """
 
 import os
@@ -13,7 +12,7 @@ logger = logging.getLogger(__name__)
 
 
 class PromptLoader:
-    """プロンプトローダー（ファイルベース、将来的にDB対応予定）"""
+    """プロンプトローダー（ファイル / DB）"""
 
     PROMPT_DIR = "prompts/bot_characters"
 
@@ -57,7 +56,10 @@ class PromptLoader:
     @staticmethod
     def load_from_db(bot_name: str) -> Optional[str]:
         """
-        データベースからプロンプトを読み込み（将来実装）
+        データベースからプロンプトを読み込み（virtual_member_profiles.custom_prompt）
+
+        Bot名の先頭の絵文字を除いた名前（例: "🤖🍡華扇" → "華扇"）で仮想メンバーを検索し、
+        プロフィールを同一クエリでJOINして取得します。
 
         Args:
             bot_name: Bot名
@@ -65,6 +67,28 @@ class PromptLoader:
         Returns:
             プロンプト文字列。見つからない場合はNone
         """
-        # TODO: virtual_member_profiles.custom_promptから読み込み
-        logger.warning("⚠️ DB連携は未実装です。ファイルベースを使用してください。")
-        return None
+        from db.connection.connection import DBMemberConnection
+        from db.operation.member_queries import (
+            member_name_from_bot_name,
+            query_virtual_member_with_profile,
+        )
+
+        member_name = member_name_from_bot_name(bot_name)
+
+        try:
+            with DBMemberConnection().session_factory() as session:
+                member = query_virtual_member_with_profile(session, member_name)
+                prompt = member.profile.custom_prompt if member and member.profile else None
+        except Exception as e:
+            logger.error(
+                f"❌ DBからのシステムプロンプト読み込みエラー: {member_name} - {e}",
+                exc_info=True,
+            )
+            return None
+
+        if not prompt:
+            logger.warning(f"⚠️ DBにシステムプロンプトが登録されていません: {member_name}")
+            return None
+
+        logger.info(f"✅ システムプロンプト読み込み成功 (DB): {member_name}")
+        return prompt.strip()
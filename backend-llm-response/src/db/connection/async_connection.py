@@ -0,0 +1,138 @@
+"""
+メンバーDB非同期接続
+
+SQLAlchemyの非同期エンジン（asyncpgドライバー）とセッションファクトリを
+プロセス内で共有し、DiscordのイベントループをブロックせずにメンバーDBへ
+アクセスするための接続を提供します。
+
+asyncpgの接続は作成したイベントループに紐づくため、Botのイベントループ内で
+使用してください（別ループで使う場合は dispose_async_engine() で破棄してから
+再作成します）。
+"""
+
+import asyncio
+import threading
+from typing import Optional
+
+from db.connection.connection import DBMemberConnection, get_pool_config
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+_async_engine_lock = threading.Lock()
+
+
+def _get_async_db_url() -> str:
+    """同期接続と同じ環境変数からasyncpg用の接続URLを構築"""
+    return DBMemberConnection._get_db_url().replace("postgresql://", "postgresql+asyncpg://", 1)
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    プロセス内で共有する非同期エンジンを取得（初回呼び出し時に作成）
+
+    Returns:
+        非同期エンジン
+    """
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        with _async_engine_lock:
+            if _async_engine is None:
+                # プール設定は同期エンジンと共通の環境変数を使用
+                _async_engine = create_async_engine(_get_async_db_url(), **get_pool_config())
+                _async_session_factory = async_sessionmaker(_async_engine, expire_on_commit=False)
+    return _async_engine
+
+
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    """
+    共有エンジンに紐づく非同期セッションファクトリを取得
+
+    Returns:
+        非同期セッションファクトリ
+    """
+    get_async_engine()
+    return _async_session_factory
+
+
+def get_async_pool_stats() -> dict:
+    """
+    非同期エンジンの接続プール統計を取得（監視用、未作成の場合は空の辞書）
+
+    Returns:
+        プール統計の辞書
+    """
+    if _async_engine is None:
+        return {}
+    pool = _async_engine.pool
+    return {
+        "pool_size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+
+
+async def dispose_async_engine() -> None:
+    """共有エンジンの接続プールを破棄（停止時や別ループへの切り替え時に使用）"""
+    global _async_engine, _async_session_factory
+    engine = _async_engine
+    with _async_engine_lock:
+        _async_engine = None
+        _async_session_factory = None
+    if engine is not None:
+        await engine.dispose()
+
+
+class AsyncDBMemberConnection:
+    """メンバーDBへの非同期接続クラス（エンジンはプロセス内で共有）"""
+
+    def __init__(self):
+        self.engine = get_async_engine()
+        self.session_factory = get_async_session_factory()
+
+    def session(self) -> AsyncSession:
+        """
+        非同期セッションを作成（async with で使用）
+
+        Returns:
+            非同期セッション
+        """
+        return self.session_factory()
+
+    async def db_member_connection_check(self) -> bool:
+        """
+        接続確認（SELECT 1 を実行）
+
+        Returns:
+            接続できた場合はTrue
+
+        Raises:
+            Exception: 接続に失敗した場合
+        """
+        try:
+            async with self.session() as session:
+                await session.execute(text("SELECT 1"))
+            print("✅ Async database connection established successfully.")
+            return True
+        except Exception as e:
+            raise Exception(f"❌ Error establishing async database connection: {e}") from e
+
+
+async def _main():
+    await AsyncDBMemberConnection().db_member_connection_check()
+    await dispose_async_engine()
+
+
+def main():
+    asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
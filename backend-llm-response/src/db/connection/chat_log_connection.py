@@ -0,0 +1,120 @@
+"""
+チャットログDB接続
+
+DynamoDB（開発環境ではLocalStackの db-chat-log）上のチャットログテーブルへの
+接続を提供します。テーブル設計は docs/architecture/database.md の案に従い、
+パーティションキー session_id（チャンネル/スレッドID）とソートキー message_key
+（DiscordメッセージIDのスノーフレーク）で構成します。スノーフレークは上位ビットに
+投稿時刻（ミリ秒）を含むため時刻順に並び、同一ミリ秒の投稿でも重複しません。
+"""
+
+import logging
+import os
+from typing import Any, Optional
+
+import boto3
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger(__name__)
+
+# Discordスノーフレークの基準時刻（2015-01-01T00:00:00Z、エポックミリ秒）
+DISCORD_EPOCH_MS = 1420070400000
+
+
+def timestamp_to_message_key(timestamp_ms: int) -> int:
+    """
+    エポックミリ秒を、その時刻以降に投稿されたメッセージの最小のソートキーに変換
+
+    Args:
+        timestamp_ms: エポックミリ秒
+
+    Returns:
+        その時刻の最小のスノーフレーク値（範囲クエリの境界に使用）
+    """
+    return max(timestamp_ms - DISCORD_EPOCH_MS, 0) << 22
+
+
+class ChatLogConnection:
+    """チャットログテーブル（DynamoDB）への接続クラス
+
+    boto3のリソースAPIはスレッドセーフではないため、スレッドセーフな
+    低レベルクライアントを使用し、アイテムの変換は本クラスで行います。
+    """
+
+    DEFAULT_TABLE_NAME = "ChatLogs"
+    DEFAULT_REGION = "ap-northeast-1"
+
+    def __init__(
+        self,
+        table_name: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+        region_name: Optional[str] = None,
+    ):
+        """
+        初期化
+
+        Args:
+            table_name: テーブル名（未指定の場合は環境変数CHAT_LOG_TABLE_NAME）
+            endpoint_url: DynamoDBエンドポイント（未指定の場合はDYNAMODB_HOST/DYNAMODB_PORTから構築）
+            region_name: リージョン（未指定の場合は環境変数AWS_DEFAULT_REGION）
+        """
+        self.table_name = table_name or os.getenv("CHAT_LOG_TABLE_NAME", self.DEFAULT_TABLE_NAME)
+        self.endpoint_url = endpoint_url or self._get_endpoint_url()
+        self.region_name = region_name or os.getenv("AWS_DEFAULT_REGION", self.DEFAULT_REGION)
+
+        client_kwargs: dict[str, Any] = {"region_name": self.region_name}
+        if self.endpoint_url:
+            # LocalStackは任意の認証情報を受け付けるため、未設定時はダミー値を使用
+            client_kwargs["endpoint_url"] = self.endpoint_url
+            client_kwargs["aws_access_key_id"] = os.getenv("AWS_ACCESS_KEY_ID", "test")
+            client_kwargs["aws_secret_access_key"] = os.getenv("AWS_SECRET_ACCESS_KEY", "test")
+
+        self.client = boto3.client("dynamodb", **client_kwargs)
+        self._serializer = TypeSerializer()
+        self._deserializer = TypeDeserializer()
+
+    def _get_endpoint_url(self) -> Optional[str]:
+        """環境変数からエンドポイントURLを構築（未設定の場合はAWSのデフォルト）"""
+        host = os.getenv("DYNAMODB_HOST")
+        if not host:
+            return None
+        port = os.getenv("DYNAMODB_PORT", "4566")
+        return f"http://{host}:{port}"
+
+    def ensure_table(self) -> None:
+        """チャットログテーブルが存在しない場合は作成する"""
+        try:
+            self.client.describe_table(TableName=self.table_name)
+            return
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ResourceNotFoundException":
+                raise
+
+        logger.info(f"🗄️ チャットログテーブルを作成します: {self.table_name}")
+        self.client.create_table(
+            TableName=self.table_name,
+            KeySchema=[
+                {"AttributeName": "session_id", "KeyType": "HASH"},
+                {"AttributeName": "message_key", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "session_id", "AttributeType": "S"},
+                {"AttributeName": "message_key", "AttributeType": "N"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        self.client.get_waiter("table_exists").wait(TableName=self.table_name)
+        logger.info(f"✅ チャットログテーブル作成完了: {self.table_name}")
+
+    def serialize_item(self, item: dict[str, Any]) -> dict[str, Any]:
+        """Python辞書をDynamoDBの属性値形式に変換（Noneの属性は除外）"""
+        return {
+            key: self._serializer.serialize(value)
+            for key, value in item.items()
+            if value is not None
+        }
+
+    def deserialize_item(self, item: dict[str, Any]) -> dict[str, Any]:
+        """DynamoDBの属性値形式をPython辞書に変換"""
+        return {key: self._deserializer.deserialize(value) for key, value in item.items()}
@@ -1,14 +1,102 @@
 import os
+import threading
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
 
+# プロセス内で共有するエンジンとセッションファクトリ（接続URLごと）
+_engines: dict[str, Engine] = {}
+_session_factories: dict[str, sessionmaker] = {}
+_connection_events: dict[str, dict[str, int]] = {}
+_registry_lock = threading.Lock()
+
+
+def get_pool_config() -> dict:
+    """接続プール設定を環境変数から取得（同期・非同期エンジン共通）"""
+    return {
+        "pool_size": int(os.getenv("MEMBER_DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("MEMBER_DB_MAX_OVERFLOW", "10")),
+        "pool_recycle": int(os.getenv("MEMBER_DB_POOL_RECYCLE", "1800")),
+        "pool_timeout": float(os.getenv("MEMBER_DB_POOL_TIMEOUT", "30")),
+        "pool_pre_ping": True,
+    }
+
+
+def get_engine(db_url: str) -> Engine:
+    """接続URLに対応する共有エンジンを取得（初回のみ作成）"""
+    engine = _engines.get(db_url)
+    if engine is not None:
+        return engine
+
+    with _registry_lock:
+        if db_url not in _engines:
+            engine = create_engine(db_url, **get_pool_config())
+            _connection_events[db_url] = {"connects": 0, "checkouts": 0, "invalidations": 0}
+            _register_pool_events(engine, _connection_events[db_url])
+            _engines[db_url] = engine
+            _session_factories[db_url] = sessionmaker(bind=engine)
+        return _engines[db_url]
+
+
+def get_session_factory(db_url: str) -> sessionmaker:
+    """共有エンジンに紐づくセッションファクトリを取得"""
+    get_engine(db_url)
+    return _session_factories[db_url]
+
+
+def _register_pool_events(engine: Engine, counters: dict[str, int]) -> None:
+    """接続の新規作成・貸し出し・無効化の回数を数えるイベントを登録"""
+
+    def counter(key: str):
+        def listener(*_args):
+            counters[key] += 1
+
+        return listener
+
+    event.listen(engine, "connect", counter("connects"))
+    event.listen(engine, "checkout", counter("checkouts"))
+    event.listen(engine, "invalidate", counter("invalidations"))
+
+
+def get_pool_stats() -> dict[str, dict]:
+    """
+    共有エンジンごとの接続プール統計を取得（監視用）
+
+    Returns:
+        パスワードを伏せた接続URLをキーとする統計の辞書
+    """
+    stats = {}
+    for db_url, engine in list(_engines.items()):
+        pool = engine.pool
+        stats[engine.url.render_as_string(hide_password=True)] = {
+            "pool_size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            **_connection_events[db_url],
+        }
+    return stats
+
+
+def dispose_engines() -> None:
+    """共有エンジンの接続プールをすべて破棄（停止時に使用）"""
+    with _registry_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+        _session_factories.clear()
+        _connection_events.clear()
+
 
 class DBMemberConnection:
     def __init__(self):
-        self.engine = create_engine(self._get_db_url())
+        # エンジンとセッションファクトリはプロセス内で共有し、インスタンスごとに作成しない
+        self.engine = get_engine(self._get_db_url())
+        self.session_factory = get_session_factory(self._get_db_url())
 
-    def _get_db_config(self) -> dict:
+    @staticmethod
+    def _get_db_config() -> dict:
         return {
             "host": os.getenv("MEMBER_DB_HOST"),
             "port": os.getenv("MEMBER_DB_PORT"),
@@ -17,8 +105,9 @@ class DBMemberConnection:
             "db_name": os.getenv("MEMBER_DB_NAME"),
         }
 
-    def _get_db_url(self) -> str:
-        db_config = self._get_db_config()
+    @staticmethod
+    def _get_db_url() -> str:
+        db_config = DBMemberConnection._get_db_config()
         return (
             f"postgresql://"
             f"{db_config['user']}:"
@@ -30,16 +119,19 @@ class DBMemberConnection:
 
     def db_member_connection_check(self) -> Session:
         try:
-            Session = sessionmaker(bind=self.engine)
+            session = self.session_factory()
             print("✅ Database connection established successfully.")
-            return Session()
+            return session
         except Exception as e:
-            raise Exception(f"❌ Error establishing database connection: {e}")
+            raise Exception(f"❌ Error establishing database connection: {e}") from e
 
 
 def main():
     db_member_connection = DBMemberConnection()
-    db_member_connection.db_member_connection_check()
+    session = db_member_connection.db_member_connection_check()
+    session.close()
+    for db_url, stats in get_pool_stats().items():
+        print(f"📊 {db_url}: {stats}")
 
 
 if __name__ == "__main__":
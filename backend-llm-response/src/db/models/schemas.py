@@ -1,5 +1,5 @@
-from sqlalchemy import UUID, Column, DateTime, Integer, String
-from sqlalchemy.orm import declarative_base
+from sqlalchemy import UUID, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.orm import declarative_base, relationship
 from sqlalchemy.sql import func
 
 Base = declarative_base()
@@ -14,6 +14,18 @@ class HumanMember(Base):
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
+    profile = relationship(
+        "HumanMemberProfile",
+        uselist=False,
+        back_populates="member",
+        foreign_keys="HumanMemberProfile.member_id",
+    )
+    relationships = relationship(
+        "MemberRelationship",
+        primaryjoin="HumanMember.member_uuid == foreign(MemberRelationship.from_member_uuid)",
+        viewonly=True,
+    )
+
     def __repr__(self):
         return f"<HumanMember(id={self.member_id}, name={self.member_name})>"
 
@@ -27,5 +39,69 @@ class VirtualMember(Base):
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
+    profile = relationship(
+        "VirtualMemberProfile",
+        uselist=False,
+        back_populates="member",
+        foreign_keys="VirtualMemberProfile.member_id",
+    )
+    relationships = relationship(
+        "MemberRelationship",
+        primaryjoin="VirtualMember.member_uuid == foreign(MemberRelationship.from_member_uuid)",
+        viewonly=True,
+    )
+
     def __repr__(self):
         return f"<VirtualMember(id={self.member_id}, name={self.member_name})>"
+
+
+class HumanMemberProfile(Base):
+    __tablename__ = "human_member_profiles"
+
+    profile_id = Column(Integer, primary_key=True)
+    profile_uuid = Column(UUID, nullable=False, unique=True, server_default=func.uuid_generate_v4())
+    member_id = Column(Integer, ForeignKey("human_members.member_id"), nullable=False)
+    member_uuid = Column(UUID, ForeignKey("human_members.member_uuid"), nullable=False, unique=True)
+    bio = Column(Text)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    member = relationship("HumanMember", back_populates="profile", foreign_keys=[member_id])
+
+    def __repr__(self):
+        return f"<HumanMemberProfile(id={self.profile_id}, member_id={self.member_id})>"
+
+
+class VirtualMemberProfile(Base):
+    __tablename__ = "virtual_member_profiles"
+
+    profile_id = Column(Integer, primary_key=True)
+    profile_uuid = Column(UUID, nullable=False, unique=True, server_default=func.uuid_generate_v4())
+    member_id = Column(Integer, ForeignKey("virtual_members.member_id"), nullable=False)
+    member_uuid = Column(
+        UUID, ForeignKey("virtual_members.member_uuid"), nullable=False, unique=True
+    )
+    llm_model = Column(String(50), nullable=False)
+    custom_prompt = Column(Text)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    member = relationship("VirtualMember", back_populates="profile", foreign_keys=[member_id])
+
+    def __repr__(self):
+        return f"<VirtualMemberProfile(id={self.profile_id}, member_id={self.member_id})>"
+
+
+class MemberRelationship(Base):
+    __tablename__ = "member_relationships"
+
+    relationship_id = Column(Integer, primary_key=True)
+    from_member_uuid = Column(UUID, nullable=False)
+    to_member_uuid = Column(UUID, nullable=False)
+    relationship_type = Column(String(50), nullable=False)
+    name_suffix = Column(String(50))
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<MemberRelationship(id={self.relationship_id}, type={self.relationship_type})>"
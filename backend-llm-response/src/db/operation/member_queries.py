@@ -1,6 +1,11 @@
+import unicodedata
+from typing import Optional
+
 from db.connection.connection import DBMemberConnection
-from db.models.schemas import HumanMember
-from sqlalchemy.orm import Session
+from db.models.schemas import HumanMember, VirtualMember
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 
 
 def query_human_members(session: Session, name: str) -> list[HumanMember]:
@@ -14,11 +19,98 @@ def query_human_members(session: Session, name: str) -> list[HumanMember]:
         raise
 
 
+async def query_human_members_async(session: AsyncSession, name: str) -> list[HumanMember]:
+    try:
+        result = await session.execute(select(HumanMember).where(HumanMember.member_name == name))
+        return result.scalars().first()
+    except Exception as e:
+        print(f"❌ Error querying human members: {e}")
+
+        await session.close()
+        print("🔚 Database session closed.")
+        raise
+
+
+def member_name_from_bot_name(bot_name: str) -> str:
+    """Bot名から先頭の絵文字等を除いたメンバー名を取得（例: "🤖🍡華扇" → "華扇"）"""
+    for index, char in enumerate(bot_name):
+        if unicodedata.category(char)[0] in ("L", "N"):
+            return bot_name[index:].strip()
+    return bot_name.strip()
+
+
+def _members_with_profiles_query(member_model, names: Optional[list[str]] = None):
+    """プロフィールと関係をJOINで同時に読み込むクエリを構築"""
+    stmt = select(member_model).options(
+        joinedload(member_model.profile), joinedload(member_model.relationships)
+    )
+    if names is not None:
+        stmt = stmt.where(member_model.member_name.in_(names))
+    return stmt.order_by(member_model.member_id)
+
+
+def query_human_members_with_profiles(
+    session: Session, names: Optional[list[str]] = None
+) -> list[HumanMember]:
+    try:
+        return (
+            session.execute(_members_with_profiles_query(HumanMember, names))
+            .unique()
+            .scalars()
+            .all()
+        )
+    except Exception as e:
+        print(f"❌ Error querying human members with profiles: {e}")
+
+        session.close()
+        print("🔚 Database session closed.")
+        raise
+
+
+def query_virtual_members_with_profiles(
+    session: Session, names: Optional[list[str]] = None
+) -> list[VirtualMember]:
+    try:
+        return (
+            session.execute(_members_with_profiles_query(VirtualMember, names))
+            .unique()
+            .scalars()
+            .all()
+        )
+    except Exception as e:
+        print(f"❌ Error querying virtual members with profiles: {e}")
+
+        session.close()
+        print("🔚 Database session closed.")
+        raise
+
+
+def query_virtual_member_with_profile(session: Session, name: str) -> Optional[VirtualMember]:
+    members = query_virtual_members_with_profiles(session, [name])
+    return members[0] if members else None
+
+
+async def query_virtual_members_with_profiles_async(
+    session: AsyncSession, names: Optional[list[str]] = None
+) -> list[VirtualMember]:
+    try:
+        result = await session.execute(_members_with_profiles_query(VirtualMember, names))
+        return result.unique().scalars().all()
+    except Exception as e:
+        print(f"❌ Error querying virtual members with profiles: {e}")
+
+        await session.close()
+        print("🔚 Database session closed.")
+        raise
+
+
 def main():
     db_member_connection = DBMemberConnection()
     session = db_member_connection.db_member_connection_check()
     human_member = query_human_members(session, "Syota")
     print(human_member)
+    for virtual_member in query_virtual_members_with_profiles(session):
+        print(virtual_member, virtual_member.profile, virtual_member.relationships)
     session.close()
 
 
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+"""
+DB読み取り時のイベントループ遅延ベンチマーク
+
+同時に複数のDB読み取りを行いながら、一定間隔でスリープするティッカーの
+遅延（予定時刻からのずれ）を計測し、以下の方式を比較します。
+
+- sync:   同期セッションをコルーチン内で直接実行（イベントループをブロック）
+- thread: 同期セッションを asyncio.to_thread で実行
+- async:  非同期エンジン（asyncpg）で実行
+
+Usage:
+    python src/scripts/benchmark_db_loop_latency.py --concurrency 20 --duration 10
+    python src/scripts/benchmark_db_loop_latency.py --modes sync async --query-delay-ms 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from db.connection.async_connection import (
+    AsyncDBMemberConnection,
+    dispose_async_engine,
+)
+from db.connection.connection import DBMemberConnection
+from db.operation.member_queries import query_human_members, query_human_members_async
+from sqlalchemy import text
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    """パーセンタイル値を取得（値が無い場合は0）"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+    return ordered[index]
+
+
+async def _ticker(stop: asyncio.Event, interval: float, lags: list[float]) -> None:
+    """一定間隔でスリープし、予定時刻からの遅延を記録"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append((loop.time() - expected) * 1000)
+
+
+async def _run_mode(mode: str, args) -> dict:
+    """
+    1方式のベンチマークを実行
+
+    Args:
+        mode: "sync" / "thread" / "async"
+        args: コマンドライン引数
+
+    Returns:
+        計測結果の辞書
+    """
+    delay_sql = text("SELECT pg_sleep(:seconds)")
+    delay_seconds = args.query_delay_ms / 1000
+
+    sync_session_factory = DBMemberConnection().session_factory
+    async_connection = AsyncDBMemberConnection()
+
+    def sync_read():
+        with sync_session_factory() as session:
+            query_human_members(session, args.name)
+            if delay_seconds:
+                session.execute(delay_sql, {"seconds": delay_seconds})
+
+    async def async_read():
+        async with async_connection.session() as session:
+            await query_human_members_async(session, args.name)
+            if delay_seconds:
+                await session.execute(delay_sql, {"seconds": delay_seconds})
+
+    stop = asyncio.Event()
+    lags: list[float] = []
+    query_count = 0
+
+    async def worker():
+        nonlocal query_count
+        while not stop.is_set():
+            if mode == "sync":
+                sync_read()
+            elif mode == "thread":
+                await asyncio.to_thread(sync_read)
+            else:
+                await async_read()
+            query_count += 1
+            # 同期方式でも他タスクに制御を戻す機会を与える
+            await asyncio.sleep(0)
+
+    ticker = asyncio.create_task(_ticker(stop, args.tick_ms / 1000, lags))
+    workers = [asyncio.create_task(worker()) for _ in range(args.concurrency)]
+
+    started = time.perf_counter()
+    await asyncio.sleep(args.duration)
+    stop.set()
+    await asyncio.gather(ticker, *workers)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "mode": mode,
+        "queries": query_count,
+        "qps": query_count / elapsed,
+        "lag_p50_ms": statistics.median(lags) if lags else 0.0,
+        "lag_p95_ms": _percentile(lags, 95),
+        "lag_p99_ms": _percentile(lags, 99),
+        "lag_max_ms": max(lags, default=0.0),
+    }
+
+
+async def _main(args) -> None:
+    results = []
+    for mode in args.modes:
+        print(f"⏱️  {mode}: 同時実行 {args.concurrency}, {args.duration}秒 計測中...")
+        results.append(await _run_mode(mode, args))
+
+    await dispose_async_engine()
+
+    print("\n=== イベントループ遅延ベンチマーク ===")
+    print(
+        f"{'mode':<8}{'queries':>10}{'qps':>10}"
+        f"{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'max(ms)':>10}"
+    )
+    for r in results:
+        print(
+            f"{r['mode']:<8}{r['queries']:>10}{r['qps']:>10.1f}"
+            f"{r['lag_p50_ms']:>10.2f}{r['lag_p95_ms']:>10.2f}"
+            f"{r['lag_p99_ms']:>10.2f}{r['lag_max_ms']:>10.2f}"
+        )
+    print("=====================================\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark event loop latency under DB reads")
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=["sync", "thread", "async"],
+        default=["sync", "thread", "async"],
+    )
+    parser.add_argument("--concurrency", type=int, default=20, help="同時実行する読み取り数")
+    parser.add_argument("--duration", type=float, default=10.0, help="方式ごとの計測秒数")
+    parser.add_argument("--tick-ms", type=float, default=10.0, help="ティッカーの間隔（ミリ秒）")
+    parser.add_argument(
+        "--query-delay-ms", type=float, default=0.0, help="クエリごとに追加する遅延（pg_sleep）"
+    )
+    parser.add_argument("--name", default="Syota", help="検索するメンバー名")
+    args = parser.parse_args()
+
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+会話履歴プロバイダー
+
+チャットログテーブル（session_id, message_key）に対する1回の範囲クエリで、
+チャンネル/スレッドの直近N件または直近T分のメッセージを取得します。
+Write-Behindバッファに滞留している未書き込みのメッセージも合わせて返すため、
+書き込み遅延があっても直近の会話が欠けません。
+"""
+
+import logging
+import time
+from typing import Any, Optional
+
+from db.connection.chat_log_connection import ChatLogConnection, timestamp_to_message_key
+from services.chat_log_writer import ChatLogWriter
+
+logger = logging.getLogger(__name__)
+
+
+class ChatHistoryProvider:
+    """チャットログから会話履歴を取得するプロバイダー"""
+
+    def __init__(
+        self,
+        connection: Optional[ChatLogConnection] = None,
+        writer: Optional[ChatLogWriter] = None,
+    ):
+        """
+        初期化
+
+        Args:
+            connection: チャットログDB接続（未指定の場合はwriterの接続、または新規作成）
+            writer: 未書き込みメッセージを参照するChatLogWriter（オプション）
+        """
+        self.writer = writer
+        self.connection = connection or (writer.connection if writer else ChatLogConnection())
+
+    def get_recent_messages(
+        self,
+        session_id: str,
+        limit: int = 20,
+        since_minutes: Optional[float] = None,
+        before_timestamp: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        セッションの直近メッセージを古い順で取得
+
+        Args:
+            session_id: セッションID（チャンネル/スレッドID）
+            limit: 取得する最大件数
+            since_minutes: 直近T分に限定する場合の分数（オプション）
+            before_timestamp: このエポックミリ秒より前のメッセージに限定（オプション）
+
+        Returns:
+            チャットログアイテムのリスト（古い順）
+
+        Raises:
+            Exception: クエリに失敗した場合
+        """
+        upper = before_timestamp if before_timestamp is not None else int(time.time() * 1000) + 1
+        lower = int(upper - since_minutes * 60 * 1000) if since_minutes is not None else 0
+
+        # ソートキーの範囲クエリを降順で1回だけ実行（最新からlimit件）
+        # メッセージIDのスノーフレークは時刻順のため、時刻の範囲をソートキーの範囲に変換する
+        response = self.connection.client.query(
+            TableName=self.connection.table_name,
+            KeyConditionExpression="session_id = :sid AND message_key BETWEEN :lower AND :upper",
+            ExpressionAttributeValues={
+                ":sid": {"S": session_id},
+                ":lower": {"N": str(timestamp_to_message_key(lower))},
+                ":upper": {"N": str(timestamp_to_message_key(upper) - 1)},
+            },
+            ScanIndexForward=False,
+            Limit=limit,
+        )
+        items = {}
+        for raw_item in response.get("Items", []):
+            item = self.connection.deserialize_item(raw_item)
+            item["timestamp"] = int(item["timestamp"])
+            item["message_key"] = int(item["message_key"])
+            items[item["message_key"]] = item
+
+        # Write-Behindバッファ内の未書き込みメッセージを補完（同じメッセージは1件にまとめる）
+        if self.writer is not None:
+            for item in self.writer.pending_items(session_id):
+                if lower <= item["timestamp"] < upper:
+                    items[item["message_key"]] = item
+
+        messages = [items[key] for key in sorted(items)][-limit:]
+
+        logger.debug(
+            f"📚 チャットログから履歴取得: session {session_id}, {len(messages)}件 "
+            f"(DB {len(response.get('Items', []))}件)"
+        )
+        return messages
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+チャットログ全文検索インデックス
+
+Bot会話ログをローカルのSQLite FTS5インデックスに増分登録し、キーワード・
+チャンネル・Bot・期間による検索を提供します。日本語は分かち書きされないため
+trigramトークナイザーを使用し、3文字以上の語はインデックスで、2文字以下の語は
+LIKEで照合します。
+
+Usage:
+    python src/services/chat_log_indexer.py search "キーワード" --channel 123 --since-minutes 60
+    python src/services/chat_log_indexer.py rebuild    # DynamoDBのチャットログから再構築
+    python src/services/chat_log_indexer.py stats
+"""
+
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ChatLogIndexer:
+    """チャットログのFTS5全文検索インデックス"""
+
+    DEFAULT_INDEX_PATH = "data/chat_log_index.sqlite3"
+
+    # trigramトークナイザーでインデックス照合できる最小文字数
+    MIN_TOKEN_LENGTH = 3
+
+    # スキーマのバージョン（PRAGMA user_version）。一意キーを変更した場合などに上げる
+    # 1: 一意キーを (session_id, timestamp) から (session_id, message_key) に変更
+    SCHEMA_VERSION = 1
+
+    def __init__(self, index_path: Optional[str] = None):
+        """
+        初期化（インデックスファイルとテーブルが無い場合は作成）
+
+        Args:
+            index_path: インデックスファイルのパス（未指定の場合は環境変数CHAT_LOG_INDEX_PATH）
+        """
+        self.index_path = index_path or os.getenv("CHAT_LOG_INDEX_PATH", self.DEFAULT_INDEX_PATH)
+        Path(self.index_path).parent.mkdir(parents=True, exist_ok=True)
+
+        # 書き込みはWrite-Behindのスレッド、検索は呼び出し元スレッドから行うためロックで直列化
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.index_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        """メッセージテーブル・FTS5仮想テーブル・同期用トリガーを作成
+
+        古いバージョンのインデックスは一意キーを変更できないため削除して作り直します
+        （インデックスはチャットログから再構築できるため、rebuild コマンドで復元します）。
+        """
+        with self._lock, self._conn:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            has_messages = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'messages'"
+            ).fetchone()
+            if version < self.SCHEMA_VERSION and has_messages:
+                logger.warning(
+                    "⚠️ チャットログインデックスのスキーマが古いため作り直します"
+                    "（過去のログは rebuild コマンドで再登録してください）"
+                )
+                self._conn.executescript(
+                    """
+                    DROP TRIGGER IF EXISTS messages_ai;
+                    DROP TRIGGER IF EXISTS messages_ad;
+                    DROP TRIGGER IF EXISTS messages_au;
+                    DROP TABLE IF EXISTS messages_fts;
+                    DROP TABLE IF EXISTS messages;
+                    """
+                )
+
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS messages (
+                    id INTEGER PRIMARY KEY,
+                    session_id TEXT NOT NULL,
+                    message_key INTEGER NOT NULL,
+                    timestamp INTEGER NOT NULL,
+                    message_id TEXT,
+                    channel_id TEXT,
+                    bot_name TEXT,
+                    author_id TEXT,
+                    author_name TEXT,
+                    is_bot INTEGER NOT NULL DEFAULT 0,
+                    mode TEXT,
+                    content TEXT NOT NULL DEFAULT '',
+                    UNIQUE (session_id, message_key)
+                );
+                CREATE INDEX IF NOT EXISTS idx_messages_timestamp ON messages (timestamp);
+                CREATE INDEX IF NOT EXISTS idx_messages_channel ON messages (channel_id, timestamp);
+                CREATE INDEX IF NOT EXISTS idx_messages_bot ON messages (bot_name, timestamp);
+
+                CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+                    content, content='messages', content_rowid='id', tokenize='trigram'
+                );
+
+                CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+                    INSERT INTO messages_fts (rowid, content) VALUES (new.id, new.content);
+                END;
+                CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+                    INSERT INTO messages_fts (messages_fts, rowid, content)
+                    VALUES ('delete', old.id, old.content);
+                END;
+                CREATE TRIGGER IF NOT EXISTS messages_au AFTER UPDATE OF content ON messages BEGIN
+                    INSERT INTO messages_fts (messages_fts, rowid, content)
+                    VALUES ('delete', old.id, old.content);
+                    INSERT INTO messages_fts (rowid, content) VALUES (new.id, new.content);
+                END;
+                """
+            )
+            self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def index_messages(self, items: list[dict[str, Any]]) -> int:
+        """
+        チャットログアイテムをインデックスに登録（同じメッセージ（session_id, message_key）は上書き）
+
+        ChatLogWriterのリスナーとして登録すると、書き込み成功分が増分登録されます。
+
+        Args:
+            items: チャットログアイテムのリスト
+
+        Returns:
+            登録件数
+        """
+        rows = [
+            (
+                str(item["session_id"]),
+                int(item["message_key"]),
+                int(item["timestamp"]),
+                item.get("message_id"),
+                item.get("channel_id", str(item["session_id"])),
+                item.get("bot_name"),
+                item.get("author_id"),
+                item.get("author_name"),
+                int(bool(item.get("is_bot", False))),
+                item.get("mode"),
+                item.get("content") or "",
+            )
+            for item in items
+        ]
+        if not rows:
+            return 0
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO messages (
+                    session_id, message_key, timestamp, message_id, channel_id, bot_name,
+                    author_id, author_name, is_bot, mode, content
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (session_id, message_key) DO UPDATE SET
+                    timestamp = excluded.timestamp,
+                    message_id = excluded.message_id,
+                    channel_id = excluded.channel_id,
+                    bot_name = excluded.bot_name,
+                    author_id = excluded.author_id,
+                    author_name = excluded.author_name,
+                    is_bot = excluded.is_bot,
+                    mode = excluded.mode,
+                    content = excluded.content
+                """,
+                rows,
+            )
+
+        logger.debug(f"🔎 チャットログインデックス登録: {len(rows)}件")
+        return len(rows)
+
+    def search(
+        self,
+        query: str = "",
+        channel_id: Optional[str] = None,
+        bot_name: Optional[str] = None,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        limit: int = 50,
+        order: str = "time",
+        match_any: bool = False,
+    ) -> list[dict[str, Any]]:
+        """
+        メッセージを検索
+
+        Args:
+            query: 空白区切りのキーワード（すべてを含むメッセージを検索、空の場合は条件のみ）
+            channel_id: チャンネル/スレッドIDで絞り込み（オプション）
+            bot_name: Bot名で絞り込み（オプション）
+            since: このエポックミリ秒以降に限定（オプション）
+            until: このエポックミリ秒より前に限定（オプション）
+            limit: 最大件数
+            order: 並び順（"time": 新しい順、"relevance": BM25スコア順）
+            match_any: Trueの場合は3文字以上のキーワードをOR条件で検索（関連度検索用）
+
+        Returns:
+            検索結果の辞書リスト（snippet にハイライト済み抜粋を含む）
+        """
+        terms = query.split()
+        match_terms = [t for t in terms if len(t) >= self.MIN_TOKEN_LENGTH]
+        like_terms = [t for t in terms if len(t) < self.MIN_TOKEN_LENGTH]
+
+        conditions: list[str] = []
+        params: list[Any] = []
+
+        if match_terms:
+            conditions.append("messages_fts MATCH ?")
+            operator = " OR " if match_any else " "
+            params.append(operator.join('"' + t.replace('"', '""') + '"' for t in match_terms))
+        for term in like_terms:
+            conditions.append("m.content LIKE ? ESCAPE '\\'")
+            escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        if channel_id is not None:
+            conditions.append("m.channel_id = ?")
+            params.append(str(channel_id))
+        if bot_name is not None:
+            conditions.append("m.bot_name = ?")
+            params.append(bot_name)
+        if since is not None:
+            conditions.append("m.timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("m.timestamp < ?")
+            params.append(until)
+
+        if match_terms:
+            select = (
+                "SELECT m.*, snippet(messages_fts, 0, '[', ']', '…', 16) AS snippet, "
+                "bm25(messages_fts) AS score "
+                "FROM messages_fts JOIN messages m ON m.id = messages_fts.rowid"
+            )
+            order_by = "score" if order == "relevance" else "m.timestamp DESC"
+        else:
+            select = "SELECT m.*, m.content AS snippet, 0.0 AS score FROM messages m"
+            order_by = "m.timestamp DESC"
+
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = f"{select}{where} ORDER BY {order_by} LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        return [dict(row) for row in rows]
+
+    def get_stats(self) -> dict[str, Any]:
+        """インデックスの統計情報を取得"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) AS messages, MIN(timestamp) AS oldest, MAX(timestamp) AS newest "
+                "FROM messages"
+            ).fetchone()
+        return {"index_path": self.index_path, **dict(row)}
+
+    def rebuild_from_chat_log(self, connection=None, page_size: int = 1000) -> int:
+        """
+        DynamoDBのチャットログ全体をスキャンしてインデックスを再構築（増分登録の取りこぼし補完用）
+
+        Args:
+            connection: チャットログDB接続（未指定の場合は新規作成）
+            page_size: 1回のスキャンで取得する件数
+
+        Returns:
+            登録件数
+        """
+        from db.connection.chat_log_connection import ChatLogConnection
+
+        connection = connection or ChatLogConnection()
+        paginator = connection.client.get_paginator("scan")
+
+        total = 0
+        for page in paginator.paginate(
+            TableName=connection.table_name, PaginationConfig={"PageSize": page_size}
+        ):
+            items = [connection.deserialize_item(item) for item in page.get("Items", [])]
+            total += self.index_messages(items)
+            logger.info(f"🔄 インデックス再構築中: {total}件")
+
+        return total
+
+    def close(self) -> None:
+        """インデックスを閉じる"""
+        with self._lock:
+            self._conn.close()
+
+
+def _to_epoch_ms(value: Optional[str]) -> Optional[int]:
+    """ISO形式の日時文字列をエポックミリ秒に変換"""
+    if value is None:
+        return None
+    return int(datetime.fromisoformat(value).timestamp() * 1000)
+
+
+def main():
+    """チャットログ検索CLI"""
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
+    parser = argparse.ArgumentParser(description="Search bot conversation logs")
+    parser.add_argument("--index-path", help="インデックスファイルのパス")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    search_parser = subparsers.add_parser("search", help="Search messages")
+    search_parser.add_argument("query", nargs="?", default="", help="空白区切りのキーワード")
+    search_parser.add_argument("--channel", help="チャンネル/スレッドID")
+    search_parser.add_argument("--bot", help="Bot名")
+    search_parser.add_argument("--since", help="開始日時（ISO形式）")
+    search_parser.add_argument("--until", help="終了日時（ISO形式）")
+    search_parser.add_argument("--since-minutes", type=float, help="直近T分に限定")
+    search_parser.add_argument("--limit", type=int, default=50)
+    search_parser.add_argument("--order", choices=["time", "relevance"], default="time")
+
+    subparsers.add_parser("rebuild", help="Rebuild index from the DynamoDB chat log")
+    subparsers.add_parser("stats", help="Show index statistics")
+
+    args = parser.parse_args()
+    indexer = ChatLogIndexer(args.index_path)
+
+    try:
+        if args.command == "search":
+            since = _to_epoch_ms(args.since)
+            if args.since_minutes is not None:
+                since = int((time.time() - args.since_minutes * 60) * 1000)
+
+            started = time.perf_counter()
+            results = indexer.search(
+                args.query,
+                channel_id=args.channel,
+                bot_name=args.bot,
+                since=since,
+                until=_to_epoch_ms(args.until),
+                limit=args.limit,
+                order=args.order,
+            )
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+            for result in results:
+                posted_at = datetime.fromtimestamp(result["timestamp"] / 1000)
+                print(
+                    f"[{posted_at:%Y-%m-%d %H:%M:%S}] #{result['channel_id']} "
+                    f"({result['bot_name']}) {result['author_name']}: {result['snippet']}"
+                )
+            print(f"\n{len(results)}件 ({elapsed_ms:.1f}ms)")
+
+        elif args.command == "rebuild":
+            total = indexer.rebuild_from_chat_log()
+            print(f"✅ インデックス再構築完了: {total}件")
+
+        elif args.command == "stats":
+            for key, value in indexer.get_stats().items():
+                print(f"{key}: {value}")
+
+    except Exception as e:
+        print(f"❌ エラーが発生しました: {e}")
+        sys.exit(1)
+    finally:
+        indexer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+チャットログ書き込みサービス（Write-Behind）
+
+Bot会話のメッセージをメモリ上のバッファに蓄積し、バックグラウンドスレッドから
+DynamoDBの BatchWriteItem（1リクエスト最大25件）でまとめて書き込みます。
+件数または経過時間のしきい値でフラッシュし、未処理アイテムは指数バックオフで
+再送、停止時には残りをすべてフラッシュします。
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any, Optional
+
+from db.connection.chat_log_connection import ChatLogConnection
+
+logger = logging.getLogger(__name__)
+
+
+class ChatLogWriter:
+    """チャットログのWrite-Behindバッファ"""
+
+    # DynamoDB BatchWriteItem の1リクエストあたりの上限件数
+    BATCH_WRITE_MAX_ITEMS = 25
+
+    def __init__(
+        self,
+        connection: Optional[ChatLogConnection] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_buffer_size: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        listeners: Optional[list[Callable[[list[dict[str, Any]]], None]]] = None,
+    ):
+        """
+        初期化（バックグラウンドのフラッシュスレッドを起動）
+
+        Args:
+            connection: チャットログDB接続（未指定の場合は新規作成）
+            batch_size: 件数しきい値（未指定の場合は環境変数CHAT_LOG_BATCH_SIZE、最大25）
+            flush_interval: 時間しきい値（秒、未指定の場合は環境変数CHAT_LOG_FLUSH_INTERVAL）
+            max_buffer_size: バッファ上限件数（未指定の場合は環境変数CHAT_LOG_MAX_BUFFER）
+            max_retries: 未処理アイテムの最大再送回数（未指定の場合は環境変数CHAT_LOG_MAX_RETRIES）
+            listeners: 書き込み成功したアイテムを受け取るコールバックのリスト
+        """
+        self.connection = connection or ChatLogConnection()
+        self.batch_size = min(
+            batch_size or int(os.getenv("CHAT_LOG_BATCH_SIZE", str(self.BATCH_WRITE_MAX_ITEMS))),
+            self.BATCH_WRITE_MAX_ITEMS,
+        )
+        self.flush_interval = flush_interval or float(os.getenv("CHAT_LOG_FLUSH_INTERVAL", "5"))
+        self.max_buffer_size = max_buffer_size or int(os.getenv("CHAT_LOG_MAX_BUFFER", "10000"))
+        self.max_retries = (
+            max_retries if max_retries is not None else int(os.getenv("CHAT_LOG_MAX_RETRIES", "5"))
+        )
+        self.listeners = list(listeners or [])
+
+        self._buffer: deque[dict[str, Any]] = deque()
+        self._inflight: dict[int, list[dict[str, Any]]] = {}
+        self._condition = threading.Condition()
+        self._closed = False
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "retried": 0,
+            "failed": 0,
+            "flushes": 0,
+        }
+
+        self._thread = threading.Thread(target=self._run, name="chat-log-writer", daemon=True)
+        self._thread.start()
+
+        logger.info(
+            f"📝 ChatLogWriter初期化完了: テーブル {self.connection.table_name}, "
+            f"バッチ {self.batch_size}件 / {self.flush_interval}秒, "
+            f"バッファ上限 {self.max_buffer_size}件"
+        )
+
+    def record(self, item: dict[str, Any]) -> bool:
+        """
+        チャットイベントをバッファに追加（ノンブロッキング）
+
+        Args:
+            item: session_id と message_key（メッセージIDのスノーフレーク）を含むアイテム
+
+        Returns:
+            バッファに追加できた場合はTrue、上限超過または停止済みで破棄した場合はFalse
+        """
+        with self._condition:
+            if self._closed or len(self._buffer) >= self.max_buffer_size:
+                self._stats["dropped"] += 1
+                if self._stats["dropped"] == 1 or self._stats["dropped"] % 1000 == 0:
+                    logger.warning(
+                        f"⚠️ チャットログを破棄しました（累計 {self._stats['dropped']}件）"
+                    )
+                return False
+
+            self._buffer.append(item)
+            self._stats["enqueued"] += 1
+
+            if len(self._buffer) >= self.batch_size:
+                self._condition.notify()
+
+        return True
+
+    def record_message(self, message, bot_name: str, mode: str) -> bool:
+        """
+        Discordメッセージをチャットログとして記録
+
+        Args:
+            message: Discordメッセージオブジェクト
+            bot_name: 記録するBot名
+            mode: チャンネルのモード（mention / auto_thread / times）
+
+        Returns:
+            バッファに追加できた場合はTrue
+        """
+        item = {
+            "session_id": str(message.channel.id),
+            "message_key": int(message.id),
+            "timestamp": int(message.created_at.timestamp() * 1000),
+            "message_id": str(message.id),
+            "channel_id": str(message.channel.id),
+            "guild_id": str(message.guild.id) if message.guild else None,
+            "author_id": str(message.author.id),
+            "author_name": message.author.display_name,
+            "is_bot": bool(message.author.bot),
+            "bot_name": bot_name,
+            "mode": mode,
+            "message_type": message.type.name,
+            "content": message.content,
+        }
+        return self.record(item)
+
+    def pending_items(self, session_id: str) -> list[dict[str, Any]]:
+        """
+        未書き込み（バッファ内・書き込み中）のアイテムのうち指定セッションのものを取得
+
+        Args:
+            session_id: セッションID
+
+        Returns:
+            バッファ内のアイテムのリスト（追加順）
+        """
+        with self._condition:
+            inflight = [item for batch in self._inflight.values() for item in batch]
+            return [item for item in [*inflight, *self._buffer] if item["session_id"] == session_id]
+
+    def flush(self) -> None:
+        """バッファ内のアイテムを呼び出し元スレッドで全て書き込む"""
+        while True:
+            with self._condition:
+                items = self._take_batch()
+            if not items:
+                return
+            self._write_batch(items)
+
+    def close(self, timeout: float = 30.0) -> None:
+        """
+        停止処理（受付を停止し、残りのアイテムをフラッシュ）
+
+        Args:
+            timeout: フラッシュスレッドの終了待ち時間（秒）
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+
+        self._thread.join(timeout=timeout)
+        logger.info(f"🛑 ChatLogWriter停止: {self.get_stats()}")
+
+    def get_stats(self) -> dict[str, int]:
+        """書き込み統計（件数カウンタとバッファ滞留件数）を取得"""
+        with self._condition:
+            return {**self._stats, "buffered": len(self._buffer)}
+
+    def _run(self) -> None:
+        """フラッシュスレッド本体（件数または時間のしきい値でフラッシュ）"""
+        while True:
+            with self._condition:
+                if not self._closed and len(self._buffer) < self.batch_size:
+                    self._condition.wait(timeout=self.flush_interval)
+                if self._closed and not self._buffer:
+                    return
+                items = self._take_batch()
+
+            if items:
+                try:
+                    self._write_batch(items)
+                except Exception as e:
+                    logger.error(f"❌ チャットログ書き込みエラー: {e}", exc_info=True)
+
+    def _take_batch(self) -> list[dict[str, Any]]:
+        """バッファから最大batch_size件を取り出す（呼び出し元でロック取得済みであること）"""
+        count = min(len(self._buffer), self.batch_size)
+        items = [self._buffer.popleft() for _ in range(count)]
+        if items:
+            self._inflight[id(items)] = items
+        return items
+
+    def _write_batch(self, items: list[dict[str, Any]]) -> None:
+        """
+        アイテムを書き込み、書き込み成功分をリスナーに通知
+
+        Args:
+            items: 書き込むアイテム（最大25件）
+        """
+        try:
+            written, failed_count = self._batch_write_with_retry(items)
+        finally:
+            with self._condition:
+                self._inflight.pop(id(items), None)
+
+        with self._condition:
+            self._stats["flushes"] += 1
+            self._stats["written"] += len(written)
+            self._stats["failed"] += failed_count
+
+        if failed_count:
+            logger.error(f"❌ チャットログ {failed_count}件の書き込みに失敗しました")
+
+        if not written:
+            return
+
+        for listener in self.listeners:
+            try:
+                listener(written)
+            except Exception as e:
+                logger.error(f"❌ チャットログリスナーエラー: {e}", exc_info=True)
+
+    def _batch_write_with_retry(
+        self, items: list[dict[str, Any]]
+    ) -> tuple[list[dict[str, Any]], int]:
+        """
+        BatchWriteItemで書き込み、未処理アイテムは指数バックオフで再送
+
+        Args:
+            items: 書き込むアイテム（最大25件）
+
+        Returns:
+            (書き込み成功したアイテムのリスト, 失敗件数) のタプル
+        """
+        # 同一リクエスト内のキー重複はBatchWriteItemがエラーにするため、後勝ちで除外
+        unique_items = {(i["session_id"], i["message_key"]): i for i in items}
+        table_name = self.connection.table_name
+        requests = [
+            {"PutRequest": {"Item": self.connection.serialize_item(item)}}
+            for item in unique_items.values()
+        ]
+
+        attempt = 0
+        while requests:
+            try:
+                response = self.connection.client.batch_write_item(
+                    RequestItems={table_name: requests}
+                )
+                requests = response.get("UnprocessedItems", {}).get(table_name, [])
+            except Exception as e:
+                logger.warning(f"⚠️ BatchWriteItem失敗 ({attempt + 1}回目): {e}")
+
+            if not requests or attempt >= self.max_retries:
+                break
+
+            attempt += 1
+            with self._condition:
+                self._stats["retried"] += len(requests)
+            time.sleep(min(0.05 * (2**attempt), 5.0))
+
+        failed_keys = set()
+        for request in requests:
+            item = self.connection.deserialize_item(request["PutRequest"]["Item"])
+            failed_keys.add((item["session_id"], int(item["message_key"])))
+
+        written = [item for key, item in unique_items.items() if key not in failed_keys]
+        return written, len(failed_keys)
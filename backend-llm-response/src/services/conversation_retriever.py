@@ -0,0 +1,199 @@
+"""
+過去会話の検索拡張（RAG）
+
+チャットログの全文検索インデックス（SQLite FTS5 / BM25）から、現在の発言に
+関連する過去の発言を上位k件取得し、トークン予算内に収まるようにプロンプト用の
+コンテキストへ整形します。CPUのみ・ネットワーク不要で動作します。
+"""
+
+import logging
+import os
+import re
+from datetime import datetime
+from typing import Any, Optional
+
+from services.chat_log_indexer import ChatLogIndexer
+
+logger = logging.getLogger(__name__)
+
+# 英数字の語、または日本語（ひらがな・カタカナ・漢字）の連続
+TERM_PATTERN = re.compile(r"[0-9A-Za-z_]+|[぀-ヿ㐀-鿿ｦ-ﾟ]+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    トークン数を概算（ASCIIは4文字で1トークン、それ以外は1文字1トークン）
+
+    Args:
+        text: 対象文字列
+
+    Returns:
+        概算トークン数
+    """
+    ascii_count = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_count + 3) // 4 + (len(text) - ascii_count)
+
+
+class ConversationRetriever:
+    """過去会話から関連発言を取得するリトリーバー"""
+
+    # 1回の検索に使用する最大キーワード数（長文でクエリが肥大化しないよう制限）
+    MAX_QUERY_TERMS = 32
+
+    def __init__(
+        self,
+        indexer: ChatLogIndexer,
+        top_k: Optional[int] = None,
+        token_budget: Optional[int] = None,
+        max_snippet_chars: int = 300,
+        scope: Optional[str] = None,
+    ):
+        """
+        初期化
+
+        Args:
+            indexer: チャットログ全文検索インデックス
+            top_k: 取得する関連発言の最大件数（未指定の場合は環境変数CHAT_RAG_TOP_K）
+            token_budget: コンテキストのトークン予算（未指定の場合は環境変数CHAT_RAG_TOKEN_BUDGET）
+            max_snippet_chars: 1発言あたりの最大文字数
+            scope: 検索範囲（"channel": 同一チャンネル、"bot": 同一Botの全チャンネル）
+        """
+        self.indexer = indexer
+        self.top_k = top_k or int(os.getenv("CHAT_RAG_TOP_K", "5"))
+        self.token_budget = token_budget or int(os.getenv("CHAT_RAG_TOKEN_BUDGET", "800"))
+        self.max_snippet_chars = max_snippet_chars
+        self.scope = scope or os.getenv("CHAT_RAG_SCOPE", "channel")
+
+    def build_terms(self, text: str) -> list[str]:
+        """
+        検索キーワードを抽出（英数字は3文字以上の語、日本語は3文字ずつのtrigram）
+
+        Args:
+            text: 現在の発言
+
+        Returns:
+            重複を除いたキーワードのリスト（最大MAX_QUERY_TERMS件）
+        """
+        terms: dict[str, None] = {}
+        for token in TERM_PATTERN.findall(text):
+            if token.isascii():
+                if len(token) >= ChatLogIndexer.MIN_TOKEN_LENGTH:
+                    terms[token.lower()] = None
+            elif len(token) <= ChatLogIndexer.MIN_TOKEN_LENGTH:
+                terms[token] = None
+            else:
+                for i in range(len(token) - ChatLogIndexer.MIN_TOKEN_LENGTH + 1):
+                    terms[token[i : i + ChatLogIndexer.MIN_TOKEN_LENGTH]] = None
+
+            if len(terms) >= self.MAX_QUERY_TERMS:
+                break
+
+        return [t for t in terms if len(t) >= ChatLogIndexer.MIN_TOKEN_LENGTH][
+            : self.MAX_QUERY_TERMS
+        ]
+
+    def retrieve(
+        self,
+        text: str,
+        channel_id: str,
+        bot_name: str,
+        before_timestamp: Optional[int] = None,
+        exclude_text: str = "",
+    ) -> list[dict[str, Any]]:
+        """
+        現在の発言に関連する過去の発言をBM25スコア順に取得
+
+        Args:
+            text: 現在の発言
+            channel_id: チャンネルID（scopeが"channel"の場合の絞り込み）
+            bot_name: Bot名
+            before_timestamp: このエポックミリ秒より前の発言に限定（オプション）
+            exclude_text: 既にプロンプトに含まれる会話（本文が含まれる発言は除外）
+
+        Returns:
+            関連発言のリスト（関連度順、最大top_k件）
+        """
+        terms = self.build_terms(text)
+        if not terms:
+            return []
+
+        # 直近の会話と重複する分を除外しても top_k 件残るよう多めに取得
+        results = self.indexer.search(
+            " ".join(terms),
+            channel_id=channel_id if self.scope == "channel" else None,
+            bot_name=bot_name,
+            until=before_timestamp,
+            limit=self.top_k * 4,
+            order="relevance",
+            match_any=True,
+        )
+
+        snippets = []
+        seen_contents = set()
+        for result in results:
+            content = (result.get("content") or "").strip()
+            if not content or content in seen_contents or content in exclude_text:
+                continue
+            seen_contents.add(content)
+            snippets.append(result)
+            if len(snippets) >= self.top_k:
+                break
+
+        return snippets
+
+    def format_context(self, snippets: list[dict[str, Any]]) -> str:
+        """
+        関連発言をトークン予算内でプロンプト用に整形（古い順）
+
+        Args:
+            snippets: 関連度順の関連発言のリスト
+
+        Returns:
+            コンテキスト文字列（該当なしの場合は空文字列）
+        """
+        selected = []
+        used_tokens = 0
+        for snippet in snippets:
+            content = snippet["content"].strip()
+            if len(content) > self.max_snippet_chars:
+                content = content[: self.max_snippet_chars] + "…"
+
+            posted_at = datetime.fromtimestamp(snippet["timestamp"] / 1000)
+            line = f"({posted_at:%Y-%m-%d %H:%M}) {snippet['author_name']}: {content}"
+            line_tokens = estimate_tokens(line)
+            if used_tokens + line_tokens > self.token_budget:
+                continue
+
+            selected.append((snippet["timestamp"], line))
+            used_tokens += line_tokens
+
+        if not selected:
+            return ""
+
+        lines = [line for _, line in sorted(selected)]
+        logger.debug(f"🔍 関連する過去の会話: {len(lines)}件 (約{used_tokens}トークン)")
+        return "\n".join(lines)
+
+    def build_context(
+        self,
+        text: str,
+        channel_id: str,
+        bot_name: str,
+        before_timestamp: Optional[int] = None,
+        exclude_text: str = "",
+    ) -> str:
+        """
+        関連発言を取得してコンテキスト文字列を作成
+
+        Args:
+            text: 現在の発言
+            channel_id: チャンネルID
+            bot_name: Bot名
+            before_timestamp: このエポックミリ秒より前の発言に限定（オプション）
+            exclude_text: 既にプロンプトに含まれる会話
+
+        Returns:
+            コンテキスト文字列（該当なしの場合は空文字列）
+        """
+        snippets = self.retrieve(text, channel_id, bot_name, before_timestamp, exclude_text)
+        return self.format_context(snippets)
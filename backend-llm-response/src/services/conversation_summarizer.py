@@ -0,0 +1,261 @@
+"""
+会話要約サービス
+
+Botごとに (チャンネル, ユーザー) 単位の会話要約をSQLiteに永続化し、
+応答後のやり取りを未反映分として蓄積してバックグラウンドでまとめて要約に
+反映します。プロンプトには直近の短い履歴と要約のみを含めることで、
+長い履歴の再送を避けます。
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from services.llm_client import LLMClient
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_SYSTEM_PROMPT = (
+    "あなたは会話の記録係です。これまでの要約と新しいやり取りをもとに、"
+    "ユーザーについて今後の会話で役立つ情報（話題、好み、依頼中の事項、決まったこと）を"
+    "箇条書きで簡潔にまとめ直してください。挨拶や重複は省き、要約のみを出力してください。"
+)
+
+
+class ConversationSummarizer:
+    """(Bot, チャンネル, ユーザー) 単位のローリング要約"""
+
+    DEFAULT_DB_PATH = "data/conversation_summaries.sqlite3"
+
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        db_path: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        max_pending_seconds: Optional[float] = None,
+        max_age_hours: Optional[float] = None,
+        max_summary_chars: Optional[int] = None,
+    ):
+        """
+        初期化（要約DBとテーブルが無い場合は作成）
+
+        Args:
+            llm_client: 要約生成に使用するLLMクライアント
+            db_path: 要約DBのパス（未指定の場合は環境変数CHAT_SUMMARY_DB_PATH）
+            batch_size: 要約に反映するやり取りの件数しきい値（未指定の場合は環境変数CHAT_SUMMARY_BATCH_SIZE）
+            max_pending_seconds: 未反映のやり取りを保持する最大秒数（未指定の場合は環境変数CHAT_SUMMARY_MAX_PENDING_SECONDS）
+            max_age_hours: 要約の有効期間（時間、未指定の場合は環境変数CHAT_SUMMARY_MAX_AGE_HOURS）
+            max_summary_chars: 要約の最大文字数（未指定の場合は環境変数CHAT_SUMMARY_MAX_CHARS）
+        """
+        self.llm_client = llm_client
+        self.db_path = db_path or os.getenv("CHAT_SUMMARY_DB_PATH", self.DEFAULT_DB_PATH)
+        self.batch_size = batch_size or int(os.getenv("CHAT_SUMMARY_BATCH_SIZE", "3"))
+        self.max_pending_seconds = max_pending_seconds or float(
+            os.getenv("CHAT_SUMMARY_MAX_PENDING_SECONDS", "300")
+        )
+        self.max_age_hours = max_age_hours or float(os.getenv("CHAT_SUMMARY_MAX_AGE_HOURS", "168"))
+        self.max_summary_chars = max_summary_chars or int(
+            os.getenv("CHAT_SUMMARY_MAX_CHARS", "800")
+        )
+
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        """要約テーブルと未反映やり取りテーブルを作成"""
+        with self._lock, self._conn:
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS summaries (
+                    bot_name TEXT NOT NULL,
+                    channel_id TEXT NOT NULL,
+                    user_id TEXT NOT NULL,
+                    summary TEXT NOT NULL,
+                    exchange_count INTEGER NOT NULL DEFAULT 0,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (bot_name, channel_id, user_id)
+                );
+                CREATE TABLE IF NOT EXISTS pending_exchanges (
+                    id INTEGER PRIMARY KEY,
+                    bot_name TEXT NOT NULL,
+                    channel_id TEXT NOT NULL,
+                    user_id TEXT NOT NULL,
+                    user_name TEXT NOT NULL,
+                    user_message TEXT NOT NULL,
+                    bot_response TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_pending_key
+                    ON pending_exchanges (bot_name, channel_id, user_id, id);
+                """
+            )
+
+    def get_summary(self, bot_name: str, channel_id: str, user_id: str) -> Optional[str]:
+        """
+        有効期間内の要約を取得
+
+        Args:
+            bot_name: Bot名
+            channel_id: チャンネルID
+            user_id: ユーザーID
+
+        Returns:
+            要約文字列（未作成または有効期間切れの場合はNone）
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary, updated_at FROM summaries "
+                "WHERE bot_name = ? AND channel_id = ? AND user_id = ?",
+                (bot_name, channel_id, user_id),
+            ).fetchone()
+
+        if row is None or self._is_stale(row["updated_at"]):
+            return None
+        return row["summary"]
+
+    def record_exchange(
+        self,
+        bot_name: str,
+        channel_id: str,
+        user_id: str,
+        user_name: str,
+        user_message: str,
+        bot_response: str,
+    ) -> None:
+        """
+        やり取りを未反映分として記録（要約への反映はupdate_pendingで行う）
+
+        Args:
+            bot_name: Bot名
+            channel_id: チャンネルID
+            user_id: ユーザーID
+            user_name: ユーザー表示名
+            user_message: ユーザーの発言
+            bot_response: Botの応答
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO pending_exchanges "
+                "(bot_name, channel_id, user_id, user_name, user_message, bot_response, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (bot_name, channel_id, user_id, user_name, user_message, bot_response, time.time()),
+            )
+
+    def update_pending(self) -> int:
+        """
+        件数しきい値または保持時間を超えた未反映のやり取りを要約に反映
+
+        Returns:
+            更新した要約の件数
+        """
+        with self._lock:
+            keys = self._conn.execute(
+                "SELECT bot_name, channel_id, user_id, COUNT(*) AS count, "
+                "MIN(created_at) AS oldest FROM pending_exchanges "
+                "GROUP BY bot_name, channel_id, user_id"
+            ).fetchall()
+
+        now = time.time()
+        updated = 0
+        for key in keys:
+            if key["count"] < self.batch_size and now - key["oldest"] < self.max_pending_seconds:
+                continue
+            try:
+                self._update_summary(key["bot_name"], key["channel_id"], key["user_id"])
+                updated += 1
+            except Exception as e:
+                # 未反映分は残し、次回の更新で再試行
+                logger.error(f"❌ 会話要約の更新に失敗しました: {e}", exc_info=True)
+
+        return updated
+
+    def _update_summary(self, bot_name: str, channel_id: str, user_id: str) -> None:
+        """
+        1件の (Bot, チャンネル, ユーザー) について未反映のやり取りを要約に反映
+
+        Args:
+            bot_name: Bot名
+            channel_id: チャンネルID
+            user_id: ユーザーID
+        """
+        with self._lock:
+            exchanges = self._conn.execute(
+                "SELECT id, user_name, user_message, bot_response FROM pending_exchanges "
+                "WHERE bot_name = ? AND channel_id = ? AND user_id = ? ORDER BY id",
+                (bot_name, channel_id, user_id),
+            ).fetchall()
+            row = self._conn.execute(
+                "SELECT summary, exchange_count, updated_at FROM summaries "
+                "WHERE bot_name = ? AND channel_id = ? AND user_id = ?",
+                (bot_name, channel_id, user_id),
+            ).fetchone()
+
+        if not exchanges:
+            return
+
+        # 有効期間切れの要約は引き継がずに作り直す
+        previous = "" if row is None or self._is_stale(row["updated_at"]) else row["summary"]
+        exchange_count = 0 if not previous else row["exchange_count"]
+
+        lines = []
+        for exchange in exchanges:
+            lines.append(f"{exchange['user_name']}: {exchange['user_message']}")
+            lines.append(f"{bot_name}: {exchange['bot_response']}")
+
+        prompt = (
+            f"## これまでの要約\n{previous or '（なし）'}\n\n"
+            f"## 新しいやり取り\n" + "\n".join(lines) + "\n\n"
+            f"{self.max_summary_chars}文字以内で要約を更新してください。"
+        )
+        summary = self.llm_client.send_message(
+            prompt=prompt,
+            system_prompt=SUMMARY_SYSTEM_PROMPT,
+            temperature=0.0,
+            usage_tags={"bot": bot_name, "channel": channel_id, "mode": "summary"},
+        ).strip()[: self.max_summary_chars]
+
+        last_id = exchanges[-1]["id"]
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO summaries "
+                "(bot_name, channel_id, user_id, summary, exchange_count, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (bot_name, channel_id, user_id) DO UPDATE SET "
+                "summary = excluded.summary, exchange_count = excluded.exchange_count, "
+                "updated_at = excluded.updated_at",
+                (
+                    bot_name,
+                    channel_id,
+                    user_id,
+                    summary,
+                    exchange_count + len(exchanges),
+                    time.time(),
+                ),
+            )
+            self._conn.execute(
+                "DELETE FROM pending_exchanges "
+                "WHERE bot_name = ? AND channel_id = ? AND user_id = ? AND id <= ?",
+                (bot_name, channel_id, user_id, last_id),
+            )
+
+        logger.info(
+            f"🧾 会話要約更新: {bot_name} / channel {channel_id} / user {user_id} "
+            f"(+{len(exchanges)}件, {len(summary)}文字)"
+        )
+
+    def _is_stale(self, updated_at: float) -> bool:
+        """要約が有効期間を過ぎているか"""
+        return time.time() - updated_at > self.max_age_hours * 3600
+
+    def close(self) -> None:
+        """要約DBを閉じる"""
+        with self._lock:
+            self._conn.close()
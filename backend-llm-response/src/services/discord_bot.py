@@ -6,10 +6,21 @@ Discord Bot本体
 カスタムプロンプト対応
 """
 
+import asyncio
 import logging
+import os
+from typing import Optional
 
 import discord
+from services.chat_history_provider import ChatHistoryProvider
+from services.chat_log_indexer import ChatLogIndexer
+from services.chat_log_writer import ChatLogWriter
+from services.conversation_retriever import ConversationRetriever
+from services.conversation_summarizer import ConversationSummarizer
 from services.llm_client import LLMClient
+from services.loop_monitor import EventLoopMonitor
+from services.model_router import ModelRouter
+from services.resource_monitor import log_resource_usage
 from services.times_scheduler import TimesScheduler
 
 from config.prompt import PromptParser
@@ -29,6 +40,16 @@ class DiscordBot:
         times_channels: list[int],
         times_test_mode: bool = False,
         times_test_interval: int = 60,
+        chat_log_enabled: bool = False,
+        chat_log_index_enabled: bool = False,
+        chat_rag_enabled: bool = False,
+        chat_summary_enabled: bool = False,
+        model_routing_enabled: bool = False,
+        sharding_enabled: bool = False,
+        shard_count: Optional[int] = None,
+        shard_ids: Optional[list[int]] = None,
+        lean_mode: bool = False,
+        loop_monitor_enabled: bool = False,
     ):
         """
         初期化
@@ -41,6 +62,19 @@ class DiscordBot:
             times_channels: Times Mode（1日1回自動投稿）チャンネルIDのリスト
             times_test_mode: Times Modeテストモード（True: 短いインターバル、False: 1日1回）
             times_test_interval: テストモード時のインターバル秒数（デフォルト: 60秒）
+            chat_log_enabled: 会話をチャットログ（DynamoDB）に記録するか
+            chat_log_index_enabled: チャットログを全文検索インデックスに増分登録するか
+            chat_rag_enabled: 関連する過去の会話をインデックスから検索してプロンプトに含めるか
+            chat_summary_enabled: AutoThreadモードでユーザーごとの会話要約を使用するか
+            model_routing_enabled: 仮想メンバーのプロフィールに従ってモデルを選択するか
+            sharding_enabled: ゲートウェイをシャード分割して接続するか（AutoShardedClient）
+            shard_count: 総シャード数（未指定の場合はDiscordの推奨値）
+            shard_ids: このプロセスで担当するシャードIDのリスト（未指定の場合は全シャード）
+            lean_mode: Intentsとキャッシュを最小限にしてメモリ使用量を抑えるか
+            loop_monitor_enabled: イベントループの遅延とブロッキング処理を監視するか
+
+        Raises:
+            ValueError: shard_ids を指定して shard_count を指定しなかった場合
         """
         self.bot_name = bot_name
         self.bot_token = bot_token
@@ -51,15 +85,67 @@ class DiscordBot:
         # システムプロンプトの読み込み
         self.system_prompt = PromptParser.get_prompt(bot_name, source="file")
 
-        # Intents設定（Message Content Intent必須）
-        intents = discord.Intents.default()
-        intents.message_content = True
-        intents.guilds = True
-        intents.messages = True
-
-        self.client = discord.Client(intents=intents)
+        # Intents・キャッシュ設定（Message Content Intent必須）
+        self.lean_mode = lean_mode
+        if lean_mode:
+            intents, client_options = self._lean_client_settings()
+        else:
+            intents = discord.Intents.default()
+            intents.message_content = True
+            intents.guilds = True
+            intents.messages = True
+            client_options = {}
+
+        self.client = self._create_client(
+            intents, client_options, sharding_enabled, shard_count, shard_ids
+        )
+        self.resource_report_interval = float(os.getenv("RESOURCE_REPORT_INTERVAL", "300"))
+        self._resource_report_task: Optional[asyncio.Task] = None
+
+        # イベントループ監視（診断用、ブロッキング処理のスタックを捕捉）
+        self.loop_monitor = EventLoopMonitor() if loop_monitor_enabled else None
+        self.loop_monitor_report_interval = float(os.getenv("LOOP_MONITOR_REPORT_INTERVAL", "300"))
+        self._loop_monitor_report_task: Optional[asyncio.Task] = None
+        self.shard_latency_report_interval = float(
+            os.getenv("DISCORD_SHARD_LATENCY_REPORT_INTERVAL", "300")
+        )
+        self._shard_latency_task: Optional[asyncio.Task] = None
         self.llm_client = LLMClient()
 
+        # モデルルーティング（無効時はLLMClientのデフォルトモデルを使用）
+        self.model_router = ModelRouter(self.llm_client) if model_routing_enabled else None
+
+        # チャットログ（Write-Behindでまとめて書き込み）
+        self.chat_log_writer = self._create_chat_log_writer() if chat_log_enabled else None
+
+        # 全文検索インデックス（書き込み成功したチャットログを増分登録）
+        self.chat_log_indexer = None
+        if self.chat_log_writer is not None and chat_log_index_enabled:
+            self.chat_log_indexer = ChatLogIndexer()
+            self.chat_log_writer.listeners.append(self.chat_log_indexer.index_messages)
+
+        # 過去会話の検索拡張（インデックスが有効な場合のみ）
+        self.conversation_retriever = (
+            ConversationRetriever(self.chat_log_indexer)
+            if self.chat_log_indexer is not None and chat_rag_enabled
+            else None
+        )
+
+        # 会話履歴プロバイダー（チャットログの範囲クエリ、Discord APIはフォールバック）
+        self.chat_history_provider = (
+            ChatHistoryProvider(writer=self.chat_log_writer) if self.chat_log_writer else None
+        )
+        window_minutes = os.getenv("CHAT_HISTORY_WINDOW_MINUTES")
+        self.chat_history_window_minutes = float(window_minutes) if window_minutes else None
+
+        # 会話要約（有効時は履歴を短い直近分に絞り、それ以前は要約で補う）
+        self.conversation_summarizer = (
+            ConversationSummarizer(self.llm_client) if chat_summary_enabled else None
+        )
+        self.summary_history_limit = int(os.getenv("CHAT_SUMMARY_HISTORY_LIMIT", "6"))
+        self.summary_update_interval = float(os.getenv("CHAT_SUMMARY_UPDATE_INTERVAL", "30"))
+        self._summary_task: Optional[asyncio.Task] = None
+
         # Times Mode スケジューラー初期化
         self.times_scheduler = TimesScheduler(
             bot_name=self.bot_name,
@@ -73,6 +159,157 @@ class DiscordBot:
         # イベントハンドラー登録
         self._setup_events()
 
+    @staticmethod
+    def _lean_client_settings() -> tuple[discord.Intents, dict]:
+        """
+        省メモリ構成のIntentsとクライアント設定を作成
+
+        サーバーのテキストチャンネルのメッセージ受信に必要なIntentsのみ有効化し、
+        メンバーキャッシュ・起動時のメンバー取得を無効化、メッセージキャッシュを
+        DISCORD_MAX_MESSAGES 件（デフォルト0: 無効）に制限します。
+
+        Returns:
+            (Intents, discord.Clientに渡す追加のキーワード引数)
+        """
+        intents = discord.Intents.none()
+        intents.guilds = True  # チャンネル解決（get_channel）に必要
+        intents.guild_messages = True
+        intents.message_content = True
+
+        max_messages = int(os.getenv("DISCORD_MAX_MESSAGES", "0"))
+        client_options = {
+            "member_cache_flags": discord.MemberCacheFlags.none(),
+            "chunk_guilds_at_startup": False,
+            "max_messages": max_messages or None,
+        }
+        return intents, client_options
+
+    def _create_client(
+        self,
+        intents: discord.Intents,
+        client_options: dict,
+        sharding_enabled: bool,
+        shard_count: Optional[int],
+        shard_ids: Optional[list[int]],
+    ) -> discord.Client:
+        """
+        Discordクライアントを作成（シャーディング有効時はAutoShardedClient）
+
+        Args:
+            intents: Intents設定
+            client_options: discord.Clientに渡す追加のキーワード引数（キャッシュ設定等）
+            sharding_enabled: シャード分割して接続するか
+            shard_count: 総シャード数（未指定の場合はDiscordの推奨値）
+            shard_ids: このプロセスで担当するシャードIDのリスト
+
+        Returns:
+            Discordクライアント
+
+        Raises:
+            ValueError: shard_ids を指定して shard_count を指定しなかった場合
+        """
+        if not sharding_enabled:
+            return discord.Client(intents=intents, **client_options)
+
+        if shard_ids and shard_count is None:
+            raise ValueError("DISCORD_SHARD_IDS を指定する場合は DISCORD_SHARD_COUNT も必要です")
+        if shard_ids and any(shard_id >= shard_count for shard_id in shard_ids):
+            raise ValueError(
+                f"シャードIDは DISCORD_SHARD_COUNT ({shard_count}) 未満である必要があります: "
+                f"{shard_ids}"
+            )
+
+        logger.info(
+            f"🧩 シャーディング有効: シャード数 {shard_count or '自動'}, "
+            f"担当シャード {shard_ids or '全て'}"
+        )
+        return discord.AutoShardedClient(
+            intents=intents, shard_count=shard_count, shard_ids=shard_ids or None, **client_options
+        )
+
+    def get_shard_latencies(self) -> dict[int, float]:
+        """
+        シャードごとのゲートウェイレイテンシ（秒）を取得
+
+        Returns:
+            シャードIDをキーとするレイテンシの辞書（非シャード時はシャード0のみ）
+        """
+        if isinstance(self.client, discord.AutoShardedClient):
+            return dict(self.client.latencies)
+        return {0: self.client.latency}
+
+    async def _run_shard_latency_reports(self):
+        """シャードごとのレイテンシを一定間隔でログ出力"""
+        while not self.client.is_closed():
+            await asyncio.sleep(self.shard_latency_report_interval)
+            latencies = ", ".join(
+                f"#{shard_id}: {latency * 1000:.0f}ms"
+                for shard_id, latency in sorted(self.get_shard_latencies().items())
+                if latency == latency  # 未接続のシャード（nan）は除外
+            )
+            logger.info(f"📶 シャードレイテンシ ({self.bot_name}): {latencies or '未接続'}")
+
+    async def _run_resource_reports(self):
+        """RSS・キャッシュ件数を一定間隔でログ出力"""
+        while not self.client.is_closed():
+            log_resource_usage(self.bot_name, self.client)
+            await asyncio.sleep(self.resource_report_interval)
+
+    async def _run_loop_monitor_reports(self):
+        """イベントループ遅延の統計とワーストの処理を一定間隔でログ出力"""
+        while not self.client.is_closed():
+            await asyncio.sleep(self.loop_monitor_report_interval)
+            self.loop_monitor.log_report()
+
+    def _create_chat_log_writer(self) -> ChatLogWriter:
+        """チャットログライターを作成（テーブルが無い場合は作成）"""
+        writer = ChatLogWriter()
+        try:
+            writer.connection.ensure_table()
+        except Exception as e:
+            logger.error(f"❌ チャットログテーブルの確認に失敗しました: {e}", exc_info=True)
+        return writer
+
+    def _should_record_message(self, message, mode: str) -> bool:
+        """
+        メッセージをこのBotのチャットログとして記録するか判定
+
+        Bot自身の投稿と、このBotが応答する投稿（Mentionモードでは自分へのメンション、
+        AutoThreadモードでは他のBot以外の投稿）のみを記録します。
+
+        Args:
+            message: Discordメッセージオブジェクト
+            mode: チャンネルのモード（mention / auto_thread / times）
+
+        Returns:
+            記録する場合はTrue
+        """
+        if message.author == self.client.user:
+            return True
+        if message.author.bot:
+            return False
+        if mode == "mention":
+            return self.client.user in message.mentions
+        return mode == "auto_thread"
+
+    def _get_channel_mode(self, channel_id: int) -> Optional[str]:
+        """
+        チャンネルIDから対象モードを判定
+
+        Args:
+            channel_id: チャンネルID
+
+        Returns:
+            "mention" / "auto_thread" / "times"、対象外の場合はNone
+        """
+        if channel_id in self.mention_mode_channels:
+            return "mention"
+        if channel_id in self.auto_thread_mode_channels:
+            return "auto_thread"
+        if channel_id in self.times_mode_channels:
+            return "times"
+        return None
+
     def _setup_events(self):
         """イベントハンドラーをセットアップ"""
 
@@ -96,21 +333,64 @@ class DiscordBot:
             # Times Mode スケジューラー起動
             self.times_scheduler.start()
 
+            # シャードごとのレイテンシ定期出力（シャーディング有効時のみ）
+            if isinstance(self.client, discord.AutoShardedClient) and (
+                self._shard_latency_task is None or self._shard_latency_task.done()
+            ):
+                self._shard_latency_task = asyncio.create_task(self._run_shard_latency_reports())
+
+            # RSS・キャッシュ件数の定期出力（RESOURCE_REPORT_INTERVAL=0 で無効）
+            if self.resource_report_interval > 0 and (
+                self._resource_report_task is None or self._resource_report_task.done()
+            ):
+                self._resource_report_task = asyncio.create_task(self._run_resource_reports())
+
+            # イベントループ監視（有効時のみ）
+            if self.loop_monitor is not None:
+                self.loop_monitor.start()
+                if self._loop_monitor_report_task is None or self._loop_monitor_report_task.done():
+                    self._loop_monitor_report_task = asyncio.create_task(
+                        self._run_loop_monitor_reports()
+                    )
+
+            # 会話要約の更新タスク起動（再接続時のon_readyで重複起動しない）
+            if self.conversation_summarizer is not None and (
+                self._summary_task is None or self._summary_task.done()
+            ):
+                self._summary_task = asyncio.create_task(self._run_summary_updates())
+
+        @self.client.event
+        async def on_shard_ready(shard_id):
+            """シャード接続完了時（シャーディング有効時のみ発火）"""
+            latency = self.get_shard_latencies().get(shard_id, float("nan"))
+            logger.info(
+                f"🧩 シャード {shard_id} 接続完了 (Bot名: {self.bot_name}, "
+                f"レイテンシ: {latency * 1000:.0f}ms)"
+            )
+
         @self.client.event
         async def on_message(message):
             """メッセージ受信時（モード別にルーティング）"""
-            # 1. 自分自身のメッセージは無視
-            if message.author == self.client.user:
+            # 0. 対象外チャンネルのメッセージは最初に除外
+            mode = self._get_channel_mode(message.channel.id)
+            if mode is None:
                 return
 
-            channel_id = message.channel.id
+            # 1. Bot自身の投稿と、このBotが応答するメッセージをチャットログに記録
+            #    （他のBotの投稿はそのBotが記録するため、同じチャンネルを監視する複数Botで重複しない）
+            if self.chat_log_writer is not None and self._should_record_message(message, mode):
+                self.chat_log_writer.record_message(message, self.bot_name, mode)
+
+            # 2. 自分自身のメッセージは無視
+            if message.author == self.client.user:
+                return
 
-            # 2. Mentionモード処理
-            if channel_id in self.mention_mode_channels:
+            # 3. Mentionモード処理
+            if mode == "mention":
                 await self._handle_mention_mode(message)
 
-            # 3. AutoThreadモード処理
-            elif channel_id in self.auto_thread_mode_channels:
+            # 4. AutoThreadモード処理
+            elif mode == "auto_thread":
                 await self._handle_auto_thread_mode(message)
 
     async def _handle_mention_mode(self, message):
@@ -138,8 +418,11 @@ class DiscordBot:
 
         # 3. LLM API呼び出し
         try:
-            # システムプロンプトを使用してLLM APIを呼び出し
-            response = self.llm_client.send_message(prompt=prompt, system_prompt=self.system_prompt)
+            # 関連する過去の会話を付与し、システムプロンプトを使用してLLM APIを呼び出し
+            prompt = await self._add_related_context(message, prompt)
+            response = await asyncio.to_thread(
+                self._send_llm_message, prompt, "mention", message.channel.id
+            )
 
             # 4. Discord文字数制限対応（2000文字）
             if len(response) > 2000:
@@ -170,12 +453,21 @@ class DiscordBot:
         )
 
         try:
-            # 2. チャンネルの会話履歴を取得（最新メッセージ含めて最大20件）
-            conversation_history = await self._get_conversation_history(message)
+            # 2. チャンネルの会話履歴を取得（最新メッセージ含めて最大20件、要約使用時は短い直近分）
+            if self.conversation_summarizer is not None:
+                conversation_history = await self._get_conversation_history(
+                    message, limit=self.summary_history_limit
+                )
+                conversation_history = await self._add_conversation_summary(
+                    message, conversation_history
+                )
+            else:
+                conversation_history = await self._get_conversation_history(message)
+            conversation_history = await self._add_related_context(message, conversation_history)
 
             # 3. LLM API呼び出し
-            response = self.llm_client.send_message(
-                prompt=conversation_history, system_prompt=self.system_prompt
+            response = await asyncio.to_thread(
+                self._send_llm_message, conversation_history, "auto_thread", message.channel.id
             )
 
             # 4. Discord文字数制限対応（2000文字）
@@ -186,16 +478,60 @@ class DiscordBot:
             await message.reply(f"{message.author.mention}\n{response}")
             logger.info(f"✅ [AutoThreadモード] 応答送信完了: {len(response)}文字")
 
+            # 6. やり取りを要約の未反映分として記録（要約の更新はバックグラウンドで実施）
+            if self.conversation_summarizer is not None:
+                await asyncio.to_thread(
+                    self.conversation_summarizer.record_exchange,
+                    self.bot_name,
+                    str(message.channel.id),
+                    str(message.author.id),
+                    message.author.display_name,
+                    message.content,
+                    response,
+                )
+
         except Exception as e:
             logger.error(f"❌ [AutoThreadモード] エラー: {e}", exc_info=True)
             await message.reply(
                 f"{message.author.mention} ⚠️ エラーが発生しました。後ほど再試行してください。"
             )
 
+    def _send_llm_message(self, prompt: str, mode: str, channel_id: int) -> str:
+        """
+        システムプロンプトを使用してLLM APIを呼び出し（ルーティング有効時はモデルを選択）
+
+        ブロッキング呼び出しのため asyncio.to_thread 経由で実行します
+        （同一リクエストの同時実行は LLMClient 側で1回のAPI呼び出しにまとめられます）。
+
+        Args:
+            prompt: ユーザープロンプト
+            mode: チャンネルのモード（mention / auto_thread）
+            channel_id: チャンネルID（使用量の集計に使用）
+
+        Returns:
+            LLM APIからの応答文字列
+        """
+        if self.model_router is not None:
+            return self.model_router.send_message(
+                self.bot_name,
+                prompt,
+                system_prompt=self.system_prompt,
+                mode=mode,
+                channel_id=str(channel_id),
+            )
+        return self.llm_client.send_message(
+            prompt=prompt,
+            system_prompt=self.system_prompt,
+            usage_tags={"bot": self.bot_name, "channel": str(channel_id), "mode": mode},
+        )
+
     async def _get_conversation_history(self, current_message, limit: int = 20) -> str:
         """
         チャンネルの会話履歴を取得してプロンプト形式に整形
 
+        チャットログが有効な場合はチャットログの範囲クエリで取得し、
+        取得できない場合（無効・エラー・記録なし）はDiscord APIにフォールバックします。
+
         Args:
             current_message: 現在のメッセージオブジェクト
             limit: 取得する履歴の最大件数（デフォルト: 20件）
@@ -203,21 +539,15 @@ class DiscordBot:
         Returns:
             会話履歴のプロンプト文字列
         """
-        history_messages = []
+        history = await self._get_history_from_chat_log(current_message, limit)
+        source = "チャットログ"
 
-        # Discord APIで履歴を取得（最新メッセージの前まで）
-        async for msg in current_message.channel.history(limit=limit, before=current_message):
-            # システムメッセージやピン留めメッセージは除外
-            if msg.type == discord.MessageType.default:
-                history_messages.insert(0, msg)  # 古い順に並べる
+        if history is None:
+            history = await self._get_history_from_discord(current_message, limit)
+            source = "Discord API"
 
         # 会話履歴を整形
-        conversation_lines = []
-        for msg in history_messages:
-            author_name = (
-                self.bot_name if msg.author == self.client.user else msg.author.display_name
-            )
-            conversation_lines.append(f"{author_name}: {msg.content}")
+        conversation_lines = [f"{author_name}: {content}" for author_name, content in history]
 
         # 最新メッセージを追加
         conversation_lines.append(
@@ -227,10 +557,149 @@ class DiscordBot:
         # 改行で結合
         conversation_context = "\n".join(conversation_lines)
 
-        logger.debug(f"📝 会話履歴取得: {len(history_messages)}件 + 現在のメッセージ")
+        logger.debug(f"📝 会話履歴取得 ({source}): {len(history)}件 + 現在のメッセージ")
 
         return conversation_context
 
+    async def _get_history_from_discord(self, current_message, limit: int) -> list[tuple[str, str]]:
+        """
+        Discord APIで履歴を取得（最新メッセージの前まで）
+
+        Args:
+            current_message: 現在のメッセージオブジェクト
+            limit: 取得する履歴の最大件数
+
+        Returns:
+            (発言者名, 本文) のリスト（古い順）
+        """
+        history = []
+        async for msg in current_message.channel.history(limit=limit, before=current_message):
+            # システムメッセージやピン留めメッセージは除外
+            if msg.type == discord.MessageType.default:
+                author_name = (
+                    self.bot_name if msg.author == self.client.user else msg.author.display_name
+                )
+                history.insert(0, (author_name, msg.content))  # 古い順に並べる
+        return history
+
+    async def _get_history_from_chat_log(
+        self, current_message, limit: int
+    ) -> Optional[list[tuple[str, str]]]:
+        """
+        チャットログから履歴を取得（セッションIDはチャンネル/スレッドID）
+
+        Args:
+            current_message: 現在のメッセージオブジェクト
+            limit: 取得する履歴の最大件数
+
+        Returns:
+            (発言者名, 本文) のリスト（古い順）。チャットログを利用できない場合はNone
+        """
+        if self.chat_history_provider is None:
+            return None
+
+        try:
+            # boto3はブロッキングのためスレッドで実行
+            items = await asyncio.to_thread(
+                self.chat_history_provider.get_recent_messages,
+                str(current_message.channel.id),
+                limit=limit,
+                since_minutes=self.chat_history_window_minutes,
+                before_timestamp=int(current_message.created_at.timestamp() * 1000),
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ チャットログからの履歴取得に失敗、Discord APIを使用します: {e}")
+            return None
+
+        if not items:
+            return None
+
+        bot_user_id = str(self.client.user.id)
+        history = []
+        for item in items:
+            if item.get("message_id") == str(current_message.id):
+                continue
+            # Discord API経由と同様にシステムメッセージ等は除外
+            if item.get("message_type", "default") != discord.MessageType.default.name:
+                continue
+            author_name = (
+                self.bot_name if item.get("author_id") == bot_user_id else item.get("author_name")
+            )
+            history.append((author_name, item.get("content", "")))
+        return history
+
+    async def _add_conversation_summary(self, current_message, prompt: str) -> str:
+        """
+        投稿者との過去の会話要約をプロンプトの前に付与
+
+        Args:
+            current_message: 現在のメッセージオブジェクト
+            prompt: LLMに送信するプロンプト（直近の会話を含む）
+
+        Returns:
+            要約を付与したプロンプト（要約なし・有効期間切れの場合はそのまま）
+        """
+        try:
+            summary = await asyncio.to_thread(
+                self.conversation_summarizer.get_summary,
+                self.bot_name,
+                str(current_message.channel.id),
+                str(current_message.author.id),
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ 会話要約の取得に失敗しました: {e}")
+            return prompt
+
+        if not summary:
+            return prompt
+
+        author_name = current_message.author.display_name
+        return f"[{author_name}さんとのこれまでの会話の要約]\n{summary}\n\n[直近の会話]\n{prompt}"
+
+    async def _run_summary_updates(self):
+        """未反映のやり取りを定期的に会話要約へ反映（応答処理とは別タスク）"""
+        logger.info(f"🧾 会話要約の更新タスク起動 (間隔: {self.summary_update_interval}秒)")
+        while True:
+            await asyncio.sleep(self.summary_update_interval)
+            try:
+                # LLM呼び出しとSQLite操作はブロッキングのためスレッドで実行
+                await asyncio.to_thread(self.conversation_summarizer.update_pending)
+            except Exception as e:
+                logger.error(f"❌ 会話要約の更新タスクでエラー: {e}", exc_info=True)
+
+    async def _add_related_context(self, current_message, prompt: str) -> str:
+        """
+        関連する過去の会話をインデックスから検索してプロンプトの前に付与
+
+        Args:
+            current_message: 現在のメッセージオブジェクト
+            prompt: LLMに送信するプロンプト（直近の会話を含む）
+
+        Returns:
+            関連する過去の会話を付与したプロンプト（該当なし・無効の場合はそのまま）
+        """
+        if self.conversation_retriever is None:
+            return prompt
+
+        try:
+            # SQLiteの検索はブロッキングのためスレッドで実行
+            context = await asyncio.to_thread(
+                self.conversation_retriever.build_context,
+                current_message.content,
+                str(current_message.channel.id),
+                self.bot_name,
+                before_timestamp=int(current_message.created_at.timestamp() * 1000),
+                exclude_text=prompt,
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ 関連する過去の会話の検索に失敗しました: {e}")
+            return prompt
+
+        if not context:
+            return prompt
+
+        return f"[関連する過去の会話]\n{context}\n\n[現在の会話]\n{prompt}"
+
     def run(self):
         """Bot起動（ブロッキング）"""
         logger.info(f"🤖 Bot '{self.bot_name}' を起動中...")
@@ -242,3 +711,22 @@ class DiscordBot:
         except Exception as e:
             logger.error(f"❌ Bot起動エラー ({self.bot_name}): {e}", exc_info=True)
             raise
+        finally:
+            # 停止時にバッファ内のチャットログをフラッシュ
+            if self.chat_log_writer is not None:
+                self.chat_log_writer.close()
+            if self.chat_log_indexer is not None:
+                self.chat_log_indexer.close()
+            if self.conversation_summarizer is not None:
+                self.conversation_summarizer.close()
+            if self.model_router is not None:
+                self.model_router.log_metrics()
+            if self.loop_monitor is not None:
+                self.loop_monitor.stop()
+                self.loop_monitor.log_report(include_stacks=True)
+            stats = LLMClient.get_request_stats()
+            if stats["requests"]:
+                logger.info(
+                    f"📊 LLMリクエスト: {stats['requests']}件 (API呼び出し {stats['api_calls']}, "
+                    f"共有率 {stats['shared_rate']:.1%}, キャッシュヒット率 {stats['cache_hit_rate']:.1%})"
+                )
@@ -5,10 +5,149 @@ LLM（Large Language Model）APIを使用してプロンプトを送信し、応
 現在はAnthropic Claude APIを実装。将来的にHugging Face等の他プロバイダーにも対応予定。
 """
 
+import hashlib
+import json
 import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
 from typing import Any, Optional
 
 from anthropic import Anthropic
+from services.usage_tracker import get_usage_tracker
+
+
+class RequestCoalescer:
+    """同一リクエストの同時実行を1回のAPI呼び出しにまとめるシングルフライト層
+
+    同じキーのリクエストが実行中の場合、後続の呼び出し元は新たにAPIを呼ばずに
+    実行中のリクエストの結果（または例外）を共有します。決定的な呼び出し
+    （temperature 0）は短いTTLで応答をキャッシュできます。対象はプロセス内のみです。
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        cache_ttl: Optional[float] = None,
+        cache_max_entries: Optional[int] = None,
+    ):
+        """
+        初期化
+
+        Args:
+            enabled: シングルフライトを有効にするか（未指定の場合は環境変数LLM_SINGLE_FLIGHT_ENABLED）
+            cache_ttl: 応答キャッシュのTTL秒数（未指定の場合は環境変数LLM_CACHE_TTL_SECONDS、0で無効）
+            cache_max_entries: キャッシュの最大件数（未指定の場合は環境変数LLM_CACHE_MAX_ENTRIES）
+        """
+        self.enabled = (
+            enabled
+            if enabled is not None
+            else os.getenv("LLM_SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+        )
+        self.cache_ttl = (
+            cache_ttl if cache_ttl is not None else float(os.getenv("LLM_CACHE_TTL_SECONDS", "0"))
+        )
+        self.cache_max_entries = cache_max_entries or int(os.getenv("LLM_CACHE_MAX_ENTRIES", "256"))
+
+        self._lock = threading.Lock()
+        self._inflight: dict[str, dict[str, Any]] = {}
+        self._cache: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._stats = {
+            "requests": 0,
+            "api_calls": 0,
+            "shared": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+        }
+
+    @staticmethod
+    def make_key(params: dict[str, Any]) -> str:
+        """APIパラメータ（モデル・プロンプト・システムプロンプト等）からキーを作成"""
+        payload = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def execute(
+        self, key: str, func: Callable[[], dict[str, Any]], cacheable: bool = False
+    ) -> dict[str, Any]:
+        """
+        キャッシュ・実行中リクエストを共有しつつfuncを実行
+
+        Args:
+            key: リクエストのキー
+            func: APIを呼び出して結果の辞書を返す関数
+            cacheable: 応答をキャッシュしてよいか（決定的な呼び出しのみ）
+
+        Returns:
+            結果の辞書（共有した場合は shared、キャッシュの場合は cached がTrue）
+        """
+        use_cache = cacheable and self.cache_ttl > 0
+
+        with self._lock:
+            self._stats["requests"] += 1
+
+            if use_cache:
+                cached = self._cache.get(key)
+                if cached is not None and cached[0] > time.monotonic():
+                    self._cache.move_to_end(key)
+                    self._stats["cache_hits"] += 1
+                    return {**cached[1], "cached": True}
+                self._stats["cache_misses"] += 1
+
+            flight = self._inflight.get(key) if self.enabled else None
+            if flight is None:
+                flight = {"event": threading.Event(), "result": None, "error": None}
+                if self.enabled:
+                    self._inflight[key] = flight
+                is_leader = True
+            else:
+                self._stats["shared"] += 1
+                is_leader = False
+
+        if not is_leader:
+            # 実行中のリクエストの完了を待って結果を共有
+            flight["event"].wait()
+            if flight["error"] is not None:
+                raise flight["error"]
+            return {**flight["result"], "shared": True}
+
+        try:
+            with self._lock:
+                self._stats["api_calls"] += 1
+            result = func()
+            flight["result"] = result
+
+            if use_cache:
+                with self._lock:
+                    self._cache[key] = (time.monotonic() + self.cache_ttl, result)
+                    self._cache.move_to_end(key)
+                    while len(self._cache) > self.cache_max_entries:
+                        self._cache.popitem(last=False)
+
+            return result
+
+        except Exception as e:
+            flight["error"] = e
+            raise
+
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+            flight["event"].set()
+
+    def get_stats(self) -> dict[str, Any]:
+        """件数カウンタと共有率・キャッシュヒット率を取得"""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["cache_hits"] + stats["cache_misses"]
+        stats["shared_rate"] = stats["shared"] / stats["requests"] if stats["requests"] else 0.0
+        stats["cache_hit_rate"] = stats["cache_hits"] / lookups if lookups else 0.0
+        return stats
+
+
+# Bot・Timesスケジューラー等、プロセス内の全LLMClientで共有
+_request_coalescer = RequestCoalescer()
 
 
 class LLMClient:
@@ -42,6 +181,8 @@ class LLMClient:
         prompt: str,
         system_prompt: Optional[str] = None,
         temperature: float = 1.0,
+        model: Optional[str] = None,
+        usage_tags: Optional[dict[str, str]] = None,
     ) -> str:
         """
         プロンプトをLLM APIに送信し、応答を取得
@@ -50,6 +191,8 @@ class LLMClient:
             prompt: ユーザープロンプト
             system_prompt: システムプロンプト（オプション）
             temperature: 生成温度（0.0-1.0）
+            model: 使用するモデル（未指定の場合はクライアントのデフォルトモデル）
+            usage_tags: 使用量の集計に使用する bot, channel, mode の辞書
 
         Returns:
             LLM APIからの応答文字列
@@ -57,33 +200,114 @@ class LLMClient:
         Raises:
             Exception: API呼び出しに失敗した場合
         """
-        try:
-            # メッセージ構築
-            messages = [{"role": "user", "content": prompt}]
+        result = self.send_message_detailed(prompt, system_prompt, temperature, model, usage_tags)
+        return result["text"]
 
-            # API呼び出しパラメータ
-            params: dict[str, Any] = {
-                "model": self.model,
-                "max_tokens": self.max_tokens,
-                "messages": messages,
-                "temperature": temperature,
-            }
+    def send_message_detailed(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 1.0,
+        model: Optional[str] = None,
+        usage_tags: Optional[dict[str, str]] = None,
+    ) -> dict[str, Any]:
+        """
+        プロンプトをLLM APIに送信し、応答とメタ情報（モデル・トークン数・レイテンシ）を取得
 
-            # システムプロンプトがある場合は追加
-            if system_prompt:
-                params["system"] = system_prompt
+        Args:
+            prompt: ユーザープロンプト
+            system_prompt: システムプロンプト（オプション）
+            temperature: 生成温度（0.0-1.0）
+            model: 使用するモデル（未指定の場合はクライアントのデフォルトモデル）
+            usage_tags: 使用量の集計に使用する bot, channel, mode の辞書
 
-            # API呼び出し
-            response = self.client.messages.create(**params)
+        Returns:
+            text, model, input_tokens, output_tokens, cache_creation_tokens,
+            cache_read_tokens, latency_ms を含む辞書
+            （実行中の同一リクエストを共有した場合は shared、キャッシュの場合は cached がTrue）
 
-            # テキスト応答を抽出
-            if response.content and len(response.content) > 0:
-                return response.content[0].text
+        Raises:
+            Exception: API呼び出しに失敗した場合（元の例外は __cause__ に保持）
+        """
+        # メッセージ構築
+        messages = [{"role": "user", "content": prompt}]
+
+        # API呼び出しパラメータ
+        params: dict[str, Any] = {
+            "model": model or self.model,
+            "max_tokens": self.max_tokens,
+            "messages": messages,
+            "temperature": temperature,
+        }
+
+        # システムプロンプトがある場合は追加
+        if system_prompt:
+            params["system"] = system_prompt
+
+        usage_tracker = get_usage_tracker()
 
-            return ""
+        try:
+            # 同一リクエストが実行中なら結果を共有（temperature 0 はキャッシュ対象）
+            result = _request_coalescer.execute(
+                RequestCoalescer.make_key(params),
+                lambda: self._create_message(params),
+                cacheable=temperature == 0,
+            )
 
         except Exception as e:
-            raise Exception(f"LLM API呼び出しエラー: {str(e)}")
+            if usage_tracker is not None:
+                usage_tracker.record(usage_tags, params["model"], error=True)
+            raise Exception(f"LLM API呼び出しエラー: {str(e)}") from e
+
+        # 使用量を記録（共有・キャッシュ応答はAPIを呼んでいないためトークン数は計上しない）
+        if usage_tracker is not None:
+            usage_tracker.record(
+                usage_tags,
+                result["model"],
+                input_tokens=result["input_tokens"],
+                output_tokens=result["output_tokens"],
+                cache_creation_tokens=result["cache_creation_tokens"],
+                cache_read_tokens=result["cache_read_tokens"],
+                latency_ms=result["latency_ms"],
+                deduplicated=bool(result.get("shared") or result.get("cached")),
+            )
+        return result
+
+    def _create_message(self, params: dict[str, Any]) -> dict[str, Any]:
+        """
+        LLM APIを呼び出して応答とメタ情報を取得
+
+        Args:
+            params: API呼び出しパラメータ
+
+        Returns:
+            text, model, input_tokens, output_tokens, cache_creation_tokens,
+            cache_read_tokens, latency_ms を含む辞書
+        """
+        # API呼び出し
+        started = time.perf_counter()
+        response = self.client.messages.create(**params)
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        # テキスト応答を抽出
+        text = ""
+        if response.content and len(response.content) > 0:
+            text = response.content[0].text
+
+        return {
+            "text": text,
+            "model": params["model"],
+            "input_tokens": response.usage.input_tokens,
+            "output_tokens": response.usage.output_tokens,
+            "cache_creation_tokens": response.usage.cache_creation_input_tokens or 0,
+            "cache_read_tokens": response.usage.cache_read_input_tokens or 0,
+            "latency_ms": latency_ms,
+        }
+
+    @staticmethod
+    def get_request_stats() -> dict[str, Any]:
+        """シングルフライト・応答キャッシュの統計（プロセス全体）を取得"""
+        return _request_coalescer.get_stats()
 
     def send_test_message(self) -> dict[str, Any]:
         """
@@ -45,6 +45,7 @@ class LLMDiscordBridge:
                 prompt=prompt,
                 system_prompt=system_prompt,
                 temperature=temperature,
+                usage_tags={"bot": "bridge", "channel": webhook_name, "mode": "bridge"},
             )
 
             # Step 2: Discord投稿用のメッセージを構築
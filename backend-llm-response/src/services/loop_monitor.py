@@ -0,0 +1,202 @@
+"""
+イベントループ監視
+
+asyncioイベントループの遅延（lag）を継続的に計測し、しきい値を超えて
+ループを止めた処理のスタックトレースを捕捉して、ワースト順に集計します。
+
+- ティッカー: ループ上で一定間隔スリープし、予定時刻からの遅れを遅延として計測
+- ウォッチドッグ: 別スレッドでティッカーの更新を監視し、止まっている間に
+  ループスレッドのスタックを sys._current_frames() で取得
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# スタックの集計キーに使用するアプリケーションコードのディレクトリ（src/）
+APP_SOURCE_DIR = str(Path(__file__).resolve().parent.parent)
+
+
+class EventLoopMonitor:
+    """イベントループの遅延計測とブロッキング処理の検出"""
+
+    # 平均・p95算出に使用する直近の遅延件数
+    LAG_WINDOW = 1000
+
+    def __init__(
+        self,
+        threshold_ms: Optional[float] = None,
+        interval: Optional[float] = None,
+        top_n: Optional[int] = None,
+    ):
+        """
+        初期化
+
+        Args:
+            threshold_ms: ブロッキングとみなす遅延（ミリ秒、未指定の場合は環境変数LOOP_MONITOR_THRESHOLD_MS）
+            interval: 計測間隔（秒、未指定の場合は環境変数LOOP_MONITOR_INTERVAL）
+            top_n: レポートに出力するワースト件数（未指定の場合は環境変数LOOP_MONITOR_TOP_N）
+        """
+        self.threshold_ms = threshold_ms or float(os.getenv("LOOP_MONITOR_THRESHOLD_MS", "100"))
+        self.interval = interval or float(os.getenv("LOOP_MONITOR_INTERVAL", "0.05"))
+        self.top_n = top_n or int(os.getenv("LOOP_MONITOR_TOP_N", "5"))
+
+        self._lock = threading.Lock()
+        self._lags: deque = deque(maxlen=self.LAG_WINDOW)
+        self._stalls = 0
+        self._max_lag_ms = 0.0
+        self._offenders: dict[str, dict[str, Any]] = {}
+
+        self._loop_thread_id: Optional[int] = None
+        self._last_tick = 0.0
+        self._captured: Optional[tuple[str, str]] = None
+        self._ticker_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def start(self) -> None:
+        """実行中のイベントループで監視を開始（ループ上から呼び出すこと、起動済みの場合は何もしない）"""
+        if self._ticker_task is not None and not self._ticker_task.done():
+            return
+
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stop_event.clear()
+        self._ticker_task = asyncio.get_running_loop().create_task(self._run_ticker())
+
+        if self._watchdog is None or not self._watchdog.is_alive():
+            self._watchdog = threading.Thread(
+                target=self._run_watchdog, name="event-loop-watchdog", daemon=True
+            )
+            self._watchdog.start()
+
+        logger.info(
+            f"🩺 イベントループ監視開始 (しきい値: {self.threshold_ms:.0f}ms, "
+            f"間隔: {self.interval * 1000:.0f}ms)"
+        )
+
+    def stop(self) -> None:
+        """監視を停止"""
+        self._stop_event.set()
+        if self._ticker_task is not None:
+            self._ticker_task.cancel()
+            self._ticker_task = None
+
+    async def _run_ticker(self):
+        """一定間隔でスリープし、予定時刻からの遅れを遅延として記録"""
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._last_tick = now
+            self._record_lag(max(0.0, (now - expected) * 1000))
+
+    def _run_watchdog(self):
+        """ティッカーが止まっている間にループスレッドのスタックを捕捉"""
+        poll = min(self.interval, self.threshold_ms / 2000)
+        while not self._stop_event.wait(poll):
+            stalled_ms = (time.monotonic() - self._last_tick) * 1000 - self.interval * 1000
+            if stalled_ms < self.threshold_ms or self._captured is not None:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)
+            self._captured = (self._offender_key(stack), "".join(traceback.format_list(stack)))
+
+    @staticmethod
+    def _offender_key(stack: traceback.StackSummary) -> str:
+        """スタックのうちアプリケーションコードの最も内側のフレームを集計キーにする"""
+        for frame in reversed(stack):
+            if frame.filename.startswith(APP_SOURCE_DIR) and not frame.filename.endswith(
+                "loop_monitor.py"
+            ):
+                return f"{Path(frame.filename).name}:{frame.lineno} {frame.name}"
+        innermost = stack[-1]
+        return f"{Path(innermost.filename).name}:{innermost.lineno} {innermost.name}"
+
+    def _record_lag(self, lag_ms: float) -> None:
+        """遅延を記録し、しきい値を超えた場合は捕捉したスタックに紐づけて集計"""
+        captured, self._captured = self._captured, None
+
+        with self._lock:
+            self._lags.append(lag_ms)
+            self._max_lag_ms = max(self._max_lag_ms, lag_ms)
+            if lag_ms < self.threshold_ms:
+                return
+
+            self._stalls += 1
+            key, stack = captured or ("(スタック未取得)", "")
+            offender = self._offenders.setdefault(
+                key, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "stack": stack}
+            )
+            offender["count"] += 1
+            offender["total_ms"] += lag_ms
+            if lag_ms > offender["max_ms"]:
+                offender["max_ms"] = lag_ms
+                offender["stack"] = stack or offender["stack"]
+
+        logger.warning(f"🐢 イベントループが {lag_ms:.0f}ms ブロックされました: {key}")
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        遅延の統計を取得
+
+        Returns:
+            samples, avg_lag_ms, p95_lag_ms, max_lag_ms, stalls を含む辞書
+        """
+        with self._lock:
+            lags = sorted(self._lags)
+            return {
+                "samples": len(lags),
+                "avg_lag_ms": sum(lags) / len(lags) if lags else 0.0,
+                "p95_lag_ms": lags[min(len(lags) - 1, int(len(lags) * 0.95))] if lags else 0.0,
+                "max_lag_ms": self._max_lag_ms,
+                "stalls": self._stalls,
+            }
+
+    def get_worst_offenders(self, limit: Optional[int] = None) -> list[dict[str, Any]]:
+        """
+        ループを止めた処理を合計ブロック時間の長い順に取得
+
+        Args:
+            limit: 取得件数（未指定の場合は top_n）
+
+        Returns:
+            location, count, total_ms, max_ms, stack を含む辞書のリスト
+        """
+        with self._lock:
+            offenders = [{"location": key, **value} for key, value in self._offenders.items()]
+        offenders.sort(key=lambda offender: offender["total_ms"], reverse=True)
+        return offenders[: limit or self.top_n]
+
+    def log_report(self, include_stacks: bool = False) -> None:
+        """
+        遅延の統計とワーストの処理をログ出力
+
+        Args:
+            include_stacks: スタックトレースも出力するか
+        """
+        stats = self.get_stats()
+        logger.info(
+            f"🩺 イベントループ遅延: 平均 {stats['avg_lag_ms']:.1f}ms, "
+            f"p95 {stats['p95_lag_ms']:.1f}ms, 最大 {stats['max_lag_ms']:.0f}ms, "
+            f"ブロック {stats['stalls']}回"
+        )
+        for rank, offender in enumerate(self.get_worst_offenders(), start=1):
+            logger.info(
+                f"  {rank}. {offender['location']}: {offender['count']}回, "
+                f"合計 {offender['total_ms']:.0f}ms, 最大 {offender['max_ms']:.0f}ms"
+            )
+            if include_stacks and offender["stack"]:
+                logger.info(offender["stack"].rstrip())
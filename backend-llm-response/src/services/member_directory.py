@@ -0,0 +1,289 @@
+"""
+メンバーディレクトリ（プロセス内キャッシュ）
+
+人間メンバー・仮想メンバーとそのプロフィールを一括で読み込み、ID・UUID・名前の
+インデックスをメモリ上に保持します。参照時は辞書引きのみでDBにアクセスせず、
+一定間隔で updated_at による差分更新、より長い間隔で全件再読み込み（削除の反映）を
+行います。
+
+Usage:
+    python src/services/member_directory.py
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from db.connection.connection import DBMemberConnection
+from db.models.schemas import HumanMember, HumanMemberProfile, VirtualMember, VirtualMemberProfile
+from sqlalchemy import or_
+
+logger = logging.getLogger(__name__)
+
+
+class MemberDirectory:
+    """メンバー情報のインメモリディレクトリ"""
+
+    def __init__(
+        self,
+        connection: Optional[DBMemberConnection] = None,
+        refresh_interval: Optional[float] = None,
+        full_reload_interval: Optional[float] = None,
+    ):
+        """
+        初期化（読み込みは初回参照時に行う）
+
+        Args:
+            connection: メンバーDB接続（未指定の場合は新規作成）
+            refresh_interval: 差分更新の間隔（秒、未指定の場合は環境変数MEMBER_DIRECTORY_REFRESH_SECONDS）
+            full_reload_interval: 全件再読み込みの間隔（秒、未指定の場合は環境変数MEMBER_DIRECTORY_FULL_RELOAD_SECONDS）
+        """
+        self.connection = connection or DBMemberConnection()
+        self.refresh_interval = refresh_interval or float(
+            os.getenv("MEMBER_DIRECTORY_REFRESH_SECONDS", "60")
+        )
+        self.full_reload_interval = full_reload_interval or float(
+            os.getenv("MEMBER_DIRECTORY_FULL_RELOAD_SECONDS", "3600")
+        )
+        self._session_factory = self.connection.session_factory
+        self._refresh_lock = threading.Lock()
+
+        # インデックスは丸ごと差し替えるため、参照側はロック不要
+        self._by_id: dict[tuple[str, int], dict[str, Any]] = {}
+        self._by_uuid: dict[str, dict[str, Any]] = {}
+        self._by_name: dict[str, list[dict[str, Any]]] = {}
+        self._watermark: Optional[datetime] = None
+        self._last_refresh = 0.0
+        self._last_full_reload = 0.0
+
+    def get_by_id(self, member_type: str, member_id: int) -> Optional[dict[str, Any]]:
+        """
+        メンバー種別とIDでメンバーを取得
+
+        Args:
+            member_type: "human" または "virtual"
+            member_id: メンバーID
+
+        Returns:
+            メンバー情報の辞書（存在しない場合はNone）
+        """
+        self._ensure_fresh()
+        return self._by_id.get((member_type, member_id))
+
+    def get_by_uuid(self, member_uuid: str) -> Optional[dict[str, Any]]:
+        """
+        UUIDでメンバーを取得
+
+        Args:
+            member_uuid: メンバーUUID
+
+        Returns:
+            メンバー情報の辞書（存在しない場合はNone）
+        """
+        self._ensure_fresh()
+        return self._by_uuid.get(str(member_uuid))
+
+    def get_by_name(
+        self, member_name: str, member_type: Optional[str] = None
+    ) -> Optional[dict[str, Any]]:
+        """
+        名前でメンバーを取得
+
+        Args:
+            member_name: メンバー名
+            member_type: "human" または "virtual"（未指定の場合は仮想メンバーを優先）
+
+        Returns:
+            メンバー情報の辞書（存在しない場合はNone）
+        """
+        self._ensure_fresh()
+        candidates = self._by_name.get(member_name, [])
+        if member_type is not None:
+            candidates = [m for m in candidates if m["member_type"] == member_type]
+        else:
+            candidates = sorted(candidates, key=lambda m: m["member_type"] != "virtual")
+        return candidates[0] if candidates else None
+
+    def list_members(self, member_type: Optional[str] = None) -> list[dict[str, Any]]:
+        """
+        メンバー一覧を取得
+
+        Args:
+            member_type: "human" または "virtual"（未指定の場合は全件）
+
+        Returns:
+            メンバー情報の辞書のリスト（種別・ID順）
+        """
+        self._ensure_fresh()
+        members = self._by_id.values()
+        if member_type is not None:
+            members = [m for m in members if m["member_type"] == member_type]
+        return sorted(members, key=lambda m: (m["member_type"], m["member_id"]))
+
+    def reload(self) -> None:
+        """全件を読み込み直してインデックスを再構築"""
+        with self._refresh_lock:
+            self._load(full=True)
+
+    def refresh(self) -> None:
+        """前回以降に更新されたメンバーのみを読み込んでインデックスに反映"""
+        with self._refresh_lock:
+            self._load(full=False)
+
+    def _ensure_fresh(self) -> None:
+        """更新間隔を過ぎていれば差分更新（全件再読み込み間隔を過ぎていれば全件）"""
+        now = time.monotonic()
+        if now - self._last_refresh < self.refresh_interval:
+            return
+
+        # 他スレッドが更新中の場合は待たずに現在のインデックスを返す（初回読み込みを除く）
+        if not self._refresh_lock.acquire(blocking=not self._by_id):
+            return
+        try:
+            if time.monotonic() - self._last_refresh < self.refresh_interval:
+                return
+            full = now - self._last_full_reload >= self.full_reload_interval
+            try:
+                self._load(full=full)
+            except Exception as e:
+                if not self._by_id:
+                    raise
+                # 読み込み済みのインデックスで継続し、次の間隔で再試行
+                self._last_refresh = time.monotonic()
+                logger.error(f"❌ メンバーディレクトリの更新に失敗しました: {e}", exc_info=True)
+        finally:
+            self._refresh_lock.release()
+
+    def _load(self, full: bool) -> None:
+        """
+        メンバーとプロフィールを読み込んでインデックスを差し替え（更新ロック取得済みであること）
+
+        Args:
+            full: Trueの場合は全件、Falseの場合はウォーターマーク以降の更新分のみ
+        """
+        since = None if full else self._watermark
+        if since is not None:
+            # updated_at はトランザクション開始時刻のため、ウォーターマークより前に開始して
+            # 後からコミットされた更新を取りこぼさないよう、差分更新の間隔分さかのぼって取得する
+            since -= timedelta(seconds=self.refresh_interval)
+        started = time.perf_counter()
+
+        session = self._session_factory()
+        try:
+            rows = [
+                *self._query_members(session, "human", since),
+                *self._query_members(session, "virtual", since),
+            ]
+        finally:
+            session.close()
+
+        by_id = {} if full else dict(self._by_id)
+        for entry in rows:
+            by_id[(entry["member_type"], entry["member_id"])] = entry
+
+        by_uuid = {entry["member_uuid"]: entry for entry in by_id.values()}
+        by_name: dict[str, list[dict[str, Any]]] = {}
+        for entry in by_id.values():
+            by_name.setdefault(entry["member_name"], []).append(entry)
+
+        self._by_id, self._by_uuid, self._by_name = by_id, by_uuid, by_name
+
+        timestamps = [entry["updated_at"] for entry in rows if entry["updated_at"] is not None]
+        if timestamps:
+            latest = max(timestamps)
+            self._watermark = latest if self._watermark is None else max(self._watermark, latest)
+
+        now = time.monotonic()
+        self._last_refresh = now
+        if full:
+            self._last_full_reload = now
+
+        logger.info(
+            f"👥 メンバーディレクトリ{'読み込み' if full else '差分更新'}: "
+            f"{len(rows)}件 (全{len(by_id)}件, {(time.perf_counter() - started) * 1000:.1f}ms)"
+        )
+
+    def _query_members(
+        self, session, member_type: str, since: Optional[datetime]
+    ) -> list[dict[str, Any]]:
+        """
+        メンバーとプロフィールを外部結合で1クエリで取得
+
+        Args:
+            session: DBセッション
+            member_type: "human" または "virtual"
+            since: この日時以降に更新されたメンバー・プロフィールに限定（Noneの場合は全件）
+
+        Returns:
+            メンバー情報の辞書のリスト
+        """
+        member_model, profile_model = (
+            (HumanMember, HumanMemberProfile)
+            if member_type == "human"
+            else (VirtualMember, VirtualMemberProfile)
+        )
+
+        query = session.query(member_model, profile_model).outerjoin(
+            profile_model, profile_model.member_id == member_model.member_id
+        )
+        if since is not None:
+            # 同一時刻の更新を取りこぼさないよう境界を含める（再適用は冪等）
+            query = query.filter(
+                or_(member_model.updated_at >= since, profile_model.updated_at >= since)
+            )
+
+        entries = []
+        for member, profile in query.all():
+            updated_at = member.updated_at
+            if profile is not None and profile.updated_at is not None:
+                updated_at = (
+                    max(updated_at, profile.updated_at) if updated_at else profile.updated_at
+                )
+
+            entries.append(
+                {
+                    "member_type": member_type,
+                    "member_id": member.member_id,
+                    "member_uuid": str(member.member_uuid),
+                    "member_name": member.member_name,
+                    "bio": getattr(profile, "bio", None),
+                    "llm_model": getattr(profile, "llm_model", None),
+                    "custom_prompt": getattr(profile, "custom_prompt", None),
+                    "updated_at": updated_at,
+                }
+            )
+        return entries
+
+
+_member_directory: Optional[MemberDirectory] = None
+_member_directory_lock = threading.Lock()
+
+
+def get_member_directory() -> MemberDirectory:
+    """プロセス内で共有するメンバーディレクトリを取得"""
+    global _member_directory
+    if _member_directory is None:
+        with _member_directory_lock:
+            if _member_directory is None:
+                _member_directory = MemberDirectory()
+    return _member_directory
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    directory = get_member_directory()
+    try:
+        for member in directory.list_members():
+            print(
+                f"[{member['member_type']}] {member['member_id']}: {member['member_name']} "
+                f"({member['member_uuid']})"
+            )
+    except Exception as e:
+        print(f"エラーが発生しました: {str(e)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,53 @@
-from db.connection.connection import DBMemberConnection
+from typing import Optional
+
+from db.connection.async_connection import AsyncDBMemberConnection
 from db.models.schemas import HumanMember, VirtualMember
+from services.member_directory import MemberDirectory, get_member_directory
+from sqlalchemy import select
 
 
 class MemberService:
-    def __init__(self):
-        self.db_connection = DBMemberConnection()
+    def __init__(self, directory: Optional[MemberDirectory] = None):
+        self.directory = directory or get_member_directory()
 
-    def get_member_responses(self) -> dict:
-        session = self.db_connection.db_member_connection_check()
+    def get_member_responses(self, human_member_id: int = 1, virtual_member_id: int = 1) -> dict:
+        # DBには問い合わせず、メンバーディレクトリのインデックスから取得
+        human_member = self.directory.get_by_id("human", human_member_id)
+        virtual_member = self.directory.get_by_id("virtual", virtual_member_id)
+
+        if not human_member or not virtual_member:
+            raise ValueError("Members not found")
+
+        return {
+            "human_response": f"わたしの名前は{human_member['member_name']}です",
+            "virtual_response": f"あなたの名前は{virtual_member['member_name']}です",
+        }
 
-        try:
-            # 仮実装として、member_idをハードコード
-            human_member = session.query(HumanMember).filter(HumanMember.member_id == 1).first()
-            virtual_member = (
-                session.query(VirtualMember).filter(VirtualMember.member_id == 1).first()
-            )
 
-            if not human_member or not virtual_member:
-                raise ValueError("Members not found")
+class AsyncMemberService:
+    """MemberServiceの非同期版（イベントループをブロックせずにDBから取得）"""
+
+    def __init__(self, connection: Optional[AsyncDBMemberConnection] = None):
+        self.db_connection = connection or AsyncDBMemberConnection()
+
+    async def get_member_responses(
+        self, human_member_id: int = 1, virtual_member_id: int = 1
+    ) -> dict:
+        async with self.db_connection.session() as session:
+            human_member = await session.scalar(
+                select(HumanMember).where(HumanMember.member_id == human_member_id)
+            )
+            virtual_member = await session.scalar(
+                select(VirtualMember).where(VirtualMember.member_id == virtual_member_id)
+            )
 
-            return {
-                "human_response": f"わたしの名前は{human_member.member_name}です",
-                "virtual_response": f"あなたの名前は{virtual_member.member_name}です",
-            }
+        if not human_member or not virtual_member:
+            raise ValueError("Members not found")
 
-        finally:
-            session.close()
+        return {
+            "human_response": f"わたしの名前は{human_member.member_name}です",
+            "virtual_response": f"あなたの名前は{virtual_member.member_name}です",
+        }
 
 
 def main():
@@ -0,0 +1,253 @@
+"""
+モデルルーティング
+
+仮想メンバーのプロフィール（virtual_member_profiles.llm_model）に従ってBotごとに
+使用するモデルを選択し、短いメンションへの高速モデル適用や過負荷時の
+フォールバックといったレイテンシ重視のポリシーを適用します。
+モデルごとのレイテンシ・トークン数・推定コストも集計します。
+"""
+
+import logging
+import os
+import threading
+from collections import deque
+from typing import Any, Optional
+
+import anthropic
+from db.operation.member_queries import member_name_from_bot_name
+from services.llm_client import LLMClient
+from services.member_directory import MemberDirectory, get_member_directory
+from services.usage_tracker import estimate_cost
+
+logger = logging.getLogger(__name__)
+
+# フォールバック対象とするHTTPステータス（429: レート制限, 529: 過負荷, 503: 一時停止）
+OVERLOAD_STATUS_CODES = {429, 503, 529}
+
+
+def is_overload_error(error: Exception) -> bool:
+    """例外（またはその原因）が過負荷・レート制限・タイムアウトによるものか判定"""
+    cause = error.__cause__ or error
+    if isinstance(cause, anthropic.APITimeoutError):
+        return True
+    return (
+        isinstance(cause, anthropic.APIStatusError) and cause.status_code in OVERLOAD_STATUS_CODES
+    )
+
+
+class ModelRouter:
+    """Botごとのモデル選択とモデル別メトリクス集計"""
+
+    # p95算出に使用する直近のレイテンシ件数
+    LATENCY_WINDOW = 500
+
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        directory: Optional[MemberDirectory] = None,
+        fast_model: Optional[str] = None,
+        fast_max_chars: Optional[int] = None,
+        fallback_model: Optional[str] = None,
+    ):
+        """
+        初期化
+
+        Args:
+            llm_client: LLMクライアント（デフォルトモデルはクライアントの設定を使用）
+            directory: メンバーディレクトリ（未指定の場合はプロセス共有のディレクトリ）
+            fast_model: 短いメンションに使用する高速モデル（未指定の場合は環境変数LLM_FAST_MODEL）
+            fast_max_chars: 高速モデルを使用するメンションの最大文字数（環境変数LLM_FAST_MAX_CHARS）
+            fallback_model: 過負荷時のフォールバックモデル（未指定の場合は環境変数LLM_FALLBACK_MODEL）
+        """
+        self.llm_client = llm_client
+        self.directory = directory or get_member_directory()
+        self.fast_model = fast_model or os.getenv("LLM_FAST_MODEL") or None
+        self.fast_max_chars = fast_max_chars or int(os.getenv("LLM_FAST_MAX_CHARS", "80"))
+        self.fallback_model = fallback_model or os.getenv("LLM_FALLBACK_MODEL") or None
+
+        self._metrics_lock = threading.Lock()
+        self._metrics: dict[str, dict[str, Any]] = {}
+
+    def get_member_model(self, bot_name: str) -> str:
+        """
+        Botに対応する仮想メンバーのモデルを取得
+
+        Args:
+            bot_name: Bot名（先頭の絵文字は除いてメンバー名として検索）
+
+        Returns:
+            プロフィールのモデル（未登録・Claude以外・取得失敗の場合はデフォルトモデル）
+        """
+        try:
+            member = self.directory.get_by_name(member_name_from_bot_name(bot_name), "virtual")
+        except Exception as e:
+            logger.warning(f"⚠️ メンバー情報の取得に失敗、デフォルトモデルを使用します: {e}")
+            return self.llm_client.model
+
+        llm_model = member.get("llm_model") if member else None
+        # 現在の LLMClient は Anthropic API のみ対応のため、それ以外のモデル指定は無視
+        if llm_model and llm_model.startswith("claude"):
+            return llm_model
+        return self.llm_client.model
+
+    def select_model(self, bot_name: str, mode: str, prompt: str) -> str:
+        """
+        Bot・モード・プロンプトから使用するモデルを選択
+
+        Args:
+            bot_name: Bot名
+            mode: チャンネルのモード（mention / auto_thread / times）
+            prompt: 送信するプロンプト
+
+        Returns:
+            モデル名
+        """
+        if self.fast_model and mode == "mention" and len(prompt) <= self.fast_max_chars:
+            return self.fast_model
+        return self.get_member_model(bot_name)
+
+    def send_message(
+        self,
+        bot_name: str,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        mode: str = "mention",
+        temperature: float = 1.0,
+        channel_id: Optional[str] = None,
+    ) -> str:
+        """
+        選択したモデルでLLM APIを呼び出し（過負荷時はフォールバックモデルで再試行）
+
+        Args:
+            bot_name: Bot名
+            prompt: ユーザープロンプト
+            system_prompt: システムプロンプト（オプション）
+            mode: チャンネルのモード
+            temperature: 生成温度
+            channel_id: 使用量の集計に使用するチャンネルID
+
+        Returns:
+            LLM APIからの応答文字列
+
+        Raises:
+            Exception: API呼び出しに失敗した場合
+        """
+        model = self.select_model(bot_name, mode, prompt)
+        usage_tags = {"bot": bot_name, "channel": channel_id, "mode": mode}
+
+        try:
+            result = self.llm_client.send_message_detailed(
+                prompt, system_prompt, temperature, model=model, usage_tags=usage_tags
+            )
+        except Exception as e:
+            self._record_error(model)
+            if not (self.fallback_model and self.fallback_model != model and is_overload_error(e)):
+                raise
+
+            logger.warning(f"⚠️ {model} が過負荷のため {self.fallback_model} で再試行します: {e}")
+            try:
+                result = self.llm_client.send_message_detailed(
+                    prompt,
+                    system_prompt,
+                    temperature,
+                    model=self.fallback_model,
+                    usage_tags=usage_tags,
+                )
+            except Exception:
+                self._record_error(self.fallback_model)
+                raise
+            result["fallback"] = True
+
+        self._record_success(result)
+        logger.debug(
+            f"🧭 {bot_name} ({mode}) → {result['model']}: {result['latency_ms']:.0f}ms, "
+            f"in {result['input_tokens']} / out {result['output_tokens']} tokens"
+        )
+        return result["text"]
+
+    def _get_model_metrics(self, model: str) -> dict[str, Any]:
+        """モデルのメトリクスを取得（無い場合は作成、ロック取得済みであること）"""
+        if model not in self._metrics:
+            self._metrics[model] = {
+                "requests": 0,
+                "errors": 0,
+                "fallbacks": 0,
+                "deduplicated": 0,
+                "input_tokens": 0,
+                "output_tokens": 0,
+                "cost_usd": 0.0,
+                "latency_total_ms": 0.0,
+                "latencies": deque(maxlen=self.LATENCY_WINDOW),
+            }
+        return self._metrics[model]
+
+    def _record_success(self, result: dict[str, Any]) -> None:
+        """成功したリクエストのレイテンシ・トークン数・コストを記録（共有・キャッシュ応答は件数のみ）"""
+        with self._metrics_lock:
+            metrics = self._get_model_metrics(result["model"])
+            metrics["requests"] += 1
+            metrics["fallbacks"] += int(result.get("fallback", False))
+            if result.get("shared") or result.get("cached"):
+                # 他の呼び出しと共有した応答・キャッシュ応答はAPIを呼んでいないため計上しない
+                metrics["deduplicated"] += 1
+                return
+            metrics["input_tokens"] += result["input_tokens"]
+            metrics["output_tokens"] += result["output_tokens"]
+            metrics["cost_usd"] += estimate_cost(
+                result["model"],
+                result["input_tokens"],
+                result["output_tokens"],
+                result["cache_creation_tokens"],
+                result["cache_read_tokens"],
+            )
+            metrics["latency_total_ms"] += result["latency_ms"]
+            metrics["latencies"].append(result["latency_ms"])
+
+    def _record_error(self, model: str) -> None:
+        """失敗したリクエストを記録"""
+        with self._metrics_lock:
+            self._get_model_metrics(model)["errors"] += 1
+
+    def get_metrics(self) -> dict[str, dict[str, Any]]:
+        """
+        モデル別のメトリクスを取得
+
+        Returns:
+            モデル名をキーとする、件数・平均/p95レイテンシ・トークン数・推定コストの辞書
+        """
+        with self._metrics_lock:
+            snapshot = {}
+            for model, metrics in self._metrics.items():
+                latencies = sorted(metrics["latencies"])
+                p95 = (
+                    latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+                    if latencies
+                    else 0.0
+                )
+                api_requests = metrics["requests"] - metrics["deduplicated"]
+                snapshot[model] = {
+                    "requests": metrics["requests"],
+                    "errors": metrics["errors"],
+                    "fallbacks": metrics["fallbacks"],
+                    "deduplicated": metrics["deduplicated"],
+                    "avg_latency_ms": (
+                        metrics["latency_total_ms"] / api_requests if api_requests else 0.0
+                    ),
+                    "p95_latency_ms": p95,
+                    "input_tokens": metrics["input_tokens"],
+                    "output_tokens": metrics["output_tokens"],
+                    "cost_usd": round(metrics["cost_usd"], 6),
+                }
+            return snapshot
+
+    def log_metrics(self) -> None:
+        """モデル別のメトリクスをログ出力"""
+        for model, metrics in self.get_metrics().items():
+            logger.info(
+                f"📊 {model}: {metrics['requests']}件 (エラー {metrics['errors']}, "
+                f"フォールバック {metrics['fallbacks']}, 共有/キャッシュ {metrics['deduplicated']}), "
+                f"平均 {metrics['avg_latency_ms']:.0f}ms, "
+                f"p95 {metrics['p95_latency_ms']:.0f}ms, "
+                f"in {metrics['input_tokens']} / out {metrics['output_tokens']} tokens, "
+                f"${metrics['cost_usd']:.4f}"
+            )
@@ -0,0 +1,76 @@
+"""
+リソースモニター
+
+プロセスのメモリ使用量（RSS）とDiscordクライアントのキャッシュ件数を取得します。
+Botは1プロセス1Botで起動するため、プロセスのRSSがBotごとのメモリ使用量になります。
+"""
+
+import logging
+import resource
+import sys
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+PROC_STATUS_PATH = Path("/proc/self/status")
+
+
+def get_rss_bytes() -> Optional[int]:
+    """
+    現在のプロセスのRSS（常駐メモリサイズ）を取得
+
+    Returns:
+        RSSのバイト数（/proc が無い環境では最大RSS、取得できない場合はNone）
+    """
+    try:
+        for line in PROC_STATUS_PATH.read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except (OSError, ValueError):
+        return None
+    # macOS はバイト、Linux はKB単位
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def get_client_cache_stats(client: Any) -> dict[str, int]:
+    """
+    Discordクライアントのキャッシュ件数を取得
+
+    Args:
+        client: discord.Client
+
+    Returns:
+        guilds, channels, users, members, messages の件数
+    """
+    guilds = list(client.guilds)
+    return {
+        "guilds": len(guilds),
+        "channels": sum(len(guild.channels) for guild in guilds),
+        "users": len(client.users),
+        "members": sum(len(guild.members) for guild in guilds),
+        "messages": len(client.cached_messages),
+    }
+
+
+def log_resource_usage(bot_name: str, client: Any) -> None:
+    """
+    RSSとキャッシュ件数をログ出力
+
+    Args:
+        bot_name: Bot名
+        client: discord.Client
+    """
+    rss = get_rss_bytes()
+    rss_text = f"{rss / (1024 * 1024):.1f}MB" if rss is not None else "不明"
+    cache = get_client_cache_stats(client)
+    logger.info(
+        f"💾 {bot_name}: RSS {rss_text}, ギルド {cache['guilds']}, "
+        f"チャンネル {cache['channels']}, ユーザー {cache['users']}, "
+        f"メンバー {cache['members']}, メッセージ {cache['messages']}"
+    )
@@ -4,6 +4,7 @@ Discord Bot Times Mode スケジューラー
 平日（月〜金）のJST 9:00-18:00の間に1日1回、ランダムな話題で投稿する機能
 """
 
+import asyncio
 import json
 import logging
 import random
@@ -166,7 +167,16 @@ class TimesScheduler:
 
         # LLM API呼び出し
         try:
-            response = self.llm_client.send_message(prompt=topic, system_prompt=self.system_prompt)
+            response = await asyncio.to_thread(
+                self.llm_client.send_message,
+                prompt=topic,
+                system_prompt=self.system_prompt,
+                usage_tags={
+                    "bot": self.bot_name,
+                    "channel": ",".join(str(channel_id) for channel_id in self.times_channels),
+                    "mode": "times",
+                },
+            )
 
             # Discord文字数制限対応（2000文字）
             if len(response) > 2000:
@@ -0,0 +1,411 @@
+"""
+LLM使用量トラッカー
+
+LLM API呼び出しごとの入力/出力/キャッシュトークン数・レイテンシを
+(Bot, チャンネル, モード, モデル) ごとにメモリ上で集計し、一定間隔で
+JSONLファイルに追記します。レポートCLIで集計結果を推定コスト順に表示します。
+"""
+
+import argparse
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USAGE_LOG_PATH = "data/llm_usage.jsonl"
+
+# モデル名の接頭辞ごとの料金（USD / 100万トークン: 入力, 出力）。最長一致で適用
+MODEL_PRICING: dict[str, tuple[float, float]] = {
+    "claude-opus-4": (15.0, 75.0),
+    "claude-sonnet-4": (3.0, 15.0),
+    "claude-haiku-4": (1.0, 5.0),
+    "claude-3-7-sonnet": (3.0, 15.0),
+    "claude-3-5-sonnet": (3.0, 15.0),
+    "claude-3-5-haiku": (0.8, 4.0),
+    "claude-3-opus": (15.0, 75.0),
+    "claude-3-haiku": (0.25, 1.25),
+}
+
+# プロンプトキャッシュの料金倍率（入力料金に対する倍率: 書き込み, 読み込み）
+CACHE_WRITE_MULTIPLIER = 1.25
+CACHE_READ_MULTIPLIER = 0.1
+
+# 集計キー（レポートの --group-by で指定可能な項目）
+USAGE_DIMENSIONS = ("bot", "channel", "mode", "model")
+
+# 集計する数値項目
+USAGE_COUNTERS = (
+    "requests",
+    "api_calls",
+    "deduplicated",
+    "errors",
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_tokens",
+    "cache_read_tokens",
+    "latency_total_ms",
+)
+
+
+def estimate_cost(
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    cache_creation_tokens: int = 0,
+    cache_read_tokens: int = 0,
+) -> float:
+    """
+    トークン数から推定コスト（USD）を計算
+
+    Args:
+        model: モデル名
+        input_tokens: 入力トークン数（キャッシュ分を除く）
+        output_tokens: 出力トークン数
+        cache_creation_tokens: プロンプトキャッシュへの書き込みトークン数
+        cache_read_tokens: プロンプトキャッシュからの読み込みトークン数
+
+    Returns:
+        推定コスト（料金表に無いモデルは0）
+    """
+    prefixes = [prefix for prefix in MODEL_PRICING if model.startswith(prefix)]
+    if not prefixes:
+        return 0.0
+    input_price, output_price = MODEL_PRICING[max(prefixes, key=len)]
+    return (
+        input_tokens * input_price
+        + cache_creation_tokens * input_price * CACHE_WRITE_MULTIPLIER
+        + cache_read_tokens * input_price * CACHE_READ_MULTIPLIER
+        + output_tokens * output_price
+    ) / 1_000_000
+
+
+class UsageTracker:
+    """LLM使用量の集計とJSONLへの定期書き出し"""
+
+    def __init__(self, log_path: Optional[str] = None, flush_interval: Optional[float] = None):
+        """
+        初期化
+
+        Args:
+            log_path: 書き出し先のJSONLファイル（未指定の場合は環境変数LLM_USAGE_LOG_PATH）
+            flush_interval: 書き出し間隔（秒、未指定の場合は環境変数LLM_USAGE_FLUSH_INTERVAL）
+        """
+        self.log_path = Path(log_path or os.getenv("LLM_USAGE_LOG_PATH", DEFAULT_USAGE_LOG_PATH))
+        self.flush_interval = flush_interval or float(os.getenv("LLM_USAGE_FLUSH_INTERVAL", "60"))
+
+        self._lock = threading.Lock()
+        self._usage: dict[tuple[str, str, str, str], dict[str, Any]] = {}
+        self._window_start = time.time()
+        self._stop_event = threading.Event()
+        self._flush_thread: Optional[threading.Thread] = None
+
+    def record(
+        self,
+        tags: Optional[dict[str, str]],
+        model: str,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        cache_creation_tokens: int = 0,
+        cache_read_tokens: int = 0,
+        latency_ms: float = 0.0,
+        deduplicated: bool = False,
+        error: bool = False,
+    ) -> None:
+        """
+        1回のLLM呼び出しを集計に加算
+
+        Args:
+            tags: bot, channel, mode を含む辞書（未指定の項目は "-"）
+            model: モデル名
+            input_tokens: 入力トークン数
+            output_tokens: 出力トークン数
+            cache_creation_tokens: プロンプトキャッシュへの書き込みトークン数
+            cache_read_tokens: プロンプトキャッシュからの読み込みトークン数
+            latency_ms: APIのレイテンシ（ミリ秒）
+            deduplicated: 実行中の同一リクエストの共有・応答キャッシュによりAPIを呼ばなかったか
+            error: API呼び出しに失敗したか
+        """
+        tags = tags or {}
+        key = (
+            str(tags.get("bot") or "-"),
+            str(tags.get("channel") or "-"),
+            str(tags.get("mode") or "-"),
+            model,
+        )
+
+        with self._lock:
+            usage = self._usage.setdefault(key, dict.fromkeys(USAGE_COUNTERS, 0))
+            usage["requests"] += 1
+            if error:
+                usage["errors"] += 1
+            elif deduplicated:
+                usage["deduplicated"] += 1
+            else:
+                usage["api_calls"] += 1
+                usage["input_tokens"] += input_tokens
+                usage["output_tokens"] += output_tokens
+                usage["cache_creation_tokens"] += cache_creation_tokens
+                usage["cache_read_tokens"] += cache_read_tokens
+                usage["latency_total_ms"] += latency_ms
+
+        self._ensure_flush_thread()
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """
+        未書き出しの集計を取得
+
+        Returns:
+            bot, channel, mode, model と各集計値・推定コストを含む辞書のリスト
+        """
+        with self._lock:
+            items = [(key, dict(usage)) for key, usage in self._usage.items()]
+        return [
+            _usage_row(dict(zip(USAGE_DIMENSIONS, key, strict=True)), usage) for key, usage in items
+        ]
+
+    def flush(self) -> int:
+        """
+        集計をJSONLファイルに追記してリセット
+
+        Returns:
+            書き出した行数
+        """
+        with self._lock:
+            items, self._usage = self._usage, {}
+            window_start, self._window_start = self._window_start, time.time()
+
+        if not items:
+            return 0
+
+        window_end = time.time()
+        try:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.log_path.open("a", encoding="utf-8") as f:
+                for key, usage in items.items():
+                    record = {
+                        "window_start": window_start,
+                        "window_end": window_end,
+                        **dict(zip(USAGE_DIMENSIONS, key, strict=True)),
+                        **usage,
+                    }
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            # 書き出せなかった分は次回に持ち越し
+            logger.error(f"❌ LLM使用量の書き出しに失敗しました: {e}")
+            with self._lock:
+                for key, usage in items.items():
+                    current = self._usage.setdefault(key, dict.fromkeys(USAGE_COUNTERS, 0))
+                    for counter in USAGE_COUNTERS:
+                        current[counter] += usage[counter]
+                self._window_start = window_start
+            return 0
+
+        logger.debug(f"📝 LLM使用量を書き出しました: {len(items)}件 → {self.log_path}")
+        return len(items)
+
+    def _ensure_flush_thread(self) -> None:
+        """定期書き出しスレッドを起動（起動済みの場合は何もしない）"""
+        if self._flush_thread is not None and self._flush_thread.is_alive():
+            return
+        with self._lock:
+            if self._flush_thread is not None and self._flush_thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._flush_thread = threading.Thread(
+                target=self._run_flush_loop, name="llm-usage-flush", daemon=True
+            )
+            self._flush_thread.start()
+
+    def _run_flush_loop(self) -> None:
+        """flush_interval ごとに集計を書き出し"""
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        """定期書き出しを停止し、残りの集計を書き出し"""
+        self._stop_event.set()
+        if self._flush_thread is not None:
+            self._flush_thread.join(timeout=5)
+            self._flush_thread = None
+        self.flush()
+
+
+def _record_cost(model: str, usage: dict[str, Any]) -> float:
+    """集計値（または記録）の推定コストを計算"""
+    return estimate_cost(
+        model,
+        usage.get("input_tokens", 0),
+        usage.get("output_tokens", 0),
+        usage.get("cache_creation_tokens", 0),
+        usage.get("cache_read_tokens", 0),
+    )
+
+
+def _usage_row(
+    dimensions: dict[str, str], usage: dict[str, Any], cost_usd: Optional[float] = None
+) -> dict[str, Any]:
+    """集計値に平均レイテンシと推定コストを付与（コスト未指定の場合はモデルから算出）"""
+    return {
+        **dimensions,
+        **usage,
+        "avg_latency_ms": (
+            usage["latency_total_ms"] / usage["api_calls"] if usage["api_calls"] else 0.0
+        ),
+        "cost_usd": (
+            cost_usd if cost_usd is not None else _record_cost(dimensions.get("model", ""), usage)
+        ),
+    }
+
+
+def load_usage_records(log_path: str, since: Optional[float] = None) -> list[dict[str, Any]]:
+    """
+    JSONLファイルから使用量の記録を読み込み
+
+    Args:
+        log_path: JSONLファイルのパス
+        since: この時刻（エポック秒）以降に終了した集計期間のみ読み込む
+
+    Returns:
+        記録のリスト（ファイルが無い場合は空）
+    """
+    path = Path(log_path)
+    if not path.exists():
+        return []
+
+    records = []
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"⚠️ 不正な行をスキップしました: {line[:100]}")
+                continue
+            if since is None or record.get("window_end", 0) >= since:
+                records.append(record)
+    return records
+
+
+def aggregate_usage(
+    records: list[dict[str, Any]], group_by: Optional[list[str]] = None
+) -> list[dict[str, Any]]:
+    """
+    使用量の記録を指定した項目ごとに集計
+
+    Args:
+        records: load_usage_records() の結果
+        group_by: 集計キー（bot / channel / mode / model の組み合わせ、未指定の場合は全項目）
+
+    Returns:
+        推定コストの高い順に並べた集計結果のリスト
+    """
+    group_by = group_by or list(USAGE_DIMENSIONS)
+    invalid = [dimension for dimension in group_by if dimension not in USAGE_DIMENSIONS]
+    if invalid:
+        raise ValueError(
+            f"集計キーが不正です: {invalid}（指定可能: {', '.join(USAGE_DIMENSIONS)}）"
+        )
+
+    groups: dict[tuple, dict[str, Any]] = {}
+    costs: dict[tuple, float] = {}
+    for record in records:
+        key = tuple(record.get(dimension, "-") for dimension in group_by)
+        group = groups.setdefault(key, dict.fromkeys(USAGE_COUNTERS, 0))
+        for counter in USAGE_COUNTERS:
+            group[counter] += record.get(counter, 0)
+        # モデルで集計しない場合に備えて、コストは記録ごとのモデルで算出して加算
+        costs[key] = costs.get(key, 0.0) + _record_cost(record.get("model", ""), record)
+
+    rows = [
+        _usage_row(dict(zip(group_by, key, strict=True)), usage, costs[key])
+        for key, usage in groups.items()
+    ]
+    rows.sort(key=lambda row: row["cost_usd"], reverse=True)
+    return rows
+
+
+_usage_tracker: Optional[UsageTracker] = None
+_usage_tracker_lock = threading.Lock()
+
+
+def get_usage_tracker() -> Optional[UsageTracker]:
+    """
+    プロセス内で共有する使用量トラッカーを取得
+
+    Returns:
+        使用量トラッカー（環境変数LLM_USAGE_TRACKING_ENABLEDが無効の場合はNone）
+    """
+    global _usage_tracker
+    if os.getenv("LLM_USAGE_TRACKING_ENABLED", "false").lower() != "true":
+        return None
+    if _usage_tracker is None:
+        with _usage_tracker_lock:
+            if _usage_tracker is None:
+                _usage_tracker = UsageTracker()
+                atexit.register(_usage_tracker.close)
+    return _usage_tracker
+
+
+def main():
+    """LLM使用量レポートCLI"""
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
+    parser = argparse.ArgumentParser(description="Report LLM token usage and estimated cost")
+    parser.add_argument("--log-path", help="使用量JSONLファイルのパス")
+    parser.add_argument(
+        "--group-by",
+        default="bot,channel,mode,model",
+        help="集計キー（bot / channel / mode / model をカンマ区切りで指定）",
+    )
+    parser.add_argument("--since-hours", type=float, help="直近T時間に限定")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    log_path = args.log_path or os.getenv("LLM_USAGE_LOG_PATH", DEFAULT_USAGE_LOG_PATH)
+    since = time.time() - args.since_hours * 3600 if args.since_hours is not None else None
+    group_by = [dimension.strip() for dimension in args.group_by.split(",") if dimension.strip()]
+
+    try:
+        records = load_usage_records(log_path, since)
+        rows = aggregate_usage(records, group_by)
+    except Exception as e:
+        print(f"エラーが発生しました: {str(e)}")
+        return
+
+    if not rows:
+        print(f"使用量の記録がありません: {log_path}")
+        return
+
+    first = min(record["window_start"] for record in records)
+    last = max(record["window_end"] for record in records)
+    print(
+        f"期間: {datetime.fromtimestamp(first):%Y-%m-%d %H:%M} 〜 {datetime.fromtimestamp(last):%Y-%m-%d %H:%M}\n"
+    )
+
+    for row in rows[: args.limit]:
+        label = " / ".join(str(row[dimension]) for dimension in group_by)
+        print(
+            f"{label}: ${row['cost_usd']:.4f}, {row['requests']}件 "
+            f"(API {row['api_calls']}, 共有/キャッシュ {row['deduplicated']}, エラー {row['errors']}), "
+            f"in {row['input_tokens']} / out {row['output_tokens']} / "
+            f"cache書込 {row['cache_creation_tokens']} / cache読込 {row['cache_read_tokens']} tokens, "
+            f"平均 {row['avg_latency_ms']:.0f}ms"
+        )
+
+    total_cost = sum(row["cost_usd"] for row in rows)
+    total_requests = sum(row["requests"] for row in rows)
+    print(f"\n合計: ${total_cost:.4f}, {total_requests}件")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,9 @@ CREATE TABLE IF NOT EXISTS human_members (
     member_uuid UUID UNIQUE NOT NULL DEFAULT gen_random_uuid(),
     member_name VARCHAR(50) UNIQUE NOT NULL,
     yml_file_uri VARCHAR(500) UNIQUE NOT NULL,
+    yml_file_hash VARCHAR(64),  -- SHA-256 of the YAML content, used to skip unchanged files
+    yml_file_etag VARCHAR(100),  -- storage object ETag at registration, used by incremental sync
+    yml_file_last_modified TIMESTAMP WITH TIME ZONE,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
@@ -27,6 +30,9 @@ CREATE TABLE IF NOT EXISTS virtual_members (
     member_uuid UUID UNIQUE NOT NULL DEFAULT gen_random_uuid(),
     member_name VARCHAR(50) UNIQUE NOT NULL,
     yml_file_uri VARCHAR(500) UNIQUE NOT NULL,
+    yml_file_hash VARCHAR(64),  -- SHA-256 of the YAML content, used to skip unchanged files
+    yml_file_etag VARCHAR(100),  -- storage object ETag at registration, used by incremental sync
+    yml_file_last_modified TIMESTAMP WITH TIME ZONE,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
@@ -45,7 +51,7 @@ CREATE TABLE IF NOT EXISTS virtual_member_profiles (
     FOREIGN KEY (member_uuid) REFERENCES virtual_members(member_uuid) ON DELETE CASCADE
 );
 
-CREATE TABLE member_relationships (
+CREATE TABLE IF NOT EXISTS member_relationships (
     relationship_id SERIAL PRIMARY KEY,
     from_member_uuid UUID NOT NULL,
     to_member_uuid UUID NOT NULL,
@@ -55,3 +61,38 @@ CREATE TABLE member_relationships (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     UNIQUE(from_member_uuid, to_member_uuid, relationship_type)
 );
+
+-- Incremental bucket-to-DB sync checkpoints (one row per storage prefix)
+CREATE TABLE IF NOT EXISTS storage_sync_checkpoints (
+    prefix VARCHAR(500) PRIMARY KEY,
+    listing_digest VARCHAR(64) NOT NULL,  -- SHA-256 of the sorted (key, ETag) listing
+    object_count INTEGER NOT NULL,
+    max_last_modified TIMESTAMP WITH TIME ZONE,
+    added_count INTEGER NOT NULL DEFAULT 0,
+    changed_count INTEGER NOT NULL DEFAULT 0,
+    deleted_count INTEGER NOT NULL DEFAULT 0,
+    synced_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Streaming registration progress (one row per storage prefix, used to resume interrupted runs)
+CREATE TABLE IF NOT EXISTS registration_checkpoints (
+    prefix VARCHAR(500) PRIMARY KEY,
+    last_object_name VARCHAR(500),  -- last object key committed in key order
+    processed_count INTEGER NOT NULL DEFAULT 0,
+    started_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    completed_at TIMESTAMP WITH TIME ZONE
+);
+
+-- Migration for databases created before the YAML change-tracking columns were added.
+-- Every statement in this file is idempotent, so it can be re-applied to an existing
+-- database (make db-member-migrate) to create missing tables and columns.
+ALTER TABLE human_members
+    ADD COLUMN IF NOT EXISTS yml_file_hash VARCHAR(64),
+    ADD COLUMN IF NOT EXISTS yml_file_etag VARCHAR(100),
+    ADD COLUMN IF NOT EXISTS yml_file_last_modified TIMESTAMP WITH TIME ZONE;
+
+ALTER TABLE virtual_members
+    ADD COLUMN IF NOT EXISTS yml_file_hash VARCHAR(64),
+    ADD COLUMN IF NOT EXISTS yml_file_etag VARCHAR(100),
+    ADD COLUMN IF NOT EXISTS yml_file_last_modified TIMESTAMP WITH TIME ZONE;